@@ -0,0 +1,140 @@
+"""
+Statistics Aggregates for Columbus Wing Deals Scraper
+Counts of deals (or restaurants) by confidence, day, source, restaurant and
+category, updated one record at a time as records are added or removed, so
+the summaries in main.py and manage_restaurants.py never re-walk the data.
+
+Every count, total and number of distinct values is a dictionary lookup.
+A snapshot can be saved at the end of a run and compared with the next
+run's counts to report changes like "+5 tuesday deals".
+"""
+
+import json
+import os
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+
+from file_utils import atomic_write
+from restaurant_data import get_deal_days
+
+DEFAULT_STATS_FILE = 'wing_deals_stats.json'
+
+
+def _field(name: str) -> Callable[[Dict[str, Any]], Iterable[str]]:
+    """A dimension that groups records by one field"""
+    return lambda record: (str(record.get(name, '')),)
+
+
+# How deals and restaurants are grouped; a record can fall under several keys of a
+# dimension (a deal mentioning Monday and Tuesday counts for both days)
+DEAL_DIMENSIONS: Dict[str, Callable[[Dict[str, Any]], Iterable[str]]] = {
+    'confidence': _field('confidence'),
+    'day': lambda deal: get_deal_days(deal['deal_text']),
+    'source': _field('source'),
+    'restaurant': _field('restaurant'),
+}
+RESTAURANT_DIMENSIONS: Dict[str, Callable[[Dict[str, Any]], Iterable[str]]] = {
+    'category': _field('category'),
+    'confidence': _field('confidence'),
+}
+
+
+class Aggregates:
+    """
+    Record counts by each dimension, kept current by add() and remove()
+    remove() must be given a record with the same values it was added with
+    """
+
+    def __init__(self, dimensions: Dict[str, Callable[[Dict[str, Any]], Iterable[str]]] = None):
+        self.dimensions = dimensions if dimensions is not None else DEAL_DIMENSIONS
+        self.total = 0
+        # Per dimension: key -> count (keys drop out when their count reaches zero)
+        self.counts: Dict[str, Dict[str, int]] = {dimension: {} for dimension in self.dimensions}
+
+    @classmethod
+    def for_deals(cls, deals: Iterable[Dict[str, Any]] = ()) -> 'Aggregates':
+        aggregates = cls(DEAL_DIMENSIONS)
+        aggregates.add_all(deals)
+        return aggregates
+
+    @classmethod
+    def for_restaurants(cls, restaurants: Iterable[Dict[str, Any]] = ()) -> 'Aggregates':
+        aggregates = cls(RESTAURANT_DIMENSIONS)
+        aggregates.add_all(restaurants)
+        return aggregates
+
+    def _update(self, record: Dict[str, Any], change: int):
+        self.total += change
+        for dimension, keys_of in self.dimensions.items():
+            counts = self.counts[dimension]
+            # A record counts once per key, even if it mentions a day twice
+            for key in set(keys_of(record)):
+                count = counts.get(key, 0) + change
+                if count:
+                    counts[key] = count
+                else:
+                    del counts[key]
+
+    def add(self, record: Dict[str, Any]):
+        self._update(record, 1)
+
+    def add_all(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self._update(record, 1)
+
+    def remove(self, record: Dict[str, Any]):
+        self._update(record, -1)
+
+    def count(self, dimension: str, key: str) -> int:
+        """How many records have this key (e.g. count('confidence', 'high'))"""
+        return self.counts[dimension].get(key, 0)
+
+    def distinct(self, dimension: str) -> int:
+        """How many different keys a dimension currently has (e.g. distinct('restaurant'))"""
+        return len(self.counts[dimension])
+
+    def by(self, dimension: str) -> Dict[str, int]:
+        """Every key of a dimension with its count"""
+        return dict(self.counts[dimension])
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The counts as plain data, for save() and changes_since()"""
+        return {'total': self.total, 'counts': {dimension: dict(counts) for dimension, counts in self.counts.items()}}
+
+    def save(self, filename: str = DEFAULT_STATS_FILE):
+        """Save a snapshot so the next run can report what changed"""
+        with atomic_write(filename) as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    def changes_since(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        What changed since a snapshot: {'total': difference, 'counts': {dimension: {key: difference}}}
+        Keys that didn't change are left out; only keys present on either side are visited
+        """
+        previous_counts = snapshot.get('counts', {})
+        changes = {}
+        for dimension, counts in self.counts.items():
+            previous = previous_counts.get(dimension, {})
+            differences = {key: counts.get(key, 0) - previous.get(key, 0) for key in set(counts) | set(previous)}
+            changes[dimension] = {key: difference for key, difference in differences.items() if difference}
+        return {'total': self.total - snapshot.get('total', 0), 'counts': changes}
+
+
+def load_snapshot(filename: str = DEFAULT_STATS_FILE) -> Dict[str, Any]:
+    """The snapshot saved by the previous run, or an empty one"""
+    if not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def describe_changes(changes: Dict[str, Any], dimension: str, noun: str = 'deals',
+                     limit: int = 5) -> List[str]:
+    """
+    Readable lines for the biggest changes in one dimension, e.g. "+5 tuesday deals"
+    """
+    differences: List[Tuple[str, int]] = sorted(changes['counts'].get(dimension, {}).items(),
+                                                 key=lambda item: (-abs(item[1]), item[0]))
+    return [f"{difference:+d} {key} {noun}" for key, difference in differences[:limit]]
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Boilerplate Detector for Columbus Wing Deals Scraper
+Learns the blocks of text that repeat on a site's pages - navigation bars,
+footers, cookie notices - and strips them before the deal patterns run, so
+"Wings" in a menu bar stops turning into a deal and every page scans less text.
+
+A page is split into blocks (the text of each paragraph, list item, heading,
+cell and other block-level element) and each block is fingerprinted. For each
+host we remember which fingerprints we've seen, on how many of its pages and in
+how many fetches. A block is boilerplate once it has shown up on
+MIN_PAGES different pages of the host, or once it has been inside the page's
+chrome (<nav>, <footer>, a cookie notice) for MIN_FETCHES fetches.
+Text that merely stays the same between runs is never stripped: most of our
+sources are a single promotions page whose deals rarely change.
+
+What has been learned is kept in boilerplate_cache.json between runs. The
+blocks stripped from each stored page are kept with it (see page_store.py), so
+re-extracting an old run strips exactly what the live run did.
+
+Usage:
+    python boilerplate.py                 # what has been learned, per host
+    python boilerplate.py --forget wingstop.com
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import List, Dict, Any, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from file_utils import atomic_write
+
+BOILERPLATE_FILE = 'boilerplate_cache.json'
+# A block on this many different pages of a host is part of the site's template
+MIN_PAGES = 2
+# A block inside the page chrome is stripped once it has been fetched this many times
+MIN_FETCHES = 3
+# Fingerprints not seen in this many fetches of their host are forgotten
+FORGET_AFTER_FETCHES = 20
+# Pages remembered per fingerprint (enough to reach MIN_PAGES with room to spare)
+MAX_PAGES_TRACKED = 8
+
+# Elements whose text forms a block of its own
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'button', 'caption', 'dd', 'details',
+    'dialog', 'div', 'dl', 'dt', 'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1',
+    'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'html', 'label', 'li', 'main', 'nav', 'ol',
+    'option', 'p', 'pre', 'section', 'select', 'summary', 'table', 'td', 'th', 'tr', 'ul',
+}
+# Only navigation, footers and cookie/consent notices count as chrome. Headers,
+# banners, sidebars and pop-ups are left alone: that's where restaurants put
+# their standing promotions ("Wing Tuesday: 50 cent wings!")
+CHROME_TAGS = {'nav', 'footer'}
+# ARIA roles that mark site chrome
+CHROME_ROLES = {'navigation', 'contentinfo'}
+# Class or id words that mark site chrome
+_CHROME_NAME = re.compile(
+    r'^(?:site-?)?(?:nav|navbar|navigation|footer|breadcrumbs?|cookies?.*|consent.*|gdpr.*|'
+    r'(?:main-?|top-?)menu|menu-?(?:bar|main|primary|top))$',
+    re.IGNORECASE)
+
+# (text, inside the page chrome)
+Block = Tuple[str, bool]
+# (fingerprint, inside the page chrome) of a block that was stripped
+Stripped = Tuple[str, bool]
+
+
+def fingerprint(text: str) -> str:
+    """A short, stable id for a block's text (case and spacing ignored)"""
+    return hashlib.blake2b(' '.join(text.lower().split()).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _is_chrome(element: Tag) -> bool:
+    """Whether this element marks the start of site chrome"""
+    if element.name in CHROME_TAGS:
+        return True
+    if element.get('role') in CHROME_ROLES:
+        return True
+    names = element.get('class') or []
+    if element.get('id'):
+        names = list(names) + [element['id']]
+    return any(_CHROME_NAME.match(name) for name in names)
+
+
+def page_blocks(soup: BeautifulSoup) -> List[Block]:
+    """
+    Split a parsed page into its blocks of text, in page order
+    Each block is (text, in_chrome); empty blocks are left out
+    """
+    pieces: Dict[int, List[str]] = {}
+    # Per element: (its block element, whether it's inside the chrome), filled in top-down
+    placement: Dict[int, Tuple[Tag, bool]] = {id(soup): (soup, False)}
+    for node in soup.descendants:
+        if isinstance(node, Tag):
+            block, chrome = placement[id(node.parent)]
+            placement[id(node)] = (node if node.name in BLOCK_TAGS else block, chrome or _is_chrome(node))
+        elif type(node) in (NavigableString, CData):
+            # Same strings get_text() uses: no comments, scripts or styles
+            block, _ = placement[id(node.parent)]
+            pieces.setdefault(id(block), []).append(node)
+    result = []
+    for key, texts in pieces.items():
+        text = ' '.join(''.join(texts).split())
+        if text:
+            result.append((text, placement[key][1]))
+    return result
+
+
+def join_blocks(blocks: List[Block], stripped: Set[Stripped]) -> str:
+    """
+    The text of a page's blocks, leaving out the stripped ones
+    Blocks are joined with spaces, so a deal split across elements (a heading and
+    the price under it) still reads as one line; a line break goes where blocks were
+    stripped or the page moves in or out of its chrome, so a match can't run from
+    the menu bar into the page
+    """
+    parts: List[str] = []
+    gap = False
+    previous_chrome = None
+    for text, chrome in blocks:
+        if (fingerprint(text), chrome) in stripped:
+            gap = True
+            continue
+        if parts:
+            parts.append('\n' if gap or chrome != previous_chrome else ' ')
+        parts.append(text)
+        gap = False
+        previous_chrome = chrome
+    return ''.join(parts)
+
+
+class BoilerplateModel:
+    """
+    What has been learned about each host's repeated blocks
+    learn() and strip() may be called from several threads at once
+    """
+
+    def __init__(self, hosts: Optional[Dict[str, Dict[str, Any]]] = None, filename: str = BOILERPLATE_FILE):
+        self.filename = filename
+        # host -> {'fetches': n, 'blocks': {fingerprint: {'pages', 'fetches', 'chrome', 'last'}}}
+        self.hosts: Dict[str, Dict[str, Any]] = hosts or {}
+        self._lock = threading.Lock()
+        self._changed = False
+        # Text seen and text stripped by strip() since the last save, for the summary
+        self.chars_seen = 0
+        self.chars_stripped = 0
+
+    @classmethod
+    def load(cls, filename: str = BOILERPLATE_FILE) -> 'BoilerplateModel':
+        """The model saved by earlier runs, or an empty one"""
+        hosts = {}
+        if os.path.exists(filename):
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    hosts = json.load(f)
+            except (OSError, ValueError):
+                # A broken cache only means learning again
+                hosts = {}
+        return cls(hosts, filename)
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def learn(self, url: str, blocks: List[Block]):
+        """Count one fetch of a page and the blocks on it"""
+        page = fingerprint(urlparse(url).path or '/')
+        with self._lock:
+            entry = self.hosts.setdefault(self.host_of(url), {'fetches': 0, 'blocks': {}})
+            entry['fetches'] += 1
+            fetches = entry['fetches']
+            known = entry['blocks']
+            # A block repeated within one page still counts once per fetch
+            in_chrome: Dict[str, bool] = {}
+            for text, chrome in blocks:
+                key = fingerprint(text)
+                in_chrome[key] = in_chrome.get(key, False) or chrome
+            for key, chrome in in_chrome.items():
+                stat = known.get(key)
+                if stat is None:
+                    stat = known[key] = {'pages': [], 'fetches': 0, 'chrome': False, 'last': fetches}
+                # Where the block was on the latest fetch, for the report
+                stat['chrome'] = chrome
+                stat['fetches'] += 1
+                stat['last'] = fetches
+                if page not in stat['pages'] and len(stat['pages']) < MAX_PAGES_TRACKED:
+                    stat['pages'].append(page)
+            # Forget blocks the site no longer shows
+            for key in [key for key, stat in known.items() if stat['last'] < fetches - FORGET_AFTER_FETCHES]:
+                del known[key]
+            self._changed = True
+
+    @staticmethod
+    def _is_boilerplate(stat: Dict[str, Any], in_chrome: bool) -> bool:
+        # The same text in the page body (a deal also shown in a banner, say) is kept
+        return len(stat['pages']) >= MIN_PAGES or (in_chrome and stat['fetches'] >= MIN_FETCHES)
+
+    def strip(self, url: str, blocks: List[Block]) -> Set[Stripped]:
+        """The blocks of a page that are boilerplate for its host, for join_blocks()"""
+        with self._lock:
+            known = self.hosts.get(self.host_of(url), {}).get('blocks', {})
+            stripped: Set[Stripped] = set()
+            for text, chrome in blocks:
+                key = fingerprint(text)
+                stat = known.get(key)
+                if stat is not None and self._is_boilerplate(stat, chrome):
+                    stripped.add((key, chrome))
+                    self.chars_stripped += len(text)
+            self.chars_seen += sum(len(text) for text, _ in blocks)
+        return stripped
+
+    def boilerplate_count(self, host: str) -> int:
+        """How many of a host's known blocks are currently stripped"""
+        with self._lock:
+            known = self.hosts.get(host, {}).get('blocks', {})
+            return sum(1 for stat in known.values() if self._is_boilerplate(stat, stat['chrome']))
+
+    def forget(self, host: str) -> bool:
+        """Drop everything learned about a host (after a redesign, say); True if it was known"""
+        with self._lock:
+            self._changed = True
+            return self.hosts.pop(host, None) is not None
+
+    def save(self):
+        """Save what has been learned (if anything changed) and report how much text was stripped"""
+        with self._lock:
+            if self.chars_seen:
+                share = self.chars_stripped / self.chars_seen
+                print(f"🧹 Boilerplate: stripped {share:.0%} of page text "
+                      f"({self.chars_stripped:,} of {self.chars_seen:,} characters)")
+            self.chars_seen = self.chars_stripped = 0
+            if not self._changed:
+                return
+            with atomic_write(self.filename) as f:
+                json.dump(self.hosts, f, ensure_ascii=False, sort_keys=True)
+            self._changed = False
+
+
+def main():
+    """Show (or reset) what has been learned about each site's boilerplate"""
+    parser = argparse.ArgumentParser(description="Show the boilerplate learned for each host")
+    parser.add_argument('--cache', default=BOILERPLATE_FILE,
+                        help=f"learned boilerplate file (default: {BOILERPLATE_FILE})")
+    parser.add_argument('--forget', metavar='HOST', help="forget everything learned about HOST")
+    args = parser.parse_args()
+
+    model = BoilerplateModel.load(args.cache)
+    if args.forget:
+        host = BoilerplateModel.host_of('//' + args.forget)
+        if model.forget(host):
+            model.save()
+            print(f"✅ Forgot the boilerplate learned for {host}")
+        else:
+            print(f"❌ Nothing learned for {host}")
+        return
+
+    if not model.hosts:
+        print(f"No boilerplate learned yet ({args.cache} is empty or missing)")
+        return
+    print(f"\n🧹 Boilerplate learned for {len(model.hosts)} hosts")
+    print("=" * 60)
+    for host, entry in sorted(model.hosts.items()):
+        print(f"{model.boilerplate_count(host):>5} stripped / {len(entry['blocks']):>5} blocks  "
+              f"{entry['fetches']:>4} fetches  {host}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Streaming Deal Loader for Columbus Wing Deals Scraper
+Reads deals one at a time instead of loading a whole file with json.load,
+so large or historical data files can be processed in constant memory.
+
+Supported files (picked by extension):
+    .json   - a JSON array of deals, parsed incrementally over a memory map
+    .jsonl  - JSON Lines, one deal per line
+    .wdc    - the columnar file written by exporters.py
+"""
+
+import codecs
+import json
+import mmap
+import os
+from typing import Dict, Any, Iterator
+
+# How many bytes of the file are decoded at a time
+READ_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(filename: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of a top-level JSON array one at a time
+    The file is memory-mapped and decoded a chunk at a time, so only the
+    current chunk and the deal being parsed are held in memory
+    """
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{filename} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = json.JSONDecoder()
+            # utf-8-sig also drops a byte order mark if an editor added one
+            text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            buffer = ''
+            pos = 0
+            offset = 0
+
+            def read_more() -> bool:
+                """Append the next chunk to the unparsed part of the buffer"""
+                nonlocal buffer, pos, offset
+                if offset >= len(mapped):
+                    return False
+                chunk = mapped[offset:offset + chunk_size]
+                offset += len(chunk)
+                buffer = buffer[pos:] + text_decoder.decode(chunk, final=offset >= len(mapped))
+                pos = 0
+                return True
+
+            def next_char() -> str:
+                """Skip whitespace and return the next character ('' at the end of the file)"""
+                nonlocal pos
+                while True:
+                    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                        pos += 1
+                    if pos < len(buffer):
+                        return buffer[pos]
+                    if not read_more():
+                        return ''
+
+            if next_char() != '[':
+                raise ValueError(f"{filename} does not contain a JSON array")
+            pos += 1
+            if next_char() == ']':
+                pos += 1
+            else:
+                while True:
+                    try:
+                        deal, end = decoder.raw_decode(buffer, pos)
+                        # A value that runs to the end of the buffer may continue in the next chunk
+                        complete = end < len(buffer) or offset >= len(mapped)
+                    except json.JSONDecodeError:
+                        complete = False
+                        if offset >= len(mapped):
+                            raise
+                    if not complete:
+                        read_more()
+                        continue
+                    pos = end
+                    yield deal
+
+                    char = next_char()
+                    if char == ']':
+                        pos += 1
+                        break
+                    if char != ',':
+                        raise ValueError(f"{filename}: expected ',' or ']' between deals")
+                    pos += 1
+                    next_char()
+
+            if next_char() != '':
+                raise ValueError(f"Unexpected data after the JSON array in {filename}")
+
+
+def iter_json_lines(filename: str) -> Iterator[Dict[str, Any]]:
+    """Yield one deal per non-blank line of a JSON Lines file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{filename} line {line_number}: {e}") from e
+
+
+def iter_columnar(filename: str) -> Iterator[Dict[str, Any]]:
+    """Yield the deals stored in a columnar .wdc file"""
+    # Imported here so reading JSON doesn't pull in the exporters
+    from exporters import ColumnarDeals
+    with ColumnarDeals(filename) as table:
+        yield from table
+
+
+def iter_deals_file(filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the deals in a data file, choosing the reader by file extension
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return iter_json_lines(filename)
+    if extension == '.wdc':
+        return iter_columnar(filename)
+    return iter_json_array(filename)
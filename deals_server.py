@@ -0,0 +1,641 @@
+#!/usr/bin/env python3
+"""
+Deals API Server for Columbus Wing Deals Scraper
+A small asyncio HTTP server that loads wing_deals.json once and answers
+filtered queries from in-memory indexes, so clients no longer have to
+download every deal and filter it themselves.
+
+    GET /deals?day=tuesday&confidence=high&restaurant=Pluto's&max_price=1
+    GET /deals?lat=39.98&lon=-83.00&miles=3     # nearest restaurants first (geo_index.py)
+
+Rendered responses are kept in an LRU cache with a strong ETag and a
+gzipped copy, so repeat queries cost a dictionary lookup. The data file is
+watched and reloaded in the background; the new store is swapped in only
+once it has loaded completely.
+
+Open pages can subscribe to GET /events (Server-Sent Events) and receive
+the deals added, removed or changed by each new run, so they patch their
+view instead of reloading everything.
+
+Usage:
+    python deals_server.py --port 8000
+"""
+
+import argparse
+import asyncio
+import bisect
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Set, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from geo_index import LocationIndex, build_restaurant_index, restaurants_within
+from html_generator import get_filter_keys, get_price_band
+from restaurant_data import DAY_ALIASES, DAY_NAMES, get_deal_days, get_deal_prices, load_saved_restaurants
+
+DEFAULT_DATA_FILE = 'wing_deals.json'
+DEFAULT_PAGE_FILE = 'wing_deals.html'
+# Number of rendered responses kept in memory
+DEFAULT_CACHE_SIZE = 256
+# Smaller bodies aren't worth compressing
+GZIP_MIN_SIZE = 1024
+# How often (in seconds) to check whether the data file changed
+RELOAD_INTERVAL = 1.0
+# Longest request head we accept before giving up on a client
+MAX_REQUEST_HEAD = 16 * 1024
+# Largest request body we'll read and throw away; nothing here takes a body, so larger ones get 413
+MAX_REQUEST_BODY = 1024
+
+# Diffs kept so a reconnecting page can catch up on what it missed
+DIFF_HISTORY = 32
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT_INTERVAL = 15.0
+# Diffs queued for one slow subscriber before it is dropped (it reconnects and catches up)
+SUBSCRIBER_QUEUE_SIZE = 8
+# Deal fields that don't count as a change (date_found is restamped every run)
+IGNORED_DIFF_FIELDS = {'date_found'}
+
+# Query parameters /deals understands
+DEAL_FILTERS = ['day', 'confidence', 'restaurant', 'max_price', 'lat', 'lon', 'miles']
+# Search radius for lat/lon queries that don't give miles
+DEFAULT_NEARBY_MILES = 5.0
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    411: 'Length Required',
+    413: 'Payload Too Large',
+    503: 'Service Unavailable',
+}
+
+
+class DealStore:
+    """
+    An immutable snapshot of the deals plus the indexes used to filter them
+    A reload builds a new store and swaps it in, so a request never sees a
+    half-updated store
+    """
+
+    def __init__(self, deals: List[Dict[str, Any]], version: str = ''):
+        self.deals = deals
+        self.version = version
+        self.by_day: Dict[str, Set[int]] = {day: set() for day in DAY_NAMES}
+        self.by_confidence: Dict[str, Set[int]] = {}
+        self.by_restaurant: Dict[str, Set[int]] = {}
+        # (lowest price, deal id) pairs sorted by price, for max_price range lookups
+        self._prices: List[Tuple[float, int]] = []
+
+        for doc_id, deal in enumerate(deals):
+            for day in get_deal_days(deal.get('deal_text', '')):
+                self.by_day[day].add(doc_id)
+            self.by_confidence.setdefault(str(deal.get('confidence', '')).lower(), set()).add(doc_id)
+            self.by_restaurant.setdefault(str(deal.get('restaurant', '')).lower(), set()).add(doc_id)
+            prices = get_deal_prices(deal.get('deal_text', ''))
+            if prices:
+                self._prices.append((min(prices), doc_id))
+        self._prices.sort()
+        self._price_keys = [price for price, _ in self._prices]
+
+    @classmethod
+    def load(cls, filename: str = DEFAULT_DATA_FILE) -> 'DealStore':
+        """Read a deals file, using its modification time and size as the version"""
+        stat = os.stat(filename)
+        with open(filename, 'r', encoding='utf-8') as f:
+            deals = json.load(f)
+        return cls(deals, f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+    def _under_price(self, max_price: float) -> Set[int]:
+        """Ids of deals whose lowest price is at most max_price"""
+        end = bisect.bisect_right(self._price_keys, max_price)
+        return {doc_id for _, doc_id in self._prices[:end]}
+
+    def query(self, day: str = None, confidence: str = None, restaurant: str = None,
+              max_price: float = None, nearby: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """
+        Return the deals matching every given filter, in their original order
+        nearby maps restaurant names to distances (see geo_index.restaurants_within());
+        with it, only those restaurants' deals are returned, nearest first
+        """
+        candidates = []
+        if day is not None:
+            candidates.append(self.by_day.get(day, set()))
+        if confidence is not None:
+            candidates.append(self.by_confidence.get(confidence, set()))
+        if restaurant is not None:
+            candidates.append(self.by_restaurant.get(restaurant, set()))
+        if max_price is not None:
+            candidates.append(self._under_price(max_price))
+        distances = {}
+        if nearby is not None:
+            for name, distance in nearby.items():
+                for doc_id in self.by_restaurant.get(name.lower(), ()):
+                    distances[doc_id] = distance
+            candidates.append(set(distances))
+        if not candidates:
+            return list(self.deals)
+
+        # Intersect the smallest sets first
+        candidates.sort(key=len)
+        ids = candidates[0]
+        for other in candidates[1:]:
+            if not ids:
+                break
+            ids = ids & other
+        if nearby is not None:
+            return [self.deals[doc_id] for doc_id in sorted(ids, key=lambda doc_id: (distances[doc_id], doc_id))]
+        return [self.deals[doc_id] for doc_id in sorted(ids)]
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of rendered responses
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Any, Tuple[bytes, Optional[bytes], str]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Tuple[bytes, Optional[bytes], str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry: Tuple[bytes, Optional[bytes], str]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def deal_key(deal: Dict[str, Any]) -> str:
+    """
+    Identify a deal across runs
+    Keep this in sync with dealKey() in the generated page's JavaScript
+    """
+    return '\x1f'.join(str(deal.get(field, '')) for field in ('restaurant', 'source', 'deal_text'))
+
+
+def diff_deals(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Compare two runs by deal_key()
+    Added and changed entries carry the filter keys and price band the page
+    needs to patch its filter index; removed entries are just keys
+    """
+    old_by_key = {deal_key(deal): deal for deal in old}
+    new_by_key = {deal_key(deal): deal for deal in new}
+
+    def entry(key: str, deal: Dict[str, Any]) -> Dict[str, Any]:
+        return {'key': key, 'deal': deal, 'filters': get_filter_keys(deal), 'price_band': get_price_band(deal)}
+
+    added, changed = [], []
+    for key, deal in new_by_key.items():
+        previous = old_by_key.get(key)
+        if previous is None:
+            added.append(entry(key, deal))
+        elif any(deal.get(field) != previous.get(field)
+                 for field in set(deal) | set(previous) if field not in IGNORED_DIFF_FIELDS):
+            changed.append(entry(key, deal))
+    removed = [key for key in old_by_key if key not in new_by_key]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def format_event(event: str, data: Any, event_id: str = None) -> bytes:
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    # JSON never contains raw newlines, so the payload fits on one data line
+    lines.append('data: ' + json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+def render_body(body: bytes) -> Tuple[bytes, Optional[bytes], str]:
+    """
+    Prepare a response body for the cache: (body, gzipped body or None, strong ETag)
+    """
+    etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+    gzipped = None
+    if len(body) >= GZIP_MIN_SIZE:
+        # mtime=0 keeps the compressed bytes identical for identical bodies
+        gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+    return body, gzipped, etag
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check an Accept-Encoding header for gzip (honoring q=0)"""
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix is ignored"""
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class DealsServer:
+    """
+    Serves /deals (filtered JSON) and the generated page from memory
+    """
+
+    def __init__(self, data_file: str = DEFAULT_DATA_FILE, page_file: str = DEFAULT_PAGE_FILE,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.data_file = data_file
+        self.page_file = page_file
+        self.store: Optional[DealStore] = None
+        self.cache = ResponseCache(cache_size)
+        self.routes = {
+            '/deals': self.handle_deals,
+            '/': self.handle_page,
+            '/' + os.path.basename(page_file): self.handle_page,
+        }
+        # Handlers that take over the connection (long-lived streams)
+        self.stream_routes = {
+            '/events': self.handle_events,
+        }
+        # (version, encoded diff event) for recent reloads, oldest first;
+        # the first load has no diff and is stored with None
+        self._history: deque = deque(maxlen=DIFF_HISTORY)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._page: Optional[Tuple[Tuple[int, int], Tuple[bytes, Optional[bytes], str]]] = None
+        self._server = None
+        # Restaurant locations for lat/lon queries, built on the first one
+        self._locations: Optional[LocationIndex] = None
+
+    # ------------------------------------------------------------------
+    # Data loading
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def reload(self) -> bool:
+        """
+        Load the data file off the event loop and swap in the new store
+        Returns False (keeping the old store) if the file is missing or unreadable
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            store = await loop.run_in_executor(None, DealStore.load, self.data_file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load {self.data_file}: {e}")
+            return False
+        previous, self.store = self.store, store
+        # Old entries can never match the new version, so free them now
+        self.cache.clear()
+        print(f"📦 Loaded {len(store.deals)} deals (version {store.version})")
+
+        if previous is None:
+            self._history.append((store.version, None))
+            return True
+        diff = await loop.run_in_executor(None, diff_deals, previous.deals, store.deals)
+        if any(diff.values()):
+            self.publish(store.version, diff)
+        else:
+            # Nothing a page shows changed, so subscribers are already up to date
+            self._history.append((store.version, b''))
+        return True
+
+    def publish(self, version: str, diff: Dict[str, List[Any]]):
+        """Send a diff to every open event stream and remember it for reconnects"""
+        event = format_event('diff', diff, version)
+        self._history.append((version, event))
+        print(f"📣 Pushed {len(diff['added'])} added, {len(diff['changed'])} changed, "
+              f"{len(diff['removed'])} removed to {len(self._subscribers)} pages")
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind; closing the stream makes it reconnect and replay
+                self._close_subscriber(queue)
+
+    def _close_subscriber(self, queue: asyncio.Queue):
+        """Drop whatever is queued for a stream and tell it to finish"""
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _missed_events(self, last_event_id: str) -> Optional[List[bytes]]:
+        """
+        Events published after last_event_id, or None if it is too old to replay
+        """
+        versions = [version for version, _ in self._history]
+        if last_event_id not in versions:
+            return None
+        start = versions.index(last_event_id) + 1
+        return [event for _, event in list(self._history)[start:] if event]
+
+    async def watch_data_file(self):
+        """Reload whenever the data file's modification time or size changes"""
+        loaded = self._file_signature()
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            signature = self._file_signature()
+            if signature is not None and signature != loaded:
+                # Only remember the signature once it loads; a file caught
+                # mid-write by a non-atomic writer is retried on the next tick
+                if await self.reload():
+                    loaded = signature
+
+    # ------------------------------------------------------------------
+    # Handlers return (status, content_type, cached_entry, extra_headers)
+
+    async def handle_deals(self, path: str, params: Dict[str, str], headers: Dict[str, str]):
+        if self.store is None:
+            return 503, 'text/plain; charset=utf-8', render_body(b'Deals are still loading\n'), {}
+
+        try:
+            filters = self._parse_filters(params)
+        except ValueError as e:
+            return 400, 'text/plain; charset=utf-8', render_body(f"{e}\n".encode('utf-8')), {}
+
+        store = self.store
+        key = (store.version,) + tuple(filters.get(name) for name in DEAL_FILTERS)
+        entry = self.cache.get(key)
+        if entry is None:
+            query = dict(filters)
+            if 'lat' in query:
+                if self._locations is None:
+                    self._locations = build_restaurant_index()
+                query['nearby'] = restaurants_within(query.pop('lat'), query.pop('lon'), query.pop('miles'),
+                                                     self._locations)
+            deals = store.query(**query)
+            body = json.dumps(
+                {'version': store.version, 'count': len(deals), 'deals': deals},
+                separators=(',', ':'), ensure_ascii=False,
+            ).encode('utf-8')
+            entry = render_body(body)
+            self.cache.put(key, entry)
+        return 200, 'application/json; charset=utf-8', entry, {'Cache-Control': 'no-cache'}
+
+    @staticmethod
+    def _parse_filters(params: Dict[str, str]) -> Dict[str, Any]:
+        """Normalize /deals query parameters, raising ValueError for bad values"""
+        filters = {}
+        day = params.get('day', '').strip().lower()
+        if day:
+            day = DAY_ALIASES.get(day, day)
+            if day not in DAY_NAMES:
+                raise ValueError(f"Unknown day: {params['day']}")
+            filters['day'] = day
+        for name in ('confidence', 'restaurant'):
+            value = params.get(name, '').strip().lower()
+            if value:
+                filters[name] = value
+        max_price = params.get('max_price', '').strip().lstrip('$')
+        if max_price:
+            try:
+                filters['max_price'] = float(max_price)
+            except ValueError:
+                raise ValueError(f"max_price must be a number: {params['max_price']}")
+        point = {}
+        for name in ('lat', 'lon', 'miles'):
+            value = params.get(name, '').strip()
+            if value:
+                try:
+                    point[name] = float(value)
+                except ValueError:
+                    raise ValueError(f"{name} must be a number: {params[name]}")
+        if point:
+            if 'lat' not in point or 'lon' not in point:
+                raise ValueError("lat and lon must be given together")
+            if not -90 <= point['lat'] <= 90 or not -180 <= point['lon'] <= 180:
+                raise ValueError(f"No such place: {point['lat']}, {point['lon']}")
+            point.setdefault('miles', DEFAULT_NEARBY_MILES)
+            if not point['miles'] > 0:
+                raise ValueError(f"miles must be more than 0: {params['miles']}")
+            filters.update(point)
+        return filters
+
+    async def handle_page(self, path: str, params: Dict[str, str], headers: Dict[str, str]):
+        try:
+            stat = os.stat(self.page_file)
+        except FileNotFoundError:
+            return 404, 'text/plain; charset=utf-8', render_body(b'Page not generated yet\n'), {}
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._page is None or self._page[0] != signature:
+            with open(self.page_file, 'rb') as f:
+                self._page = (signature, render_body(f.read()))
+        return 200, 'text/html; charset=utf-8', self._page[1], {'Cache-Control': 'no-cache'}
+
+    async def handle_events(self, writer: asyncio.StreamWriter, params: Dict[str, str],
+                            headers: Dict[str, str]):
+        """
+        Stream deal diffs to one page until it disconnects
+        A reconnecting page sends Last-Event-ID and first gets the diffs it missed;
+        if those have aged out it is told to reload instead
+        """
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        try:
+            head = (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream; charset=utf-8\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Connection: keep-alive\r\n\r\n"
+            )
+            writer.write(head.encode('latin-1') + b'retry: 5000\n\n')
+
+            last_event_id = headers.get('last-event-id') or params.get('since')
+            current = self.store.version if self.store else ''
+            if last_event_id and last_event_id != current:
+                missed = self._missed_events(last_event_id)
+                if missed is None:
+                    writer.write(format_event('reload', {'version': current}, current))
+                else:
+                    writer.write(b''.join(missed))
+            writer.write(format_event('hello', {'version': current}, current))
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Comment lines keep proxies from closing the stream and notice dead clients
+                    event = b': ping\n\n'
+                if event is None:
+                    break
+                writer.write(event)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._subscribers.discard(queue)
+
+    # ------------------------------------------------------------------
+    # HTTP plumbing
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._send_error(writer, 400, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                # Requests here don't carry bodies; skip a small one if a client sends it anyway.
+                # Anything bigger (or of unknown size) is refused and the connection closed
+                # rather than read, so a client can't make us buffer an arbitrary amount
+                if 'transfer-encoding' in headers:
+                    await self._send_error(writer, 411, False)
+                    break
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._send_error(writer, 400, False)
+                    break
+                if length > MAX_REQUEST_BODY:
+                    await self._send_error(writer, 413, False)
+                    break
+                if length > 0:
+                    try:
+                        await reader.readexactly(length)
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        break
+
+                keep_alive = await self._respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, writer: asyncio.StreamWriter, method: str, target: str,
+                       headers: Dict[str, str], keep_alive: bool) -> bool:
+        """Answer one request; returns whether the connection can take another"""
+        if method not in ('GET', 'HEAD'):
+            await self._send_error(writer, 405, keep_alive)
+            return keep_alive
+        url = urlsplit(target)
+        # Repeated parameters keep their last value
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if url.path in self.stream_routes and method == 'GET':
+            await self.stream_routes[url.path](writer, params, headers)
+            return False
+        handler = self.routes.get(url.path)
+        if handler is None:
+            await self._send_error(writer, 404, keep_alive)
+            return keep_alive
+
+        status, content_type, (body, gzipped, etag), extra = await handler(url.path, params, headers)
+
+        response_headers = {'Content-Type': content_type, 'Vary': 'Accept-Encoding'}
+        response_headers.update(extra)
+        if gzipped is not None and _accepts_gzip(headers.get('accept-encoding', '')):
+            body = gzipped
+            # Each encoding is a different representation, so it needs its own strong ETag
+            etag = etag[:-1] + '-gzip"'
+            response_headers['Content-Encoding'] = 'gzip'
+
+        if status == 200:
+            response_headers['ETag'] = etag
+            if 'if-none-match' in headers and _etag_matches(headers['if-none-match'], etag):
+                status, body = 304, b''
+                response_headers.pop('Content-Encoding', None)
+        await self._send(writer, status, response_headers, body, keep_alive, method == 'HEAD')
+        return keep_alive
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, keep_alive: bool):
+        body = f"{status} {STATUS_TEXT[status]}\n".encode('utf-8')
+        await self._send(writer, status, {'Content-Type': 'text/plain; charset=utf-8'}, body, keep_alive)
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                    body: bytes, keep_alive: bool, head_only: bool = False):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append('Connection: ' + ('keep-alive' if keep_alive else 'close'))
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        writer.write(head if head_only else head + body)
+        await writer.drain()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000):
+        """Load the deals and serve until cancelled"""
+        await self.reload()
+        watcher = asyncio.create_task(self.watch_data_file())
+        self._server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_REQUEST_HEAD)
+        print(f"🌐 Serving wing deals on http://{host}:{port}/deals")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            watcher.cancel()
+            # Wake every open event stream so its connection closes
+            for queue in list(self._subscribers):
+                self._close_subscriber(queue)
+
+
+def main():
+    """Run the deals API server"""
+    parser = argparse.ArgumentParser(description="Serve wing deals over HTTP with query filters")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="port to listen on (default: 8000)")
+    parser.add_argument('--data', default=DEFAULT_DATA_FILE, help="deals JSON file (default: wing_deals.json)")
+    parser.add_argument('--page', default=DEFAULT_PAGE_FILE, help="HTML page served at / (default: wing_deals.html)")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"rendered responses to keep in memory (default: {DEFAULT_CACHE_SIZE})")
+    args = parser.parse_args()
+    # Nearby queries locate the restaurants from the last bulk import, if there is one
+    load_saved_restaurants()
+
+    server = DealsServer(args.data, args.page, args.cache_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Deal Exporters for Columbus Wing Deals Scraper
+Writes deals to any number of output formats in a single pass over the list.
+
+Each format is a DealExporter subclass registered under a short name:
+
+    json      - a JSON array with one deal per line
+    jsonl     - JSON Lines, one deal object per line
+    csv       - spreadsheet-friendly CSV
+    columnar  - a binary column store that can be memory-mapped and scanned
+                without parsing text (see ColumnarDeals)
+
+New formats only need a subclass with write()/close() and @register_exporter.
+"""
+
+import array
+import csv
+import json
+import math
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from contextlib import ExitStack
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from file_utils import atomic_write
+from restaurant_data import DAY_NAMES, get_deal_days, get_deal_prices
+
+# The fields every deal has, in the order they are written out
+DEAL_FIELDS = ['restaurant', 'deal_text', 'source', 'date_found', 'confidence']
+
+# Where run_scraper() writes each format
+DEFAULT_EXPORTS = {
+    'json': 'wing_deals.json',
+    'csv': 'wing_deals.csv',
+    'columnar': 'wing_deals.wdc',
+}
+
+# Registered exporter classes by format name
+EXPORTERS: Dict[str, type] = {}
+
+
+def register_exporter(cls):
+    """Class decorator that makes an exporter available by its format_name"""
+    EXPORTERS[cls.format_name] = cls
+    return cls
+
+
+class DealExporter:
+    """
+    Base class for output formats
+    Subclasses set format_name and mode, and implement write() (and close() if
+    they buffer anything); the file is written atomically by export_deals()
+    """
+    format_name = ''
+    mode = 'w'
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+
+    def write(self, deal: Dict[str, Any]):
+        raise NotImplementedError
+
+    def close(self):
+        """Finish the file after the last deal"""
+
+
+@register_exporter
+class JSONExporter(DealExporter):
+    """A JSON array with one compact deal per line: small, but still easy to read and diff"""
+    format_name = 'json'
+
+    def write(self, deal: Dict[str, Any]):
+        self.f.write('[\n' if self.count == 0 else ',\n')
+        self.f.write(json.dumps(deal, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        self.f.write('[]\n' if self.count == 0 else '\n]\n')
+
+
+@register_exporter
+class JSONLinesExporter(DealExporter):
+    """One JSON object per line, so readers can stream the file"""
+    format_name = 'jsonl'
+
+    def write(self, deal: Dict[str, Any]):
+        self.f.write(json.dumps(deal, ensure_ascii=False))
+        self.f.write('\n')
+        self.count += 1
+
+
+@register_exporter
+class CSVExporter(DealExporter):
+    """CSV with a header row of DEAL_FIELDS"""
+    format_name = 'csv'
+
+    def __init__(self, f):
+        super().__init__(f)
+        # Fields a deal picked up along the way (e.g. debugging info) are left out
+        self.writer = csv.DictWriter(f, fieldnames=DEAL_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write(self, deal: Dict[str, Any]):
+        self.writer.writerow(deal)
+        self.count += 1
+
+
+# ----------------------------------------------------------------------
+# Columnar binary format
+#
+# Little-endian throughout. The file starts with a header and a column
+# directory, followed by 8-byte aligned column sections:
+#
+#   header:    magic (8s) | format version (I) | column count (I) | row count (Q)
+#   directory: per column: name (16s) | kind (8s) | data offset (Q) | data length (Q)
+#                          | aux offset (Q) | aux length (Q)
+#
+# Column kinds:
+#   dict  data = uint32 code per row; aux = string table of distinct values
+#   text  data = uint64 offsets (rows + 1) into aux; aux = UTF-8 bytes
+#   f64   data = float64 per row (NaN when missing)
+#   u8    data = uint8 per row
+#
+# A string table is a uint64 count, uint64 offsets (count + 1), then UTF-8 bytes.
+
+COLUMNAR_MAGIC = b'WINGCOL\x00'
+COLUMNAR_VERSION = 1
+_HEADER = struct.Struct('<8sIIQ')
+_COLUMN_ENTRY = struct.Struct('<16s8sQQQQ')
+_ALIGNMENT = 8
+
+# Repetitive fields are stored once per distinct value
+DICTIONARY_COLUMNS = ['restaurant', 'source', 'confidence', 'date_found']
+TEXT_COLUMNS = ['deal_text']
+# Values derived from the deal text, so analytics never have to parse it:
+# the lowest price mentioned, and a bitmask of the days mentioned (bit 0 = monday)
+DERIVED_COLUMNS = ['min_price', 'days']
+
+
+def _padding(position: int) -> int:
+    return -position % _ALIGNMENT
+
+
+def _string_table(values: List[str]) -> bytes:
+    """Encode a list of strings as a string table"""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array.array('Q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return struct.pack('<Q', len(values)) + offsets.tobytes() + b''.join(encoded)
+
+
+def _little_endian(values: array.array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+@register_exporter
+class ColumnarExporter(DealExporter):
+    """
+    Dictionary-encoded column store for analytics (read it with ColumnarDeals)
+    Columns are built up as deals arrive; the deal text is spilled to a
+    temporary file so memory stays at a few bytes per row
+    """
+    format_name = 'columnar'
+    mode = 'wb'
+
+    def __init__(self, f):
+        super().__init__(f)
+        self.codes = {name: array.array('I') for name in DICTIONARY_COLUMNS}
+        self.dictionaries: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+        self.text_offsets = {name: array.array('Q', [0]) for name in TEXT_COLUMNS}
+        self.text_spill = {name: tempfile.TemporaryFile() for name in TEXT_COLUMNS}
+        self.min_price = array.array('d')
+        self.days = array.array('B')
+
+    def write(self, deal: Dict[str, Any]):
+        for name in DICTIONARY_COLUMNS:
+            value = str(deal.get(name, ''))
+            dictionary = self.dictionaries[name]
+            code = dictionary.get(value)
+            if code is None:
+                code = dictionary[value] = len(dictionary)
+            self.codes[name].append(code)
+        for name in TEXT_COLUMNS:
+            encoded = str(deal.get(name, '')).encode('utf-8')
+            self.text_spill[name].write(encoded)
+            offsets = self.text_offsets[name]
+            offsets.append(offsets[-1] + len(encoded))
+
+        text = str(deal.get('deal_text', ''))
+        prices = get_deal_prices(text)
+        self.min_price.append(min(prices) if prices else math.nan)
+        mask = 0
+        for day in get_deal_days(text):
+            mask |= 1 << DAY_NAMES.index(day)
+        self.days.append(mask)
+        self.count += 1
+
+    def close(self):
+        # (name, kind, data bytes or spill file, aux bytes or spill file)
+        columns = []
+        for name in DICTIONARY_COLUMNS:
+            columns.append((name, 'dict', _little_endian(self.codes[name]),
+                            _string_table(list(self.dictionaries[name]))))
+        for name in TEXT_COLUMNS:
+            columns.append((name, 'text', _little_endian(self.text_offsets[name]), self.text_spill[name]))
+        columns.append(('min_price', 'f64', _little_endian(self.min_price), b''))
+        columns.append(('days', 'u8', self.days.tobytes(), b''))
+
+        def length(section) -> int:
+            return len(section) if isinstance(section, bytes) else section.tell()
+
+        # Lay out every section before writing anything
+        position = _HEADER.size + _COLUMN_ENTRY.size * len(columns)
+        entries = []
+        for name, kind, data, aux in columns:
+            position += _padding(position)
+            data_offset = position
+            position += length(data)
+            position += _padding(position)
+            aux_offset = position
+            position += length(aux)
+            entries.append(_COLUMN_ENTRY.pack(name.encode('ascii'), kind.encode('ascii'),
+                                              data_offset, length(data), aux_offset, length(aux)))
+
+        self.f.write(_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, len(columns), self.count))
+        self.f.write(b''.join(entries))
+        written = _HEADER.size + _COLUMN_ENTRY.size * len(columns)
+        for _, _, data, aux in columns:
+            for section in (data, aux):
+                self.f.write(b'\0' * _padding(written))
+                written += _padding(written)
+                if isinstance(section, bytes):
+                    self.f.write(section)
+                else:
+                    section.seek(0)
+                    shutil.copyfileobj(section, self.f)
+                written += length(section)
+
+        for spill in self.text_spill.values():
+            spill.close()
+
+
+class ColumnarDeals:
+    """
+    Memory-mapped reader for files written by ColumnarExporter
+    Column scans work on the mapped bytes directly, for example:
+
+        with ColumnarDeals('wing_deals.wdc') as table:
+            high = table.dictionary('confidence').index('high')
+            count = sum(1 for code in table.codes('confidence') if code == high)
+
+    codes() and numbers() return views of the mapped file, valid until close();
+    close() releases them, so using one afterwards raises ValueError (copy it
+    with list() or bytes() to keep it)
+    """
+
+    def __init__(self, filename: str):
+        self._file = open(filename, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        # Typed views handed out, by (offset, length, typecode), released by close()
+        self._sections: Dict[tuple, Any] = {}
+        magic, version, column_count, self.rows = _HEADER.unpack_from(self._mmap, 0)
+        if magic != COLUMNAR_MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a columnar deals file")
+        if version != COLUMNAR_VERSION:
+            self.close()
+            raise ValueError(f"{filename} uses columnar format version {version}, expected {COLUMNAR_VERSION}")
+
+        self.columns: Dict[str, tuple] = {}
+        for i in range(column_count):
+            name, kind, *sections = _COLUMN_ENTRY.unpack_from(self._mmap, _HEADER.size + i * _COLUMN_ENTRY.size)
+            self.columns[name.rstrip(b'\0').decode('ascii')] = (kind.rstrip(b'\0').decode('ascii'), *sections)
+        self._dictionaries: Dict[str, List[str]] = {}
+
+    def _cast(self, offset: int, length: int, typecode: str):
+        """A typed view of one section (copied and byte-swapped on big-endian machines)"""
+        key = (offset, length, typecode)
+        values = self._sections.get(key)
+        if values is None:
+            if sys.byteorder == 'little':
+                values = self._view[offset:offset + length].cast(typecode)
+            else:
+                values = array.array(typecode, self._view[offset:offset + length].tobytes())
+                values.byteswap()
+            self._sections[key] = values
+        return values
+
+    def _column(self, name: str, kind: str) -> tuple:
+        entry = self.columns.get(name)
+        if entry is None or entry[0] != kind:
+            raise KeyError(f"No {kind} column named {name!r}")
+        return entry
+
+    def codes(self, name: str):
+        """The per-row dictionary codes of a dict column"""
+        _, data_offset, data_length, _, _ = self._column(name, 'dict')
+        return self._cast(data_offset, data_length, 'I')
+
+    def dictionary(self, name: str) -> List[str]:
+        """The distinct values of a dict column, indexed by code"""
+        if name not in self._dictionaries:
+            _, _, _, aux_offset, _ = self._column(name, 'dict')
+            count = struct.unpack_from('<Q', self._mmap, aux_offset)[0]
+            offsets = self._cast(aux_offset + 8, (count + 1) * 8, 'Q')
+            start = aux_offset + 8 + (count + 1) * 8
+            self._dictionaries[name] = [
+                bytes(self._view[start + offsets[i]:start + offsets[i + 1]]).decode('utf-8')
+                for i in range(count)
+            ]
+        return self._dictionaries[name]
+
+    def numbers(self, name: str):
+        """The values of a numeric column (f64 or u8)"""
+        kind = self.columns.get(name, ('',))[0]
+        typecode = {'f64': 'd', 'u8': 'B'}.get(kind)
+        if typecode is None:
+            raise KeyError(f"No numeric column named {name!r}")
+        _, data_offset, data_length, _, _ = self.columns[name]
+        return self._cast(data_offset, data_length, typecode)
+
+    def text(self, name: str, row: int) -> str:
+        """One row of a text column"""
+        _, data_offset, data_length, aux_offset, _ = self._column(name, 'text')
+        start, end = struct.unpack_from('<QQ', self._mmap, data_offset + row * 8)
+        return bytes(self._view[aux_offset + start:aux_offset + end]).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        """Rebuild one deal as a dict"""
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        deal = {}
+        for name in DEAL_FIELDS:
+            if self.columns[name][0] == 'dict':
+                deal[name] = self.dictionary(name)[self.codes(name)[row]]
+            else:
+                deal[name] = self.text(name, row)
+        return deal
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self.rows):
+            yield self[row]
+
+    def close(self):
+        """Release every view handed out, then unmap the file (safe to call twice)"""
+        for values in self._sections.values():
+            if isinstance(values, memoryview):
+                values.release()
+        self._sections.clear()
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnarDeals':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def export_deals(deals: Iterable[Dict[str, Any]], outputs: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Write deals to every format in outputs ({format_name: filename}) in one pass
+    Every file is written atomically; if anything fails, none of them are replaced
+    Returns the number of deals written to each file
+    """
+    if outputs is None:
+        outputs = DEFAULT_EXPORTS
+    unknown = set(outputs) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+
+    with ExitStack() as stack:
+        exporters = []
+        for format_name, filename in outputs.items():
+            cls = EXPORTERS[format_name]
+            # newline='' lets the csv module control line endings
+            f = stack.enter_context(atomic_write(filename, cls.mode, newline=''))
+            exporters.append((filename, cls(f)))
+
+        for deal in deals:
+            for _, exporter in exporters:
+                exporter.write(deal)
+        for _, exporter in exporters:
+            exporter.close()
+        return {filename: exporter.count for filename, exporter in exporters}
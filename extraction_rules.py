@@ -0,0 +1,112 @@
+"""
+Extraction Rules for Columbus Wing Deals Scraper
+Lets a restaurant or deal site in restaurant_data.py name the parts of its
+page that hold promotions, so only that text is scanned for deals instead of
+the whole page (reviews, other cities' listings, menus and footers included).
+
+A source opts in with:
+
+    'selectors': ['div.deal-card', '//section[@id="specials"]'],
+    'exclude_selectors': ['.reviews'],      # optional, removed from inside the regions
+
+Selectors starting with '/', './' or '(' are XPath (evaluated with lxml);
+anything else is CSS (evaluated with soupsieve, which BeautifulSoup uses).
+Each distinct set of selectors is compiled once and cached for the life of
+the process. If a source's selectors match nothing, the caller falls back to
+the whole page so a site redesign doesn't silently lose its deals.
+"""
+
+import copy
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import soupsieve
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+# Compiled rules by (selectors, exclude_selectors), shared by every source that uses them
+_compiled_rules: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], 'ExtractionRules'] = {}
+
+
+def is_xpath(selector: str) -> bool:
+    """XPath expressions start with a path or a parenthesized expression; everything else is CSS"""
+    return selector.lstrip().startswith(('/', './', '('))
+
+
+class ExtractionRules:
+    """
+    One source's compiled selectors
+    """
+
+    def __init__(self, selectors: List[str], exclude_selectors: List[str] = ()):
+        # soupsieve/lxml raise on invalid selectors here, when restaurant_data is first read
+        self.css = [soupsieve.compile(selector) for selector in selectors if not is_xpath(selector)]
+        self.xpath = [etree.XPath(selector) for selector in selectors if is_xpath(selector)]
+        self.exclude_css = [soupsieve.compile(selector) for selector in exclude_selectors if not is_xpath(selector)]
+        self.exclude_xpath = [etree.XPath(selector) for selector in exclude_selectors if is_xpath(selector)]
+
+    def _css_regions(self, soup: BeautifulSoup) -> List[str]:
+        chosen = []
+        for selector in self.css:
+            for element in selector.select(soup):
+                # A region inside one already chosen would be scanned twice
+                if any(element is other or other in element.parents for other in chosen):
+                    continue
+                chosen.append(element)
+        texts = []
+        for element in chosen:
+            if self.exclude_css:
+                # The caller's tree is still used afterwards (the whole page is the fallback), so cut a copy
+                element = copy.copy(element)
+                for exclude in self.exclude_css:
+                    for unwanted in exclude.select(element):
+                        unwanted.decompose()
+            texts.append(element.get_text(' '))
+        return texts
+
+    def _xpath_regions(self, page: Union[bytes, str]) -> List[str]:
+        tree = lxml_html.fromstring(page)
+        chosen = []
+        for selector in self.xpath:
+            for element in selector(tree):
+                # XPath can return text or attribute values; only elements are regions
+                if not isinstance(element, etree._Element):
+                    continue
+                if any(element is other or other in element.iterancestors() for other in chosen):
+                    continue
+                chosen.append(element)
+        texts = []
+        for element in chosen:
+            for exclude in self.exclude_xpath:
+                for unwanted in exclude(element):
+                    if isinstance(unwanted, etree._Element) and unwanted is not element:
+                        unwanted.drop_tree()
+            texts.append(element.text_content())
+        return texts
+
+    def extract_text(self, page: Union[bytes, str, BeautifulSoup]) -> Optional[str]:
+        """
+        The text of the page's promo regions, or None if no selector matched
+        page can be the raw page or an already-parsed BeautifulSoup tree, which is left unchanged
+        """
+        texts = []
+        if self.xpath:
+            raw = str(page) if isinstance(page, BeautifulSoup) else page
+            if raw:
+                texts.extend(self._xpath_regions(raw))
+        if self.css:
+            # The lxml parser is much faster than html.parser for building the tree
+            soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, 'lxml')
+            texts.extend(self._css_regions(soup))
+        return '\n'.join(texts) if texts else None
+
+
+def get_extraction_rules(source: Dict[str, Any]) -> Optional[ExtractionRules]:
+    """The compiled rules for a restaurant or deal site, or None if it doesn't declare selectors"""
+    selectors = tuple(source.get('selectors') or ())
+    if not selectors:
+        return None
+    key = (selectors, tuple(source.get('exclude_selectors') or ()))
+    rules = _compiled_rules.get(key)
+    if rules is None:
+        rules = _compiled_rules[key] = ExtractionRules(*key)
+    return rules
@@ -0,0 +1,40 @@
+"""
+File Helpers for Columbus Wing Deals Scraper
+Shared helpers for writing output files safely.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Permissions for finished files: what open() would give them under the umask
+# Read once here, since reading the umask means setting it, which affects every thread
+_umask = os.umask(0)
+os.umask(_umask)
+FILE_MODE = 0o666 & ~_umask
+
+
+@contextmanager
+def atomic_write(filename: str, mode: str = 'w', encoding: str = 'utf-8', newline: str = None,
+                 buffering: int = -1):
+    """
+    Open a temporary file next to `filename` and move it into place when the block finishes
+    Readers (a browser, a web server) never see a half-written file; if the block
+    raises, the temporary file is removed and the old file is left untouched
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(filename) + '.', suffix='.tmp')
+    try:
+        if 'b' in mode:
+            f = os.fdopen(fd, mode, buffering=buffering)
+        else:
+            f = os.fdopen(fd, mode, buffering=buffering, encoding=encoding, newline=newline)
+        with f:
+            yield f
+        # mkstemp creates files readable only by us; match normal file permissions
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,246 @@
+"""
+Fuzzy Name Index for Columbus Wing Deals Scraper
+A trigram index over restaurant names and website hosts, for catching
+near-duplicates ("Marshalls Grandview" vs "Marshall's Grandview") and for
+spotting which restaurant a deal site's text is talking about.
+
+Names are lowercased, apostrophes and punctuation are dropped, nicknames
+from NAME_ALIASES are expanded ("bdubs" -> "buffalo wild wings") and the
+result is squashed into one string of letters and digits. Each entry's
+trigrams ("wingstop" -> win, ing, ngs, gst, sto, top) go into a postings
+list, so a lookup only touches entries that share a trigram with the query
+instead of comparing against every restaurant.
+
+Hosts are indexed without "www" and the domain suffix. When several
+restaurants share a domain (a hosting platform like joes.square.site and
+bobs.square.site), each is indexed by its own part of the host only, so the
+shared domain doesn't make them all look alike. Names that differ only in
+their numbers ("Wingstop #12", "Wingstop #14") are separate locations and
+never count as near-duplicates of each other.
+"""
+
+import math
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from restaurant_data import NAME_ALIASES
+
+# Similarity a name needs to count as a near-match (Dice coefficient over trigrams)
+DEFAULT_THRESHOLD = 0.6
+# Share of a name's trigrams that must appear in a text to count as a mention
+MENTION_THRESHOLD = 0.85
+# Names shorter than this (once squashed) are too ambiguous to find inside free text
+MIN_MENTION_LENGTH = 6
+DEFAULT_LIMIT = 5
+
+# Domain suffixes, dropped from the end of a host
+_HOST_SUFFIXES = {'com', 'net', 'org', 'biz', 'co', 'us', 'info', 'io', 'site', 'uk'}
+# Host parts that say nothing about the restaurant
+_HOST_NOISE = {'www', 'menu', 'order', 'online'}
+_DIGITS = re.compile(r'\d+')
+
+
+# Matches any nickname as whole words, longest first ("b dubs" before "dubs")
+_ALIAS_PATTERN = re.compile(r'\b(' + '|'.join(re.escape(alias) for alias in sorted(NAME_ALIASES, key=len, reverse=True)) + r')\b')
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, drop apostrophes and punctuation, expand nicknames and squash out spaces"""
+    words = ' '.join(re.findall(r'[a-z0-9]+', text.lower().replace("'", '').replace('’', '')))
+    words = _ALIAS_PATTERN.sub(lambda match: NAME_ALIASES[match.group(1)], words)
+    return words.replace(' ', '')
+
+
+def host_parts(url: str) -> Tuple[str, str]:
+    """
+    A URL's host split into (site part, domain), suffix and noise dropped
+    'https://joes.square.site/x' -> ('joes', 'square'); 'https://www.wingstop.com' -> ('', 'wingstop')
+    """
+    host = urlparse(url if '//' in url else '//' + url).netloc.lower().split(':')[0]
+    labels = [label for label in host.split('.') if label]
+    while len(labels) > 1 and labels[-1] in _HOST_SUFFIXES:
+        labels.pop()
+    if not labels:
+        return '', ''
+    site = ''.join(label for label in labels[:-1] if label not in _HOST_NOISE)
+    return site, labels[-1]
+
+
+def normalize_host(url: str) -> str:
+    """The meaningful part of a URL's host ('https://www.wingstop.com/x' -> 'wingstop')"""
+    return ''.join(host_parts(url))
+
+
+def _host_text(site: str, domain: str, shared: bool) -> str:
+    """What gets indexed for a host: just the site part when other restaurants share the domain"""
+    return site if shared and site else site + domain
+
+
+def numbered_apart(first: str, second: str) -> bool:
+    """Whether two normalized names differ only in their numbers ('wingstop12' and 'wingstop14')"""
+    return first != second and _DIGITS.sub('#', first) == _DIGITS.sub('#', second)
+
+
+def trigrams(text: str) -> Set[str]:
+    """The distinct 3-character pieces of a normalized string (short strings are one piece)"""
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FuzzyNameIndex:
+    """
+    Trigram postings over each restaurant's name and website host
+    Entries are keyed by restaurant name; add() with an existing key replaces it
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        # Per key: the trigram set of each indexed field ('name', 'host')
+        self.entries: Dict[str, Dict[str, Set[str]]] = {}
+        # Per key: its normalized name and the URL it was added with
+        self.names: Dict[str, str] = {}
+        self.urls: Dict[str, str] = {}
+        # Per domain: the keys whose host is on it
+        self._domain_keys: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_restaurants(cls, restaurants: List[Dict[str, Any]]) -> 'FuzzyNameIndex':
+        """Build an index over a list of restaurant records"""
+        index = cls()
+        for restaurant in restaurants:
+            index.add(restaurant['name'], restaurant.get('url'))
+        return index
+
+    def add(self, name: str, url: Optional[str] = None):
+        """Index a restaurant's name and (if given) its website host"""
+        self.remove(name)
+        self.names[name] = normalize_name(name)
+        fields = {'name': trigrams(self.names[name])}
+        if url:
+            site, domain = host_parts(url)
+            keys = self._domain_keys.setdefault(domain, set())
+            if len(keys) == 1:
+                # The domain's first restaurant was indexed by its whole host; now the domain is shared
+                self._reindex_host(next(iter(keys)), shared=True)
+            keys.add(name)
+            self.urls[name] = url
+            fields['host'] = trigrams(_host_text(site, domain, len(keys) > 1))
+        self._store(name, fields)
+
+    def remove(self, name: str) -> bool:
+        """Drop a restaurant from the index; returns True if it was there"""
+        if self._unstore(name) is None:
+            return False
+        del self.names[name]
+        url = self.urls.pop(name, None)
+        if url:
+            domain = host_parts(url)[1]
+            keys = self._domain_keys[domain]
+            keys.discard(name)
+            if len(keys) == 1:
+                self._reindex_host(next(iter(keys)), shared=False)
+            elif not keys:
+                del self._domain_keys[domain]
+        return True
+
+    def _store(self, name: str, fields: Dict[str, Set[str]]):
+        self.entries[name] = fields
+        for grams in fields.values():
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(name)
+
+    def _unstore(self, name: str) -> Optional[Dict[str, Set[str]]]:
+        fields = self.entries.pop(name, None)
+        if fields is None:
+            return None
+        for grams in fields.values():
+            for gram in grams:
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(name)
+                    if not keys:
+                        del self.postings[gram]
+        return fields
+
+    def _reindex_host(self, name: str, shared: bool):
+        """Index an entry's host again, with or without its (now shared or no longer shared) domain"""
+        fields = self._unstore(name)
+        fields['host'] = trigrams(_host_text(*host_parts(self.urls[name]), shared))
+        self._store(name, fields)
+
+    def _shared_counts(self, query: Set[str]) -> Dict[str, int]:
+        """
+        How many of the query's trigrams each candidate entry has (only entries sharing one)
+        This bounds the overlap with any one field, so weak candidates can be skipped
+        without comparing their trigram sets
+        """
+        counts: Dict[str, int] = {}
+        for gram in query:
+            for key in self.postings.get(gram, ()):
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def find_similar(self, name: str, url: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                     threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[str, float]]:
+        """
+        Restaurants whose name or host looks like this name or URL, best first
+        Returns (name, similarity) pairs; similarity is 1.0 for the same normalized name.
+        Names are also compared with hosts, so 'Wing Stop' finds wingstop.com.
+        Names that differ only in their numbers are never returned
+        """
+        normalized = normalize_name(name)
+        queries = [trigrams(normalized)]
+        if url:
+            site, domain = host_parts(url)
+            shared = bool(self._domain_keys.get(domain, set()) - {name})
+            queries.append(trigrams(_host_text(site, domain, shared)))
+
+        scores: Dict[str, float] = {}
+        for query in queries:
+            if not query:
+                continue
+            # A match needs at least min_overlap of the query's trigrams, so it must have one of
+            # the (len - min_overlap + 1) rarest; only those postings lists are read
+            min_overlap = max(1, math.ceil(threshold * len(query) / (2 - threshold)))
+            rarest = sorted(query, key=lambda gram: len(self.postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(query) - min_overlap + 1]:
+                candidates.update(self.postings.get(gram, ()))
+            # Sets much bigger or smaller than the query can't reach the threshold either
+            min_size = threshold * len(query) / (2 - threshold)
+            max_size = len(query) * (2 - threshold) / threshold
+            for key in candidates:
+                if numbered_apart(normalized, self.names[key]):
+                    continue
+                for grams in self.entries[key].values():
+                    if not min_size <= len(grams) <= max_size:
+                        continue
+                    overlap = len(query & grams)
+                    similarity = 2 * overlap / (len(query) + len(grams))
+                    if similarity > scores.get(key, 0.0):
+                        scores[key] = similarity
+
+        ranked = sorted(((key, round(score, 3)) for key, score in scores.items() if score >= threshold),
+                        key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def find_mentions(self, text: str, limit: int = DEFAULT_LIMIT,
+                      threshold: float = MENTION_THRESHOLD) -> List[Tuple[str, float]]:
+        """
+        Restaurants whose name appears (nearly) in a longer text, best first
+        A name counts when most of its trigrams occur in the text; longer names
+        win ties, so 'Buffalo Wild Wings' beats a shorter name it contains
+        """
+        text_grams = trigrams(normalize_name(text))
+        found = []
+        for key, shared in self._shared_counts(text_grams).items():
+            grams = self.entries[key]['name']
+            if len(grams) < MIN_MENTION_LENGTH - 2 or shared < threshold * len(grams):
+                continue
+            coverage = len(grams & text_grams) / len(grams)
+            if coverage >= threshold:
+                found.append((key, round(coverage, 3), len(grams)))
+        found.sort(key=lambda item: (-item[1], -item[2], item[0]))
+        return [(key, coverage) for key, coverage, _ in found[:limit]]
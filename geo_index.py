@@ -0,0 +1,226 @@
+"""
+Location Index for Columbus Wing Deals Scraper
+Geocodes restaurant locations from the offline LOCATION_COORDINATES table
+and stores them in a k-d tree so "deals within N miles" and nearest-restaurant
+queries run in logarithmic time, even with every venue in the metro area loaded.
+"""
+
+import heapq
+import math
+import sys
+from typing import List, Dict, Any, Optional, Tuple
+
+from restaurant_data import get_restaurants_by_category, get_location_coordinates, load_saved_restaurants
+
+# Roughly how many miles one degree of latitude covers
+MILES_PER_DEGREE = 69.0
+# Earth's mean radius in miles, used for exact great-circle distances
+EARTH_RADIUS_MILES = 3958.8
+# Reference latitude for the flat projection (downtown Columbus)
+# Over a metro area the distortion of a flat projection is well under 1%
+REFERENCE_LATITUDE = 39.9612
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points in miles
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+
+def _project(lat: float, lon: float) -> Tuple[float, float]:
+    """
+    Project a latitude/longitude pair onto a flat plane measured in miles
+    """
+    x = lon * MILES_PER_DEGREE * math.cos(math.radians(REFERENCE_LATITUDE))
+    y = lat * MILES_PER_DEGREE
+    return x, y
+
+
+class LocationIndex:
+    """
+    Static 2-d tree over geocoded points
+    Each point carries a payload (usually a restaurant name); the tree is stored
+    in flat lists so it stays compact with tens of thousands of points
+    """
+
+    def __init__(self, points: List[Tuple[float, float, Any]]):
+        # points is a list of (lat, lon, payload)
+        self.size = len(points)
+        self._lat = [p[0] for p in points]
+        self._lon = [p[1] for p in points]
+        self._payload = [p[2] for p in points]
+        projected = [_project(p[0], p[1]) for p in points]
+        self._x = [p[0] for p in projected]
+        self._y = [p[1] for p in projected]
+        # _order holds point ids laid out as an implicit balanced tree:
+        # the median of each range is its root, left/right halves are its subtrees
+        self._order = list(range(self.size))
+        self._build()
+
+    def _build(self):
+        """
+        Arrange _order so every range's median splits on alternating x/y axes
+        Uses an explicit stack instead of recursion
+        """
+        stack = [(0, self.size, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if hi - lo <= 1:
+                continue
+            coords = self._x if depth % 2 == 0 else self._y
+            self._order[lo:hi] = sorted(self._order[lo:hi], key=coords.__getitem__)
+            mid = (lo + hi) // 2
+            stack.append((lo, mid, depth + 1))
+            stack.append((mid + 1, hi, depth + 1))
+
+    def within(self, lat: float, lon: float, miles: float) -> List[Tuple[float, Any]]:
+        """
+        Find every point within the given radius
+        Returns (distance_in_miles, payload) pairs sorted nearest first
+        """
+        qx, qy = _project(lat, lon)
+        # Pad the planar search radius slightly, then confirm with the exact distance
+        radius = miles * 1.01
+        results = []
+        stack = [(0, self.size, 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            point = self._order[mid]
+            px, py = self._x[point], self._y[point]
+            if abs(px - qx) <= radius and abs(py - qy) <= radius:
+                distance = haversine_miles(lat, lon, self._lat[point], self._lon[point])
+                if distance <= miles:
+                    results.append((distance, self._payload[point]))
+
+            # Only descend into the halves the search circle can reach
+            diff = (qx - px) if depth % 2 == 0 else (qy - py)
+            if diff - radius <= 0:
+                stack.append((lo, mid, depth + 1))
+            if diff + radius >= 0:
+                stack.append((mid + 1, hi, depth + 1))
+
+        results.sort(key=lambda r: r[0])
+        return results
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """
+        Find the k closest points
+        Returns (distance_in_miles, payload) pairs sorted nearest first
+        """
+        if k <= 0 or self.size == 0:
+            return []
+        qx, qy = _project(lat, lon)
+        # Max-heap of the best k candidates as (-planar_distance, point)
+        best = []
+        # Each entry carries a lower bound on the distance to anything in its range
+        stack = [(0, self.size, 0, 0.0)]
+        while stack:
+            lo, hi, depth, bound = stack.pop()
+            if lo >= hi or (len(best) == k and bound >= -best[0][0]):
+                continue
+            mid = (lo + hi) // 2
+            point = self._order[mid]
+            px, py = self._x[point], self._y[point]
+            distance = math.hypot(px - qx, py - qy)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, point))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, point))
+
+            # Push the far side first so the near side is searched first;
+            # the far side is skipped later if it can't beat the current worst
+            diff = (qx - px) if depth % 2 == 0 else (qy - py)
+            left, right = (lo, mid), (mid + 1, hi)
+            near, far = (left, right) if diff <= 0 else (right, left)
+            stack.append((far[0], far[1], depth + 1, max(bound, abs(diff))))
+            stack.append((near[0], near[1], depth + 1, bound))
+
+        results = [
+            (haversine_miles(lat, lon, self._lat[point], self._lon[point]), self._payload[point])
+            for _, point in best
+        ]
+        results.sort(key=lambda r: r[0])
+        return results
+
+
+def build_restaurant_index(restaurants: Optional[List[Dict[str, Any]]] = None) -> LocationIndex:
+    """
+    Build a LocationIndex with one point per geocoded restaurant location
+    Locations missing from LOCATION_COORDINATES are skipped
+    """
+    if restaurants is None:
+        restaurants = get_restaurants_by_category()
+
+    points = []
+    for restaurant in restaurants:
+        seen = set()
+        for location in restaurant.get('locations', []):
+            coordinates = get_location_coordinates(location)
+            # Several free-text locations can resolve to the same place
+            if coordinates is None or coordinates in seen:
+                continue
+            seen.add(coordinates)
+            points.append((coordinates[0], coordinates[1], restaurant['name']))
+    return LocationIndex(points)
+
+
+def restaurants_within(lat: float, lon: float, miles: float,
+                       index: Optional[LocationIndex] = None) -> Dict[str, float]:
+    """
+    Map each restaurant within the radius to its closest distance in miles
+    """
+    if index is None:
+        index = build_restaurant_index()
+    distances = {}
+    for distance, name in index.within(lat, lon, miles):
+        # Results come back nearest first, so keep the first hit per restaurant
+        distances.setdefault(name, distance)
+    return distances
+
+
+def deals_within(deals: List[Dict[str, Any]], lat: float, lon: float, miles: float,
+                 index: Optional[LocationIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Filter deals down to restaurants within the radius, nearest restaurants first
+    Deals from aggregator sites have no location and are left out
+    """
+    distances = restaurants_within(lat, lon, miles, index)
+    nearby = [deal for deal in deals if deal['restaurant'] in distances]
+    nearby.sort(key=lambda deal: distances[deal['restaurant']])
+    return nearby
+
+
+def main():
+    """Print the restaurants near a point: python geo_index.py LAT LON [MILES]"""
+    if len(sys.argv) < 3:
+        print("Usage: python geo_index.py LAT LON [MILES]")
+        sys.exit(1)
+
+    lat, lon = float(sys.argv[1]), float(sys.argv[2])
+    miles = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    load_saved_restaurants()
+    index = build_restaurant_index()
+    nearby = restaurants_within(lat, lon, miles, index)
+
+    print(f"\n📍 Restaurants within {miles:g} miles of ({lat}, {lon}):")
+    print("=" * 50)
+    if not nearby:
+        print("No restaurants found. Closest options:")
+        for distance, name in index.nearest(lat, lon, k=5):
+            print(f"  {name}: {distance:.1f} mi")
+        return
+    for name, distance in nearby.items():
+        print(f"  {name}: {distance:.1f} mi")
+
+
+if __name__ == "__main__":
+    main()
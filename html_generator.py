@@ -1,16 +1,189 @@
+import argparse
+import gzip
+import hashlib
+import html
+import io
+import itertools
 import json
+import os
+import re
+import shutil
+from array import array
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, TextIO
 
-class WingDealsHTMLGenerator:
+from deal_loader import iter_deals_file
+from file_utils import atomic_write
+from profiling import add_profile_arguments, profiler_from_args
+
+# Brotli is optional; without it production mode writes only .gz files
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from geo_index import LocationIndex, deals_within
+from restaurant_data import get_deal_days, get_deal_prices
+from search_index import DealSearchIndex, write_ids
+
+# Write buffer for streaming mode (1 MB keeps the number of write calls low)
+STREAM_BUFFER_SIZE = 1024 * 1024
+# Title used when generate_html isn't given one
+DEFAULT_PAGE_TITLE = 'Columbus Wing Deals - Best Chicken Wing Specials'
+# Number of deal cards rendered up front and added per "Show more"
+DEFAULT_PAGE_SIZE = 50
+
+# Price filter choices, by a deal's lowest mentioned price: (key, label, from, up to)
+PRICE_BANDS = [
+    ('under_1', 'Under $1', 0, 1),
+    ('1_to_10', '$1 to $10', 1, 10),
+    ('10_and_up', '$10 and up', 10, float('inf')),
+]
+
+# Days that count for the "Weekend Deals" button
+WEEKEND_DAYS = ['friday', 'saturday', 'sunday']
+
+# Ways generate_sharded_site can split deals into files
+SHARD_MODES = ['day', 'restaurant']
+
+# Shard and search files are content-hashed, so they never change once written
+SHARD_CACHE_HEADERS = """/data/deals-*
+  Cache-Control: public, max-age=31536000, immutable
+/data/search-*
+  Cache-Control: public, max-age=31536000, immutable
+/data/manifest.json
+  Cache-Control: no-cache
+/index.html
+  Cache-Control: no-cache
+"""
+
+NO_DEALS_HTML = '<div class="no-deals"><h3>No Deals Found</h3><p>No wing deals found matching your criteria.</p></div>'
+
+# Must produce the same markup as renderCard() in the page's JavaScript
+DEAL_CARD_TEMPLATE = """<div class="deal-card">
+                    <div class="deal-header">
+                        <div>
+                            <div class="restaurant-name">{restaurant}</div>
+                        </div>
+                        <span class="confidence-badge confidence-{confidence}">{confidence}</span>
+                    </div>
+                    <div class="deal-text">{deal_text}</div>
+                    <div class="deal-meta">
+                        <div class="source-info">
+                            <div class="source-icon"></div>
+                            <span>{source}</span>
+                        </div>
+                        <span>Found: {date}</span>
+                    </div>
+                </div>"""
+
+def format_deal_date(date_found: str) -> str:
+    """
+    Format a deal's date_found like "1/15/2024 2:30 PM"
+    Matches formatDate() in the page's JavaScript; unparseable dates are returned as-is
+    """
+    try:
+        date = datetime.strptime(date_found[:16], '%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return date_found
+    hour12 = date.hour % 12 or 12
+    am_pm = 'AM' if date.hour < 12 else 'PM'
+    return f"{date.month}/{date.day}/{date.year} {hour12}:{date.minute:02d} {am_pm}"
+
+def render_deal_card(deal: Dict[str, Any], template: str = DEAL_CARD_TEMPLATE) -> str:
+    """Render one deal card as HTML, escaping all deal fields"""
+    return template.format(
+        restaurant=html.escape(str(deal['restaurant'])),
+        confidence=html.escape(str(deal['confidence'])),
+        deal_text=html.escape(str(deal['deal_text'])),
+        source=html.escape(str(deal['source'])),
+        date=html.escape(str(format_deal_date(deal.get('date_found', '')))),
+    )
+
+def get_filter_keys(deal: Dict[str, Any]) -> List[str]:
+    """
+    Get the filter buttons a deal shows up under: its confidence level,
+    each day it mentions, and 'weekend' for Friday through Sunday deals
+    """
+    keys = [deal['confidence']]
+    days = get_deal_days(deal['deal_text'])
+    keys.extend(days)
+    if any(day in WEEKEND_DAYS for day in days):
+        keys.append('weekend')
+    return keys
+
+def get_price_band(deal: Dict[str, Any]) -> Optional[str]:
+    """Get the PRICE_BANDS key for a deal's lowest mentioned price, or None if it has no price"""
+    prices = get_deal_prices(deal['deal_text'])
+    if not prices:
+        return None
+    lowest = min(prices)
+    for key, _, low, high in PRICE_BANDS:
+        if low <= lowest < high:
+            return key
+    return None
+
+class _FilterIndex:
+    """
+    Ids of the deals behind every filter on the page, filled in one deal at a time
+    Ids are added in order, so every list stays sorted for the page's intersections
+    Ids are kept as arrays of 32-bit ints, 4 bytes per deal per filter it's under
+    """
+    
     def __init__(self):
+        self.total_deals = 0
+        self.buttons = {}
+        self.restaurants = {}
+        self.price_bands = {}
+    
+    def add(self, deal: Dict[str, Any]):
+        deal_id = self.total_deals
+        self.total_deals += 1
+        for key in get_filter_keys(deal):
+            self.buttons.setdefault(key, array('I')).append(deal_id)
+        self.restaurants.setdefault(deal['restaurant'], array('I')).append(deal_id)
+        band = get_price_band(deal)
+        if band:
+            self.price_bands.setdefault(band, array('I')).append(deal_id)
+    
+    def write_json(self, f: TextIO):
+        """Write the page's filter index JSON one id list at a time"""
+        # Restaurants are sorted so the page's restaurant dropdown is alphabetical
+        groups = [('buttons', self.buttons, list(self.buttons)),
+                  ('restaurants', self.restaurants, sorted(self.restaurants)),
+                  ('price_bands', self.price_bands, list(self.price_bands))]
+        f.write('{')
+        for i, (name, ids_by_key, keys) in enumerate(groups):
+            f.write(f'{"," if i else ""}"{name}":{{')
+            for j, key in enumerate(keys):
+                if j:
+                    f.write(',')
+                f.write(_script_safe(json.dumps(key, ensure_ascii=False)) + ':')
+                write_ids(f, ids_by_key[key])
+            f.write('}')
+        f.write('}')
+    
+    def stats(self) -> Dict[str, int]:
+        """Totals for the page's stats bar"""
+        return {
+            'total_deals': self.total_deals,
+            'restaurants': len(self.restaurants),
+            'high_confidence': len(self.buttons.get('high', [])),
+        }
+
+class WingDealsHTMLGenerator:
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, production: bool = False):
+        # How many deal cards are pre-rendered and shown per page
+        self.page_size = page_size
+        # Production mode minifies the page, writes compact JSON and precompressed copies
+        self.production = production
         self.html_template = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Columbus Wing Deals - Best Chicken Wing Specials</title>
+    <title>{{PAGE_TITLE}}</title>
     <style>
         * {
             margin: 0;
@@ -106,6 +279,35 @@ class WingDealsHTMLGenerator:
             color: white;
         }
 
+        .filter-selects {
+            margin-top: 15px;
+        }
+
+        .filter-select {
+            padding: 8px 16px;
+            border: 2px solid #ff6b6b;
+            border-radius: 25px;
+            background: white;
+            color: #2c3e50;
+            font-size: 0.95rem;
+            cursor: pointer;
+        }
+
+        .search-box {
+            width: 100%;
+            margin-top: 15px;
+            padding: 10px 16px;
+            border: 2px solid #e9ecef;
+            border-radius: 25px;
+            font-size: 1rem;
+            outline: none;
+            transition: border-color 0.3s ease;
+        }
+
+        .search-box:focus {
+            border-color: #ff6b6b;
+        }
+
         .deals-container {
             padding: 20px;
         }
@@ -202,6 +404,16 @@ class WingDealsHTMLGenerator:
             border-radius: 50%;
         }
 
+        .load-more {
+            text-align: center;
+            padding: 0 20px 20px;
+            color: #6c757d;
+        }
+
+        .load-more p {
+            margin-bottom: 10px;
+        }
+
         .no-deals {
             text-align: center;
             padding: 60px 20px;
@@ -315,13 +527,24 @@ class WingDealsHTMLGenerator:
                 <button class="filter-btn" data-filter="thursday">Thursday Deals</button>
                 <button class="filter-btn" data-filter="weekend">Weekend Deals</button>
             </div>
+            <div class="filter-group filter-selects">
+                <select class="filter-select" id="restaurant-filter">
+                    <option value="">All Restaurants</option>
+                </select>
+                <select class="filter-select" id="price-filter">
+                    <option value="">Any Price</option>{{PRICE_OPTIONS}}
+                </select>
+            </div>
+            <input type="search" class="search-box" id="search-box" placeholder="Search deals (e.g. tuesday bogo, $0.75, wed* OR thursday)">
         </div>
 
-        <div class="deals-container" id="deals-container">
-            <div class="loading">
-                <div class="spinner"></div>
-                <p>Loading wing deals...</p>
-            </div>
+        <div class="load-more" id="load-earlier" hidden>
+            <button class="filter-btn" id="load-earlier-btn">Show earlier deals</button>
+        </div>
+        <div class="deals-container" id="deals-container">{{INITIAL_CARDS}}</div>
+        <div class="load-more" id="load-more"{{LOAD_MORE_HIDDEN}}>
+            <p id="results-count"></p>
+            <button class="filter-btn" id="load-more-btn">Show more deals</button>
         </div>
     </div>
 
@@ -334,88 +557,444 @@ class WingDealsHTMLGenerator:
     <script>
         // Load deals data from embedded JSON
         const dealsData = {{DEALS_DATA}};
+        // Inverted index over restaurant, deal text and source (built by search_index.py)
+        let searchIndex = {{SEARCH_INDEX}};
+        // In sharded mode deals live in separate files listed here and dealsData is
+        // filled in (by deal id) as shards are fetched; null when deals are embedded
+        const shardManifest = {{SHARD_MANIFEST}};
+        const loadedShards = new Set();
+        // Sorted ids of the deals behind every filter, computed in Python, so a
+        // filter click is a lookup instead of a scan over every deal
+        const filterIndex = {{FILTER_INDEX}};
+        // Totals computed in Python while the page was generated
+        const dealStats = {{DEAL_STATS}};
+        // Cards are added to the page one page at a time, and at most MAX_CARDS stay on
+        // it: going further drops cards from the other end, so the page doesn't keep
+        // growing however far the list is scrolled
+        const PAGE_SIZE = {{PAGE_SIZE}};
+        const MAX_CARDS = PAGE_SIZE * 4;
+        let currentFilter = 'all';
+        let currentRestaurant = '';
+        let currentPriceBand = '';
+        let currentQuery = '';
+        // Deals matching the current filter/search, and the slice of them on screen
+        // (null until the shards behind the pre-rendered first page are loaded)
+        let currentResults = shardManifest ? null : dealsData;
+        let windowStart = 0;
+        let windowEnd = Math.min(PAGE_SIZE, dealStats.total_deals);
+        // Deals removed by live updates leave null gaps so ids stay stable
+        let removedDeals = 0;
+        // Live-update key -> deal id, built on the first update
+        let dealIdsByKey = null;
         
-        // Display deals immediately
-        displayDeals(dealsData);
-        updateStats(dealsData);
+        // The first page of cards was rendered in Python, so there is nothing to draw yet
+        updateStats(dealStats);
+        updateLoadMore();
         document.getElementById('last-updated').textContent = new Date().toLocaleString();
 
-        function displayDeals(deals, filter = 'all') {
+        function displayDeals(deals, filter = 'all', count = PAGE_SIZE, start = 0) {
             const container = document.getElementById('deals-container');
             
-            if (deals.length === 0) {
+            // Intersect the precomputed id lists for every active filter and the search
+            const ids = matchingIds(filter);
+            if (ids !== null) {
+                currentResults = ids.map(id => deals[id]);
+            } else {
+                // Nothing narrows the list; drop the gaps left by unloaded shards
+                currentResults = (shardManifest || removedDeals) ? deals.filter(Boolean) : deals;
+            }
+            
+            if (currentResults.length === 0) {
                 container.innerHTML = '<div class="no-deals"><h3>No Deals Found</h3><p>No wing deals found matching your criteria.</p></div>';
+                windowStart = windowEnd = 0;
+                updateLoadMore();
                 return;
             }
-
-            const filteredDeals = filterDeals(deals, filter);
             
-            container.innerHTML = filteredDeals.map(deal => `
-                <div class="deal-card">
+            // Only build DOM nodes for one window of cards; more are added on demand
+            windowStart = Math.max(0, Math.min(start, currentResults.length - count));
+            windowEnd = Math.min(windowStart + count, currentResults.length);
+            container.innerHTML = currentResults.slice(windowStart, windowEnd).map(renderCard).join('');
+            updateLoadMore();
+        }
+
+        // Which shards hold every deal the given filter could show
+        // (results are an intersection, so any one narrowing filter is enough)
+        function shardsForFilter(filter) {
+            if (!shardManifest) return [];
+            if (shardManifest.shard_by === 'day' && filter !== 'all') {
+                const days = filter === 'weekend' ? ['friday', 'saturday', 'sunday'] : [filter];
+                if (days.every(day => day in shardManifest.shards)) return days;
+            }
+            if (shardManifest.shard_by === 'restaurant' && currentRestaurant in shardManifest.shards) {
+                return [currentRestaurant];
+            }
+            return Object.keys(shardManifest.shards);
+        }
+
+        async function loadShards(keys) {
+            await Promise.all(keys.filter(key => !loadedShards.has(key)).map(async key => {
+                const response = await fetch('data/' + shardManifest.shards[key].file);
+                const shard = await response.json();
+                shard.ids.forEach((id, i) => { dealsData[id] = shard.deals[i]; });
+                loadedShards.add(key);
+            }));
+        }
+
+        async function loadSearchIndex() {
+            if (searchIndex === null) {
+                const response = await fetch('data/' + shardManifest.search_index);
+                searchIndex = await response.json();
+            }
+        }
+
+        // Fetch whatever the current filter and search need, then redraw
+        async function applyFilters() {
+            if (shardManifest) {
+                await loadShards(shardsForFilter(currentFilter));
+                if (currentQuery) await loadSearchIndex();
+            }
+            displayDeals(dealsData, currentFilter);
+        }
+
+        async function showMoreDeals() {
+            if (currentResults === null) {
+                // Still showing the pre-rendered first page: load everything behind it
+                await loadShards(shardsForFilter('all'));
+                currentResults = dealsData.filter(Boolean);
+            }
+            if (windowEnd >= currentResults.length) return;
+            const container = document.getElementById('deals-container');
+            const nextEnd = Math.min(windowEnd + PAGE_SIZE, currentResults.length);
+            const html = currentResults.slice(windowEnd, nextEnd).map(renderCard).join('');
+            container.insertAdjacentHTML('beforeend', html);
+            windowEnd = nextEnd;
+            // Drop the cards furthest above the screen
+            const extra = windowEnd - windowStart - MAX_CARDS;
+            if (extra > 0) {
+                keepInPlace(container.children[extra], () => {
+                    for (let i = 0; i < extra; i++) container.firstElementChild.remove();
+                });
+                windowStart += extra;
+            }
+            updateLoadMore();
+        }
+
+        function showEarlierDeals() {
+            if (windowStart <= 0) return;
+            const container = document.getElementById('deals-container');
+            const nextStart = Math.max(0, windowStart - PAGE_SIZE);
+            const html = currentResults.slice(nextStart, windowStart).map(renderCard).join('');
+            // Drop the cards furthest below the screen
+            const extra = Math.max(0, windowEnd - nextStart - MAX_CARDS);
+            keepInPlace(container.firstElementChild, () => {
+                container.insertAdjacentHTML('afterbegin', html);
+                for (let i = 0; i < extra; i++) container.lastElementChild.remove();
+            });
+            windowStart = nextStart;
+            windowEnd -= extra;
+            updateLoadMore();
+        }
+
+        // Make a change to the cards without moving the given card on screen
+        function keepInPlace(anchor, change) {
+            const top = anchor.getBoundingClientRect().top;
+            change();
+            window.scrollBy(0, anchor.getBoundingClientRect().top - top);
+        }
+
+        function updateLoadMore() {
+            const total = currentResults ? currentResults.length : dealStats.total_deals;
+            document.getElementById('load-more').hidden = total - windowEnd <= 0;
+            document.getElementById('load-earlier').hidden = windowStart <= 0;
+            document.getElementById('results-count').textContent = windowStart > 0
+                ? `Showing ${windowStart + 1}-${windowEnd} of ${total} deals`
+                : `Showing ${windowEnd} of ${total} deals`;
+        }
+
+        // Same markup as render_deal_card() in html_generator.py
+        function renderCard(deal) {
+            return `<div class="deal-card">
                     <div class="deal-header">
                         <div>
-                            <div class="restaurant-name">${deal.restaurant}</div>
+                            <div class="restaurant-name">${escapeHtml(deal.restaurant)}</div>
                         </div>
-                        <span class="confidence-badge confidence-${deal.confidence}">${deal.confidence}</span>
+                        <span class="confidence-badge confidence-${escapeHtml(deal.confidence)}">${escapeHtml(deal.confidence)}</span>
                     </div>
-                    <div class="deal-text">${deal.deal_text}</div>
+                    <div class="deal-text">${escapeHtml(deal.deal_text)}</div>
                     <div class="deal-meta">
                         <div class="source-info">
                             <div class="source-icon"></div>
-                            <span>${deal.source}</span>
+                            <span>${escapeHtml(deal.source)}</span>
                         </div>
-                        <span>Found: ${formatDate(deal.date_found)}</span>
+                        <span>Found: ${escapeHtml(formatDate(deal.date_found))}</span>
                     </div>
-                </div>
-            `).join('');
+                </div>`;
         }
 
-        function filterDeals(deals, filter) {
-            if (filter === 'all') return deals;
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})[c]);
+        }
+
+        // Ids of deals passing every active filter, or null if no filter is active
+        function matchingIds(filter) {
+            const lists = [];
+            if (filter !== 'all') lists.push(filterIndex.buttons[filter] || []);
+            if (currentRestaurant) lists.push(filterIndex.restaurants[currentRestaurant] || []);
+            if (currentPriceBand) lists.push(filterIndex.price_bands[currentPriceBand] || []);
+            if (currentQuery) lists.push(searchDeals(currentQuery));
+            if (lists.length === 0) return null;
             
-            return deals.filter(deal => {
-                const text = deal.deal_text.toLowerCase();
-                const confidence = deal.confidence;
-                
-                switch(filter) {
-                    case 'high':
-                        return confidence === 'high';
-                    case 'medium':
-                        return confidence === 'medium';
-                    case 'low':
-                        return confidence === 'low';
-                    case 'tuesday':
-                        return text.includes('tuesday');
-                    case 'wednesday':
-                        return text.includes('wednesday');
-                    case 'thursday':
-                        return text.includes('thursday');
-                    case 'weekend':
-                        return text.includes('friday') || text.includes('saturday') || text.includes('sunday');
-                    default:
-                        return true;
+            // Start from the shortest list so the work tracks the result size
+            lists.sort((a, b) => a.length - b.length);
+            return lists.reduce(intersectSorted);
+        }
+
+        // Intersect two sorted id lists by binary-searching the longer one
+        function intersectSorted(shorter, longer) {
+            const result = [];
+            let lo = 0;
+            for (const id of shorter) {
+                let hi = longer.length;
+                while (lo < hi) {
+                    const mid = (lo + hi) >> 1;
+                    if (longer[mid] < id) lo = mid + 1; else hi = mid;
+                }
+                if (lo < longer.length && longer[lo] === id) result.push(id);
+            }
+            return result;
+        }
+
+        // Same normalization as tokenize() in search_index.py
+        function tokenize(text) {
+            const raw = text.toLowerCase().match(/\\$\\d+(?:\\.\\d+)?|\\d+(?:\\.\\d+)?%?|[a-z]+(?:'[a-z]+)*/g) || [];
+            const tokens = [];
+            raw.forEach((token, i) => {
+                if (token[0] === '$') {
+                    tokens.push('$' + parseFloat(token.slice(1)).toFixed(2));
+                } else if (/\\d/.test(token[0])) {
+                    tokens.push(token);
+                    const next = raw[i + 1] || '';
+                    if ((next === 'cent' || next === 'cents') && !token.endsWith('%')) {
+                        tokens.push('$' + (parseFloat(token) / 100).toFixed(2));
+                    }
+                } else {
+                    const word = token.replace(/'/g, '');
+                    tokens.push(Object.prototype.hasOwnProperty.call(searchIndex.aliases, word) ? searchIndex.aliases[word] : word);
                 }
             });
+            return tokens;
         }
 
-        function updateStats(deals) {
-            const totalDeals = deals.length;
-            const restaurants = new Set(deals.map(d => d.restaurant)).size;
-            const highConfidence = deals.filter(d => d.confidence === 'high').length;
+        // Position of the first term >= the given term in the sorted term list
+        function lowerBound(term) {
+            let lo = 0, hi = searchIndex.terms.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (searchIndex.terms[mid] < term) lo = mid + 1; else hi = mid;
+            }
+            return lo;
+        }
+
+        function allDealIds() {
+            const ids = Array.from({length: searchIndex.doc_count}, (_, i) => i);
+            return new Set(removedDeals ? ids.filter(id => dealsData[id] !== null) : ids);
+        }
+
+        function lookupWord(word) {
+            const prefix = word.endsWith('*');
+            const tokens = tokenize(word.replace(/\\*+$/, ''));
+            if (tokens.length === 0) return allDealIds();
             
-            document.getElementById('total-deals').textContent = totalDeals;
-            document.getElementById('restaurants').textContent = restaurants;
-            document.getElementById('high-confidence').textContent = highConfidence;
+            let result = null;
+            tokens.forEach((token, i) => {
+                const ids = new Set();
+                let pos = lowerBound(token);
+                if (prefix && i === tokens.length - 1) {
+                    while (pos < searchIndex.terms.length && searchIndex.terms[pos].startsWith(token)) {
+                        searchIndex.postings[pos++].forEach(id => ids.add(id));
+                    }
+                } else if (searchIndex.terms[pos] === token) {
+                    searchIndex.postings[pos].forEach(id => ids.add(id));
+                }
+                result = result === null ? ids : new Set([...result].filter(id => ids.has(id)));
+            });
+            return result;
         }
 
+        // Boolean search: words are ANDed, OR separates alternatives,
+        // NOT or a leading '-' excludes, a trailing '*' matches prefixes
+        function searchDeals(query) {
+            const groups = [[]];
+            query.split(/\\s+/).filter(Boolean).forEach(word => {
+                if (word === 'OR') groups.push([]);
+                else if (word !== 'AND') groups[groups.length - 1].push(word);
+            });
+            
+            const matches = new Set();
+            groups.forEach(group => {
+                const include = [], exclude = [];
+                let negate = false;
+                group.forEach(word => {
+                    if (word === 'NOT') { negate = true; return; }
+                    if (word.startsWith('-') && word.length > 1) { negate = true; word = word.slice(1); }
+                    (negate ? exclude : include).push(word);
+                    negate = false;
+                });
+                if (include.length === 0 && exclude.length === 0) return;
+                
+                const candidates = include.map(lookupWord).sort((a, b) => a.size - b.size);
+                let ids = candidates.length ? candidates[0] : allDealIds();
+                candidates.slice(1).forEach(set => { ids = new Set([...ids].filter(id => set.has(id))); });
+                exclude.forEach(word => {
+                    const excluded = lookupWord(word);
+                    ids = new Set([...ids].filter(id => !excluded.has(id)));
+                });
+                ids.forEach(id => matches.add(id));
+            });
+            return [...matches].sort((a, b) => a - b);
+        }
+
+        function updateStats(stats) {
+            document.getElementById('total-deals').textContent = stats.total_deals;
+            document.getElementById('restaurants').textContent = stats.restaurants;
+            document.getElementById('high-confidence').textContent = stats.high_confidence;
+        }
+
+        // Same output as format_deal_date() in html_generator.py, e.g. "1/15/2024 2:30 PM"
         function formatDate(dateString) {
-            const date = new Date(dateString);
-            return date.toLocaleDateString() + ' ' + date.toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'});
+            const match = /^(\\d{4})-(\\d{2})-(\\d{2}) (\\d{2}):(\\d{2})/.exec(dateString || '');
+            if (!match) return dateString;
+            const hour = parseInt(match[4], 10);
+            const hour12 = hour % 12 === 0 ? 12 : hour % 12;
+            return `${parseInt(match[2], 10)}/${parseInt(match[3], 10)}/${match[1]} ${hour12}:${match[5]} ${hour < 12 ? 'AM' : 'PM'}`;
+        }
+
+        // Keep this in sync with deal_key() in deals_server.py
+        function dealKey(deal) {
+            return [deal.restaurant, deal.source, deal.deal_text].join('\\u001f');
+        }
+
+        // Position of the first id >= the given id in a sorted id list
+        function sortedPosition(list, id) {
+            let lo = 0, hi = list.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (list[mid] < id) lo = mid + 1; else hi = mid;
+            }
+            return lo;
+        }
+
+        function insertSorted(list, id) {
+            const pos = sortedPosition(list, id);
+            if (list[pos] !== id) list.splice(pos, 0, id);
+        }
+
+        function removeSorted(list, id) {
+            const pos = sortedPosition(list, id);
+            if (list[pos] === id) list.splice(pos, 1);
+        }
+
+        // Search terms for a deal, tokenized field by field like search_index.py
+        function dealTerms(deal) {
+            const terms = new Set();
+            ['restaurant', 'deal_text', 'source'].forEach(field => {
+                tokenize(String(deal[field] ?? '')).forEach(term => terms.add(term));
+            });
+            return terms;
+        }
+
+        function addRestaurantOption(name) {
+            const option = document.createElement('option');
+            option.value = name;
+            option.textContent = name;
+            document.getElementById('restaurant-filter').appendChild(option);
+        }
+
+        // Add a deal's id to the filter and search indexes (entry comes from diff_deals())
+        function indexDeal(id, entry) {
+            const deal = entry.deal;
+            entry.filters.forEach(key => insertSorted(filterIndex.buttons[key] = filterIndex.buttons[key] || [], id));
+            if (!(deal.restaurant in filterIndex.restaurants)) {
+                filterIndex.restaurants[deal.restaurant] = [];
+                addRestaurantOption(deal.restaurant);
+            }
+            insertSorted(filterIndex.restaurants[deal.restaurant], id);
+            if (entry.price_band) {
+                insertSorted(filterIndex.price_bands[entry.price_band] = filterIndex.price_bands[entry.price_band] || [], id);
+            }
+            dealTerms(deal).forEach(term => {
+                const pos = lowerBound(term);
+                if (searchIndex.terms[pos] !== term) {
+                    searchIndex.terms.splice(pos, 0, term);
+                    searchIndex.postings.splice(pos, 0, []);
+                }
+                insertSorted(searchIndex.postings[pos], id);
+            });
+        }
+
+        function unindexDeal(id) {
+            [filterIndex.buttons, filterIndex.restaurants, filterIndex.price_bands].forEach(lists => {
+                Object.values(lists).forEach(list => removeSorted(list, id));
+            });
+            dealTerms(dealsData[id]).forEach(term => {
+                const pos = lowerBound(term);
+                if (searchIndex.terms[pos] === term) removeSorted(searchIndex.postings[pos], id);
+            });
+        }
+
+        // Patch the deals and indexes with one diff from deals_server.py, then redraw
+        // the current view in place (keeping the same slice of cards on screen)
+        function applyDealDiff(diff) {
+            if (dealIdsByKey === null) {
+                dealIdsByKey = new Map();
+                dealsData.forEach((deal, id) => { if (deal) dealIdsByKey.set(dealKey(deal), id); });
+            }
+            diff.removed.forEach(key => {
+                const id = dealIdsByKey.get(key);
+                if (id === undefined) return;
+                unindexDeal(id);
+                dealsData[id] = null;
+                dealIdsByKey.delete(key);
+                removedDeals++;
+            });
+            // A page loaded just before a run may already have some of these,
+            // so match by key either way
+            diff.changed.concat(diff.added).forEach(entry => {
+                let id = dealIdsByKey.get(entry.key);
+                if (id === undefined) {
+                    id = dealsData.length;
+                    dealsData.push(entry.deal);
+                    dealIdsByKey.set(entry.key, id);
+                } else {
+                    unindexDeal(id);
+                    dealsData[id] = entry.deal;
+                }
+                indexDeal(id, entry);
+            });
+            searchIndex.doc_count = dealsData.length;
+
+            dealStats.total_deals = dealsData.length - removedDeals;
+            dealStats.restaurants = Object.values(filterIndex.restaurants).filter(ids => ids.length).length;
+            dealStats.high_confidence = (filterIndex.buttons.high || []).length;
+            updateStats(dealStats);
+            displayDeals(dealsData, currentFilter, Math.max(windowEnd - windowStart, PAGE_SIZE), windowStart);
+            document.getElementById('last-updated').textContent = new Date().toLocaleString();
+        }
+
+        // When the page is served by deals_server.py, new runs arrive as diffs over
+        // Server-Sent Events; anywhere else (a file, a static server) this does nothing
+        function connectLiveUpdates() {
+            if (shardManifest || !('EventSource' in window) || !/^https?:$/.test(location.protocol)) return;
+            const source = new EventSource('events');
+            source.addEventListener('diff', event => applyDealDiff(JSON.parse(event.data)));
+            // Missed too many updates while disconnected to catch up by diff
+            source.addEventListener('reload', () => location.reload());
         }
 
         // Filter button functionality
         document.addEventListener('DOMContentLoaded', function() {
-            const filterButtons = document.querySelectorAll('.filter-btn');
+            const filterButtons = document.querySelectorAll('.filter-btn[data-filter]');
             
             filterButtons.forEach(button => {
                 button.addEventListener('click', function() {
@@ -425,54 +1004,433 @@ class WingDealsHTMLGenerator:
                     this.classList.add('active');
                     
                     // Get the filter value
-                    const filter = this.getAttribute('data-filter');
+                    currentFilter = this.getAttribute('data-filter');
                     
                     // Apply filter to embedded data
-                    displayDeals(dealsData, filter);
+                    applyFilters();
                 });
             });
+            
+            // Restaurant options come from the filter index so streamed pages get them too
+            const restaurantSelect = document.getElementById('restaurant-filter');
+            Object.keys(filterIndex.restaurants).forEach(addRestaurantOption);
+            restaurantSelect.addEventListener('change', function() {
+                currentRestaurant = this.value;
+                applyFilters();
+            });
+            document.getElementById('price-filter').addEventListener('change', function() {
+                currentPriceBand = this.value;
+                applyFilters();
+            });
+            
+            // Re-run the search as the user types
+            document.getElementById('search-box').addEventListener('input', function() {
+                currentQuery = this.value.trim();
+                applyFilters();
+            });
+            
+            // Add the next page when the button is clicked or scrolled into view
+            // (and the page before, once scrolling has dropped it, the same way)
+            const loadMoreButton = document.getElementById('load-more-btn');
+            const loadEarlierButton = document.getElementById('load-earlier-btn');
+            loadMoreButton.addEventListener('click', showMoreDeals);
+            loadEarlierButton.addEventListener('click', showEarlierDeals);
+            if ('IntersectionObserver' in window) {
+                const observer = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (!entry.isIntersecting) return;
+                        if (entry.target === loadMoreButton) showMoreDeals();
+                        else showEarlierDeals();
+                    });
+                }, {rootMargin: '400px'});
+                observer.observe(loadMoreButton);
+                observer.observe(loadEarlierButton);
+            }
+            
+            connectLiveUpdates();
         });
     </script>
 </body>
 </html>
         """
+        # The price options never change, so fill them in up front
+        price_options = ''.join(
+            f'\n                    <option value="{key}">{html.escape(label)}</option>'
+            for key, label, _, _ in PRICE_BANDS
+        )
+        template = self.html_template.replace('{{PRICE_OPTIONS}}', price_options)
+        self._card_template = DEAL_CARD_TEMPLATE
+        if production:
+            # Minify once here rather than on every page
+            minified = minify_template(template)
+            print(f"Minified page template: {len(template):,} -> {len(minified):,} bytes "
+                  f"({len(template) - len(minified):,} saved)")
+            template = minified
+            self._card_template = minify_template(DEAL_CARD_TEMPLATE)
+        
+        # Split the template once around the deals so streaming mode can write
+        # the prefix, then the deals, then the suffix without copying the page
+        self._template_prefix, template_suffix = template.split('{{DEALS_DATA}}')
+        # Text and placeholder names alternate, so the indexes can be written straight into the page
+        self._suffix_parts = re.split(r'\{\{([A-Z_]+)\}\}', template_suffix)
     
-    def generate_html(self, deals: List[Dict[str, Any]], output_file: str = 'wing_deals.html'):
+    def generate_html(self, deals: Iterable[Dict[str, Any]], output_file: str = 'wing_deals.html',
+                      search_index: DealSearchIndex = None, stream: bool = False, title: str = None):
         """
         Generate HTML file with embedded deals data
         This embeds the JSON data directly into the HTML so it works when opened locally
+        Pass the scraper's search_index to skip rebuilding it (it must cover exactly these deals)
+        With stream=True, deals can be any iterable and are written out one at a time
+        title overrides the page's <title> (defaults to DEFAULT_PAGE_TITLE)
         """
+        if stream:
+            return self._stream_html(deals, output_file, search_index, title)
+        
         # Convert deals to JSON string for embedding
-        deals_json = json.dumps(deals, indent=2)
+        deals_json = _script_safe(json.dumps(deals, **self._json_format()))
+        
+        # Build the search index for the page's search box
+        if search_index is None:
+            search_index = DealSearchIndex.from_deals(deals)
         
-        # Replace placeholder with actual data
-        html_content = self.html_template.replace('{{DEALS_DATA}}', deals_json)
+        filter_index = _FilterIndex()
+        for deal in deals:
+            filter_index.add(deal)
+        
+        # Fill in the template around the deals data
+        html_content = (
+            self._render_prefix(deals[:self.page_size], len(deals) > self.page_size, title)
+            + deals_json
+            + self._render_suffix(search_index, filter_index)
+        )
         
         # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with atomic_write(output_file) as f:
             f.write(html_content)
         
         print(f"Generated HTML file: {output_file}")
+        if self.production:
+            print_compression_report([(output_file, precompress_file(output_file))])
         return output_file
+    
+    def _json_format(self) -> Dict[str, Any]:
+        """json.dumps options: readable in development, compact in production"""
+        if self.production:
+            return {'separators': (',', ':'), 'ensure_ascii': False}
+        return {'indent': 2}
+    
+    def _stream_html(self, deals: Iterable[Dict[str, Any]], output_file: str,
+                     search_index: DealSearchIndex = None, title: str = None):
+        """
+        Write the page straight to disk, one compact deal at a time
+        Only the first page of deals is held and one deal is serialized at a time. The
+        search and filter indexes are filled in during the same pass and written after
+        the deals, a list at a time. They keep only 4-byte deal ids, but those still
+        grow with the number of deals (each deal's distinct terms and filters), so
+        memory is bounded by the indexes rather than the deals
+        """
+        build_index = search_index is None
+        if build_index:
+            search_index = DealSearchIndex(compact=True)
+        filter_index = _FilterIndex()
+        
+        # Hold back just the first page (plus one deal to know if there are more)
+        # so its cards can be rendered into the page ahead of the data
+        deals = iter(deals)
+        first_page = list(itertools.islice(deals, self.page_size + 1))
+        has_more = len(first_page) > self.page_size
+        
+        with atomic_write(output_file, buffering=STREAM_BUFFER_SIZE) as f:
+            f.write(self._render_prefix(first_page[:self.page_size], has_more, title))
+            f.write('[')
+            for deal in itertools.chain(first_page, deals):
+                if filter_index.total_deals:
+                    f.write(',')
+                f.write(_script_safe(json.dumps(deal, separators=(',', ':'), ensure_ascii=False)))
+                if build_index:
+                    search_index.add_deal(deal)
+                filter_index.add(deal)
+            f.write(']')
+            self._write_suffix(f, search_index, filter_index)
+        
+        print(f"Generated HTML file: {output_file} ({filter_index.total_deals} deals, streamed)")
+        if self.production:
+            print_compression_report([(output_file, precompress_file(output_file))])
+        return output_file
+    
+    def _render_prefix(self, first_page: List[Dict[str, Any]], has_more: bool, title: str = None) -> str:
+        """
+        Fill in the part of the page before the deals data
+        The first page of cards is rendered here so it shows before any JavaScript runs
+        """
+        if first_page:
+            cards = ''.join(render_deal_card(deal, self._card_template) for deal in first_page)
+        else:
+            cards = NO_DEALS_HTML
+        prefix = self._template_prefix.replace('{{PAGE_TITLE}}', html.escape(title or DEFAULT_PAGE_TITLE))
+        prefix = prefix.replace('{{LOAD_MORE_HIDDEN}}', '' if has_more else ' hidden')
+        return prefix.replace('{{INITIAL_CARDS}}', cards)
+    
+    def _render_suffix(self, search_index: DealSearchIndex, filter_index: _FilterIndex,
+                       shard_manifest: Dict[str, Any] = None) -> str:
+        """
+        Fill in the part of the page after the deals data
+        Pass search_index=None with a shard_manifest to have the page fetch the index instead
+        """
+        buffer = io.StringIO()
+        self._write_suffix(buffer, search_index, filter_index, shard_manifest)
+        return buffer.getvalue()
+    
+    def _write_suffix(self, f: TextIO, search_index: DealSearchIndex, filter_index: _FilterIndex,
+                      shard_manifest: Dict[str, Any] = None):
+        """Write the part of the page after the deals data, streaming the indexes into it"""
+        for i, part in enumerate(self._suffix_parts):
+            if i % 2 == 0:
+                f.write(part)
+            elif part == 'SEARCH_INDEX':
+                if search_index:
+                    search_index.write_json(f)
+                else:
+                    f.write('null')
+            elif part == 'SHARD_MANIFEST':
+                f.write(_script_safe(json.dumps(shard_manifest, separators=(',', ':'))))
+            elif part == 'FILTER_INDEX':
+                filter_index.write_json(f)
+            elif part == 'DEAL_STATS':
+                f.write(json.dumps(filter_index.stats()))
+            elif part == 'PAGE_SIZE':
+                f.write(str(self.page_size))
+    
+    def generate_sharded_site(self, deals: List[Dict[str, Any]], output_dir: str = 'site',
+                              shard_by: str = 'day'):
+        """
+        Write the page with deals split into content-hashed JSON shards instead of embedded
+        shard_by='day' writes one shard per day mentioned (plus 'any_day'), so a day filter
+        only downloads that day; shard_by='restaurant' writes one shard per restaurant.
+        Shards that didn't change keep the same file name, so browsers can cache them forever.
+        The page uses fetch(), so serve the directory over HTTP rather than opening it from disk.
+        """
+        if shard_by not in SHARD_MODES:
+            raise ValueError(f"shard_by must be one of {', '.join(SHARD_MODES)}")
+        
+        data_dir = os.path.join(output_dir, 'data')
+        os.makedirs(data_dir, exist_ok=True)
+        
+        # Group deal ids by shard key; a deal mentioning several days goes in each day's shard
+        shard_ids = {}
+        for deal_id, deal in enumerate(deals):
+            if shard_by == 'day':
+                keys = get_deal_days(deal['deal_text']) or ['any_day']
+            else:
+                keys = [deal['restaurant']]
+            for key in keys:
+                shard_ids.setdefault(key, []).append(deal_id)
+        
+        manifest = {
+            'shard_by': shard_by,
+            'total_deals': len(deals),
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'shards': {},
+        }
+        for key, ids in shard_ids.items():
+            content = json.dumps({'ids': ids, 'deals': [deals[i] for i in ids]},
+                                 separators=(',', ':'), ensure_ascii=False)
+            manifest['shards'][key] = {
+                'file': _write_hashed_file(data_dir, f"deals-{_slugify(key)}", content),
+                'count': len(ids),
+            }
+        
+        search_index = DealSearchIndex.from_deals(deals)
+        manifest['search_index'] = _write_hashed_file(
+            data_dir, 'search', json.dumps(search_index.to_dict(), separators=(',', ':')))
+        
+        manifest_file = os.path.join(data_dir, 'manifest.json')
+        with atomic_write(manifest_file) as f:
+            json.dump(manifest, f, **self._json_format())
+        
+        filter_index = _FilterIndex()
+        for deal in deals:
+            filter_index.add(deal)
+        html_content = (
+            self._render_prefix(deals[:self.page_size], len(deals) > self.page_size)
+            + '[]'
+            + self._render_suffix(None, filter_index, manifest)
+        )
+        html_file = os.path.join(output_dir, 'index.html')
+        with atomic_write(html_file) as f:
+            f.write(html_content)
+        
+        # Cache rules for static hosts that read a _headers file (Netlify, Cloudflare Pages)
+        with atomic_write(os.path.join(output_dir, '_headers')) as f:
+            f.write(SHARD_CACHE_HEADERS)
+        
+        # Clean up shards (and their compressed copies) from earlier runs
+        # that the new manifest no longer uses
+        current_files = {shard['file'] for shard in manifest['shards'].values()}
+        current_files.update([manifest['search_index'], 'manifest.json'])
+        for filename in os.listdir(data_dir):
+            base_name = re.sub(r'\.(gz|br)$', '', filename)
+            if base_name.endswith('.json') and base_name not in current_files:
+                os.remove(os.path.join(data_dir, filename))
+        
+        print(f"Generated sharded site: {html_file} ({len(manifest['shards'])} shards by {shard_by})")
+        if self.production:
+            report = [(html_file, precompress_file(html_file)), (manifest_file, precompress_file(manifest_file))]
+            # Hashed files never change, so only compress the ones that are new this run
+            for filename in sorted(current_files - {'manifest.json'}):
+                path = os.path.join(data_dir, filename)
+                if not os.path.exists(path + '.gz'):
+                    report.append((path, precompress_file(path)))
+            print_compression_report(report)
+        return html_file
+    
+    def generate_nearby_html(self, deals: List[Dict[str, Any]], lat: float, lon: float, miles: float,
+                             output_file: str = 'wing_deals_nearby.html', index: LocationIndex = None):
+        """
+        Generate an HTML file with only the deals from restaurants within `miles` of a point
+        Pass a prebuilt LocationIndex to reuse it across several pages
+        """
+        nearby_deals = deals_within(deals, lat, lon, miles, index)
+        return self.generate_html(nearby_deals, output_file)
+
+def minify_template(template: str) -> str:
+    """
+    Conservative minifier for the page template and card markup
+    Drops indentation, blank lines and whole-line // comments, squeezes spaces
+    around CSS punctuation and removes whitespace between tags.
+    Line breaks are kept so JavaScript's automatic semicolon insertion still works.
+    """
+    lines = []
+    for line in template.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    text = '\n'.join(lines)
+    
+    def squeeze_css(match):
+        css = re.sub(r'\s*([{};:,>])\s*', r'\1', match.group(2))
+        return match.group(1) + css.replace(';}', '}') + match.group(3)
+    
+    text = re.sub(r'(<style>)(.*?)(</style>)', squeeze_css, text, flags=re.DOTALL)
+    return re.sub(r'>\s+<', '><', text)
+
+def precompress_file(path: str) -> Dict[str, int]:
+    """
+    Write .gz (and .br, if brotli is installed) copies next to a file
+    so a static server can send them without compressing on the fly
+    Works in chunks, so large pages don't need to fit in memory; returns each artifact's size
+    """
+    sizes = {'raw': os.path.getsize(path)}
+    
+    with open(path, 'rb') as source, atomic_write(path + '.gz', 'wb') as target:
+        # mtime=0 keeps the output identical when the input is, which keeps ETags stable
+        with gzip.GzipFile(filename=os.path.basename(path), mode='wb', fileobj=target,
+                           compresslevel=9, mtime=0) as compressed:
+            shutil.copyfileobj(source, compressed, STREAM_BUFFER_SIZE)
+    sizes['gz'] = os.path.getsize(path + '.gz')
+    
+    if brotli is not None:
+        compressor = brotli.Compressor(quality=11)
+        with open(path, 'rb') as source, atomic_write(path + '.br', 'wb') as target:
+            for chunk in iter(lambda: source.read(STREAM_BUFFER_SIZE), b''):
+                target.write(compressor.process(chunk))
+            target.write(compressor.finish())
+        sizes['br'] = os.path.getsize(path + '.br')
+    return sizes
+
+def print_compression_report(artifacts: List[tuple]):
+    """Print the bytes saved by each precompressed copy, given (path, sizes) pairs"""
+    print("📦 Precompressed output:")
+    for path, sizes in artifacts:
+        raw = sizes['raw']
+        parts = [f"{raw:,} bytes"]
+        for encoding in ('gz', 'br'):
+            if encoding in sizes:
+                saved = raw - sizes[encoding]
+                percent = saved / raw * 100 if raw else 0
+                parts.append(f".{encoding} {sizes[encoding]:,} ({saved:,} saved, {percent:.0f}%)")
+        print(f"   • {path}: " + ', '.join(parts))
+
+def _slugify(text: str) -> str:
+    """Make a short, file-name-safe version of a shard key"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')[:40] or 'shard'
+
+def _write_hashed_file(directory: str, stem: str, content: str) -> str:
+    """
+    Write content to <stem>-<hash>.json and return the file name
+    The name changes only when the content does; an existing file is left alone
+    """
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+    filename = f"{stem}-{digest}.json"
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        with atomic_write(path) as f:
+            f.write(content)
+    return filename
+
+def _script_safe(data_json: str) -> str:
+    """
+    Escape '</' so deal text like '</script>' can't end the inline script early
+    '<\\/' is still valid JSON and parses back to the same string
+    """
+    return data_json.replace('</', '<\\/')
+
+class _CountingIterator:
+    """Wraps an iterator and counts the items taken from it"""
+    
+    def __init__(self, iterable: Iterable[Any]):
+        self._iterator = iter(iterable)
+        self.count = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        item = next(self._iterator)
+        self.count += 1
+        return item
 
 def main():
-    """Main function to generate HTML from JSON data"""
+    """Main function to generate HTML from a deals file"""
+    parser = argparse.ArgumentParser(description="Generate the wing deals HTML page from wing_deals.json")
+    parser.add_argument('--shard-by', choices=SHARD_MODES,
+                        help="write deals as lazily-loaded shards instead of embedding them")
+    parser.add_argument('--output-dir', default='site', help="output directory for --shard-by (default: site)")
+    parser.add_argument('--production', action='store_true',
+                        help="minify the page, write compact JSON and precompressed .gz/.br copies")
+    parser.add_argument('--input', default='wing_deals.json',
+                        help="deals file: .json, .jsonl or columnar .wdc (default: wing_deals.json)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = profiler_from_args(args, 'html_generator')
+    
     try:
-        # Load deals from JSON file
-        with open('wing_deals.json', 'r', encoding='utf-8') as f:
-            deals = json.load(f)
+        # Read deals one at a time rather than loading the whole file
+        deals = iter_deals_file(args.input)
         
         # Generate HTML
-        generator = WingDealsHTMLGenerator()
-        html_file = generator.generate_html(deals)
+        generator = WingDealsHTMLGenerator(production=args.production)
+        if args.shard_by:
+            # Shards are grouped across the whole list, so this mode needs it in memory
+            deals = profiler.call('load', lambda: list(deals))
+            html_file = profiler.call('render', generator.generate_sharded_site, deals, args.output_dir, args.shard_by)
+            deal_count = len(deals)
+        else:
+            # The streaming renderer writes each deal as it is read; only the indexes grow with the deal count
+            deals = _CountingIterator(deals)
+            # Loading and rendering are interleaved here, so they are profiled as one stage
+            html_file = profiler.call('render', generator.generate_html, deals, stream=True)
+            deal_count = deals.count
         
-        print(f"Successfully generated HTML file with {len(deals)} deals!")
+        print(f"Successfully generated HTML file with {deal_count} deals!")
         print(f"Open {html_file} in your web browser to view the deals.")
         
     except FileNotFoundError:
-        print("Error: wing_deals.json not found. Please run the scraper first.")
+        print(f"Error: {args.input} not found. Please run the scraper first.")
     except Exception as e:
         print(f"Error generating HTML: {str(e)}")
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
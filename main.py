@@ -4,22 +4,35 @@ Columbus Wing Deals Scraper
 A web scraper that finds chicken wing deals in Columbus, Ohio and displays them on a beautiful HTML page.
 
 This is the main entry point that orchestrates the entire process:
-1. Scrapes websites for wing deals
-2. Generates a beautiful HTML page
-3. Provides user-friendly output and instructions
+1. Scrapes websites for wing deals and generates a beautiful HTML page
+   (as a pipeline, so the page is published while slow sites are still loading)
+2. Provides user-friendly output and instructions
 """
 
 # Import system libraries for file operations and error handling
+import argparse
 import os
 import sys
 # Import our custom scraper and HTML generator classes
 from wing_scraper import ColumbusWingScraper
 from html_generator import WingDealsHTMLGenerator
+# Import the pipeline that runs scraping and publishing side by side
+from pipeline import ScrapePipeline
+# Import the optional per-stage profiler
+from profiling import StageProfiler, add_profile_arguments, profiler_from_args
+# Import the raw page store used for offline re-extraction
+from page_store import PageStore, reextract, print_diff
+# Import the saved statistics used to show what changed since the last run
+from aggregates import load_snapshot, describe_changes
+# Import the loader for the restaurant list saved by a bulk import
+from restaurant_data import load_saved_restaurants
 
-def main():
+def main(profiler: StageProfiler = None, store_pages: bool = True):
     """
     Main function that runs the complete wing deals scraper and HTML generator
     This function orchestrates the entire process from start to finish
+    Pass an enabled StageProfiler to profile each pipeline stage
+    Raw pages are kept in raw_pages/ unless store_pages is False
     """
     
     # Print a nice welcome message and explain what the scraper does
@@ -29,12 +42,17 @@ def main():
     print("and display them on a beautiful HTML page.")
     print()
     
-    # Step 1: Run the web scraper to find deals
-    print("Step 1: Scraping wing deals...")
-    # Create a new scraper instance
-    scraper = ColumbusWingScraper()
-    # Run the scraper and get back all the deals it found
-    deals = scraper.run_scraper()
+    # Step 1: Scrape wing deals and generate the HTML page at the same time
+    # Pages are fetched, parsed, de-duplicated and published by separate stages,
+    # and the page is refreshed with partial results while slow sites load
+    print("Step 1: Scraping wing deals and generating the HTML page...")
+    # Create a new scraper and HTML generator for the pipeline to drive
+    scraper = ColumbusWingScraper(PageStore() if store_pages else None)
+    generator = WingDealsHTMLGenerator()
+    pipeline = ScrapePipeline(scraper, generator, profiler=profiler)
+    # Run the pipeline and get back all the deals it found
+    deals = pipeline.run()
+    html_file = pipeline.html_file
     
     # Check if we found any deals
     if not deals:
@@ -43,26 +61,18 @@ def main():
     
     # Print success message with the number of deals found
     print(f"✅ Found {len(deals)} wing deals!")
-    print()
-    
-    # Step 2: Generate the beautiful HTML webpage
-    print("Step 2: Generating HTML page...")
-    # Create a new HTML generator instance
-    generator = WingDealsHTMLGenerator()
-    # Generate the HTML file with all the deals
-    html_file = generator.generate_html(deals)
-    
-    # Print success message
     print(f"✅ Generated HTML file: {html_file}")
+    pipeline.print_timing()
     print()
     
-    # Step 3: Display helpful information about what was created
+    # Step 2: Display helpful information about what was created
     print("🎉 Scraping and HTML generation complete!")
     print()
     print("📁 Generated files:")
     print(f"   • {html_file} - Beautiful HTML page with all deals")
     print(f"   • wing_deals.json - Raw deal data in JSON format")
     print(f"   • wing_deals.csv - Deal data in CSV format")
+    print(f"   • wing_deals.wdc - Columnar deal data for analytics")
     print()
     print("🌐 To view the deals:")
     print(f"   1. Open {html_file} in your web browser")
@@ -71,20 +81,59 @@ def main():
     print()
     
     # Print a summary of what we accomplished
+    # The scraper kept these counts up to date as deals came in, so nothing is recounted here
+    stats = scraper.stats
     print("📊 Summary:")
-    print(f"   • Total deals found: {len(deals)}")
-    # Count unique restaurants by creating a set of restaurant names
-    print(f"   • Restaurants: {len(set(d['restaurant'] for d in deals))}")
-    # Count high confidence deals
-    print(f"   • High confidence deals: {len([d for d in deals if d['confidence'] == 'high'])}")
+    print(f"   • Total deals found: {stats.total}")
+    print(f"   • Restaurants: {stats.distinct('restaurant')}")
+    print(f"   • High confidence deals: {stats.count('confidence', 'high')}")
     print()
+    
+    # Compare with the counts saved by the previous run
+    previous = load_snapshot()
+    if previous:
+        changes = stats.changes_since(previous)
+        lines = describe_changes(changes, 'day') + describe_changes(changes, 'confidence', 'confidence deals')
+        print(f"📈 Since the last run: {changes['total']:+d} deals")
+        for line in lines:
+            print(f"   • {line}")
+        print()
+    stats.save()
     print("🍗 Happy wing hunting in Columbus!")
 
 # This code only runs if we execute this file directly
 if __name__ == "__main__":
+    # Read command-line options
+    parser = argparse.ArgumentParser(description="Scrape Columbus wing deals and build the HTML page")
+    parser.add_argument('--daemon', action='store_true',
+                        help="stay running and refresh sources on a schedule (see scrape_daemon.py)")
+    parser.add_argument('--health-port', type=int, default=8001, help="port for the daemon's /health endpoint")
+    parser.add_argument('--reextract', action='store_true',
+                        help="re-run the current deal patterns over the last run's stored pages and show the diff")
+    parser.add_argument('--no-store-pages', action='store_true',
+                        help="don't keep this run's raw pages for --reextract")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    # Use the restaurant list from the last bulk import, if there is one
+    load_saved_restaurants()
+    
     try:
-        # Run the main function
-        main()
+        if args.daemon:
+            # Imported here so a one-off run doesn't load the daemon code
+            from scrape_daemon import run_daemon
+            # The daemon handles Ctrl+C itself and shuts down cleanly
+            run_daemon(health_port=args.health_port)
+        elif args.reextract:
+            # Try pattern changes in seconds, without scraping again
+            print_diff(reextract())
+        else:
+            # Run the main function (profiling each stage if --profile was given)
+            profiler = profiler_from_args(args, 'main')
+            try:
+                main(profiler, store_pages=not args.no_store_pages)
+            finally:
+                # A failed or interrupted run is often the one worth profiling
+                profiler.finish()
     except KeyboardInterrupt:
         # If user presses Ctrl+C, print a nice message and exit
         print("\n\n⚠️  Scraping interrupted by user.")
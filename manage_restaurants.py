@@ -2,9 +2,27 @@
 """
 Restaurant Management Script for Columbus Wing Deals Scraper
 Easy way to add, remove, or update restaurant information.
+
+Restaurants can also be imported and exported in bulk as CSV or JSON Lines.
+An import checks every row first and changes nothing unless all of them are
+valid; it then saves the whole database to restaurants.jsonl.
+
+Usage:
+    python manage_restaurants.py                          # interactive menu
+    python manage_restaurants.py import new_metro.csv [--update] [--dry-run]
+    python manage_restaurants.py export restaurants.csv
 """
 
+import argparse
+import csv
+import json
+import os
 import sys
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlparse
+from file_utils import atomic_write
+from fuzzy_index import FuzzyNameIndex
+from aggregates import Aggregates
 from restaurant_data import (
     get_restaurants_by_category, 
     get_restaurant_names, 
@@ -12,9 +30,48 @@ from restaurant_data import (
     add_restaurant, 
     remove_restaurant, 
     update_restaurant,
-    RESTAURANT_CATEGORIES
+    save_restaurants,
+    load_saved_restaurants,
+    RESTAURANT_CATEGORIES,
+    RESTAURANTS,
+    RESTAURANTS_FILE
 )
 
+CONFIDENCE_LEVELS = ['high', 'medium', 'low']
+# Columns of the CSV format, in order
+RESTAURANT_FIELDS = ['name', 'url', 'category', 'locations', 'known_deals', 'confidence']
+# Separates the items of the list columns (locations, known_deals) in a CSV cell
+LIST_SEPARATOR = ';'
+# Defaults for rows that leave a field empty, matching the interactive add
+DEFAULT_LOCATIONS = ['Columbus']
+DEFAULT_KNOWN_DEALS = ['Wing specials', 'Daily deals']
+# Validation errors printed before the rest are summarized
+MAX_ERRORS_SHOWN = 20
+
+# Fuzzy index over restaurant names and hosts, and counts by category and
+# confidence; both built on first use and kept in step with the changes this tool makes
+_name_index = None
+_restaurant_stats = None
+
+def get_name_index() -> FuzzyNameIndex:
+    """The fuzzy name index for the current database"""
+    global _name_index
+    if _name_index is None:
+        _name_index = FuzzyNameIndex.from_restaurants(RESTAURANTS)
+    return _name_index
+
+def get_restaurant_stats() -> Aggregates:
+    """Restaurant counts by category and confidence for the current database"""
+    global _restaurant_stats
+    if _restaurant_stats is None:
+        _restaurant_stats = Aggregates.for_restaurants(RESTAURANTS)
+    return _restaurant_stats
+
+def print_similar(similar):
+    """List near-matches from the fuzzy index"""
+    for match, similarity in similar:
+        print(f"   • {match} ({similarity:.0%} similar)")
+
 def print_restaurants():
     """Print all restaurants with their details"""
     restaurants = get_restaurants_by_category()
@@ -63,6 +120,16 @@ def add_new_restaurant():
         print("❌ URL is required!")
         return
     
+    # Catch near-duplicates: different spelling, a nickname, or the same website
+    similar = get_name_index().find_similar(name, url)
+    if similar:
+        print(f"\n⚠️  '{name}' looks like restaurants already in the database:")
+        print_similar(similar)
+        confirm = input("Add it anyway? (y/N): ").strip().lower()
+        if confirm not in ['y', 'yes']:
+            print("❌ Add cancelled.")
+            return
+    
     # Get locations
     locations_input = input("Locations (comma-separated): ").strip()
     locations = [loc.strip() for loc in locations_input.split(',') if loc.strip()]
@@ -94,6 +161,9 @@ def add_new_restaurant():
     
     # Add to database
     add_restaurant(restaurant_data)
+    get_name_index().add(name, url)
+    get_restaurant_stats().add(restaurant_data)
+    save_if_persisted()
     print(f"✅ Successfully added '{name}' to the database!")
 
 def remove_existing_restaurant():
@@ -114,7 +184,8 @@ def remove_existing_restaurant():
         return
     
     # Check if restaurant exists
-    if not get_restaurant_by_name(name):
+    restaurant = get_restaurant_by_name(name)
+    if not restaurant:
         print(f"❌ Restaurant '{name}' not found!")
         return
     
@@ -122,6 +193,9 @@ def remove_existing_restaurant():
     confirm = input(f"Are you sure you want to remove '{name}'? (y/N): ").strip().lower()
     if confirm in ['y', 'yes']:
         if remove_restaurant(name):
+            get_name_index().remove(restaurant['name'])
+            get_restaurant_stats().remove(restaurant)
+            save_if_persisted()
             print(f"✅ Successfully removed '{name}' from the database!")
         else:
             print(f"❌ Failed to remove '{name}'!")
@@ -201,43 +275,278 @@ def update_existing_restaurant():
         'confidence': confidence
     }
     
-    # Update restaurant
+    # Update restaurant (the old values come out of the counts first)
+    old_data = dict(restaurant)
     if update_restaurant(name, updated_data):
+        get_name_index().add(restaurant['name'], url)
+        get_restaurant_stats().remove(old_data)
+        get_restaurant_stats().add(restaurant)
+        save_if_persisted()
         print(f"✅ Successfully updated '{name}'!")
     else:
         print(f"❌ Failed to update '{name}'!")
 
 def show_statistics():
     """Show statistics about the restaurant database"""
-    restaurants = get_restaurants_by_category()
+    # Counts are kept up to date as restaurants change, so nothing is recounted here
+    stats = get_restaurant_stats()
     
     print("\n📊 Restaurant Database Statistics")
     print("=" * 40)
     
-    total = len(restaurants)
-    print(f"Total restaurants: {total}")
+    print(f"Total restaurants: {stats.total}")
     
     # Count by category
-    categories = {}
-    for restaurant in restaurants:
-        cat = restaurant['category']
-        categories[cat] = categories.get(cat, 0) + 1
-    
     print("\nBy category:")
-    for category, count in categories.items():
+    for category, count in stats.by('category').items():
         description = RESTAURANT_CATEGORIES.get(category, category)
         print(f"  {description}: {count}")
     
     # Count by confidence
-    confidence_levels = {}
-    for restaurant in restaurants:
-        conf = restaurant['confidence']
-        confidence_levels[conf] = confidence_levels.get(conf, 0) + 1
-    
     print("\nBy confidence level:")
-    for confidence, count in confidence_levels.items():
+    for confidence, count in stats.by('confidence').items():
         print(f"  {confidence}: {count}")
 
+def save_if_persisted():
+    """Save the database if it was loaded from restaurants.jsonl, so edits aren't lost"""
+    if os.path.exists(RESTAURANTS_FILE):
+        save_restaurants()
+
+def _split_list(value: Any) -> List[str]:
+    """Read a list column: a JSON list, or a LIST_SEPARATOR-separated string"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+def _is_blank(value: Any) -> bool:
+    """Whether a row leaves a column empty (missing, blank or an empty list)"""
+    if isinstance(value, list):
+        return not _split_list(value)
+    return value is None or not str(value).strip()
+
+def read_restaurant_rows(filename: str) -> List[Dict[str, Any]]:
+    """
+    Read the rows of a .csv or .jsonl restaurant file
+    Each row gets a '_line' key with its line number, for error messages
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    rows = []
+    if extension == '.csv':
+        with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                row['_line'] = reader.line_num
+                rows.append(row)
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{filename} line {line_number}: {e}") from e
+                if not isinstance(row, dict):
+                    raise ValueError(f"{filename} line {line_number}: expected a JSON object")
+                row['_line'] = line_number
+                rows.append(row)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}' (use .csv or .jsonl)")
+    return rows
+
+def validate_restaurants(rows: List[Dict[str, Any]], allow_updates: bool = False) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Check a whole batch of rows in one pass
+    Names and URLs are looked up in dictionaries built once for the batch, so a
+    batch of thousands costs the same as reading it; returns (restaurants, errors, warnings)
+    Existing names are errors unless allow_updates is True; names that look like
+    an existing restaurant or an earlier row (fuzzy index) are warnings
+    """
+    # Existing restaurants by lowercased name and by URL
+    existing_names = {restaurant['name'].lower(): restaurant for restaurant in RESTAURANTS}
+    existing_urls = {restaurant['url'].lower(): restaurant['name'] for restaurant in RESTAURANTS}
+    # What this batch has claimed so far, by the line that claimed it
+    batch_names = {}
+    batch_urls = {}
+    # Grows with each accepted row, so near-duplicates within the file are caught too
+    index = FuzzyNameIndex.from_restaurants(RESTAURANTS)
+
+    restaurants = []
+    errors = []
+    warnings = []
+    for row in rows:
+        line = row.get('_line', '?')
+        problems = []
+
+        name = str(row.get('name') or '').strip()
+        # An update only changes the fields its row fills in; the rest keep the
+        # existing entry's values rather than the defaults a new restaurant gets
+        current = existing_names.get(name.lower()) if allow_updates else None
+        if current is not None:
+            row = {field: value for field, value in row.items() if not _is_blank(value)}
+            row = {**current, **row}
+        url = str(row.get('url') or '').strip()
+        category = str(row.get('category') or '').strip().lower()
+        confidence = str(row.get('confidence') or 'medium').strip().lower()
+
+        if not name:
+            problems.append("name is required")
+        elif name.lower() in batch_names:
+            problems.append(f"duplicate name '{name}' (also on line {batch_names[name.lower()]})")
+        elif name.lower() in existing_names and not allow_updates:
+            problems.append(f"'{name}' already exists (use --update to change it)")
+
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc or ' ' in url:
+            problems.append(f"invalid URL '{url}'")
+        elif url.lower() in batch_urls:
+            problems.append(f"duplicate URL (also on line {batch_urls[url.lower()]})")
+        elif existing_urls.get(url.lower(), name).lower() != name.lower():
+            problems.append(f"URL already used by '{existing_urls[url.lower()]}'")
+
+        if category not in RESTAURANT_CATEGORIES:
+            problems.append(f"invalid category '{category}' (expected one of: {', '.join(RESTAURANT_CATEGORIES)})")
+        if confidence not in CONFIDENCE_LEVELS:
+            problems.append(f"invalid confidence '{confidence}' (expected high, medium or low)")
+
+        if problems:
+            errors.extend(f"Line {line}: {problem}" for problem in problems)
+            continue
+
+        similar = [(match, similarity) for match, similarity in index.find_similar(name, url)
+                   if match.lower() != name.lower()]
+        if similar:
+            warnings.append(f"Line {line}: '{name}' looks like "
+                            + ', '.join(f"'{match}' ({similarity:.0%})" for match, similarity in similar))
+        index.add(name, url)
+
+        batch_names[name.lower()] = line
+        batch_urls[url.lower()] = line
+        restaurants.append({
+            'name': name,
+            'url': url,
+            'category': category,
+            'locations': _split_list(row.get('locations')) or list(DEFAULT_LOCATIONS),
+            'known_deals': _split_list(row.get('known_deals')) or list(DEFAULT_KNOWN_DEALS),
+            'confidence': confidence,
+        })
+    return restaurants, errors, warnings
+
+def import_restaurants(filename: str, allow_updates: bool = False, dry_run: bool = False,
+                       strict: bool = False) -> bool:
+    """
+    Import a CSV or JSON Lines file of restaurants as one transaction
+    Every row is validated first; if any row is invalid nothing changes.
+    Otherwise all rows are applied at once and the database is saved.
+    Possible duplicates are listed; with strict=True they also stop the import.
+    Returns True if the import was (or, with dry_run, would be) applied
+    """
+    global _name_index, _restaurant_stats
+    try:
+        rows = read_restaurant_rows(filename)
+    except FileNotFoundError:
+        print(f"❌ {filename} not found!")
+        return False
+    except (ValueError, csv.Error) as e:
+        print(f"❌ {e}")
+        return False
+
+    restaurants, errors, warnings = validate_restaurants(rows, allow_updates)
+    if strict:
+        errors.extend(warnings)
+    elif warnings:
+        print(f"⚠️  {len(warnings)} possible duplicates in {filename} (use --strict to refuse them):")
+        for warning in warnings[:MAX_ERRORS_SHOWN]:
+            print(f"   • {warning}")
+        if len(warnings) > MAX_ERRORS_SHOWN:
+            print(f"   ... and {len(warnings) - MAX_ERRORS_SHOWN} more")
+    if errors:
+        print(f"❌ {len(errors)} problems in {filename}; nothing was imported:")
+        for error in errors[:MAX_ERRORS_SHOWN]:
+            print(f"   • {error}")
+        if len(errors) > MAX_ERRORS_SHOWN:
+            print(f"   ... and {len(errors) - MAX_ERRORS_SHOWN} more")
+        return False
+
+    # Build the new list on the side, then save it and swap it in
+    positions = {restaurant['name'].lower(): i for i, restaurant in enumerate(RESTAURANTS)}
+    updated_list = list(RESTAURANTS)
+    added = updated = 0
+    for restaurant in restaurants:
+        position = positions.get(restaurant['name'].lower())
+        if position is None:
+            updated_list.append(restaurant)
+            added += 1
+        else:
+            # Keep any extra keys the existing entry has, and its original spelling
+            merged = dict(updated_list[position])
+            merged.update(restaurant, name=merged['name'])
+            updated_list[position] = merged
+            updated += 1
+
+    if dry_run:
+        print(f"✅ {filename} is valid: {added} would be added, {updated} updated (dry run, nothing changed)")
+        return True
+
+    # If saving fails the in-memory database is left as it was
+    save_restaurants(updated_list)
+    RESTAURANTS[:] = updated_list
+    # Rebuilt from the new list the next time they're needed
+    _name_index = None
+    _restaurant_stats = None
+    print(f"✅ Imported {filename}: {added} added, {updated} updated ({len(RESTAURANTS)} restaurants, saved to {RESTAURANTS_FILE})")
+    return True
+
+def export_restaurants(filename: str) -> int:
+    """
+    Write every restaurant to a .csv or .jsonl file
+    Returns the number of restaurants written
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    restaurants = get_restaurants_by_category()
+    if extension == '.csv':
+        with atomic_write(filename, newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=RESTAURANT_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+            for restaurant in restaurants:
+                row = dict(restaurant)
+                row['locations'] = f"{LIST_SEPARATOR} ".join(restaurant['locations'])
+                row['known_deals'] = f"{LIST_SEPARATOR} ".join(restaurant['known_deals'])
+                writer.writerow(row)
+    elif extension in ('.jsonl', '.ndjson'):
+        save_restaurants(restaurants, filename)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}' (use .csv or .jsonl)")
+    print(f"✅ Exported {len(restaurants)} restaurants to {filename}")
+    return len(restaurants)
+
+def import_from_file():
+    """Interactive function to import restaurants from a file"""
+    print("\n📥 Importing Restaurants")
+    print("=" * 25)
+    print(f"CSV columns: {', '.join(RESTAURANT_FIELDS)} (separate list items with '{LIST_SEPARATOR}')")
+    filename = input("File to import (.csv or .jsonl): ").strip()
+    if not filename:
+        print("❌ File name is required!")
+        return
+    allow_updates = input("Update restaurants that already exist? (y/N): ").strip().lower() in ['y', 'yes']
+    import_restaurants(filename, allow_updates)
+
+def export_to_file():
+    """Interactive function to export restaurants to a file"""
+    print("\n📤 Exporting Restaurants")
+    print("=" * 25)
+    filename = input("File to export to (.csv or .jsonl): ").strip()
+    if not filename:
+        print("❌ File name is required!")
+        return
+    try:
+        export_restaurants(filename)
+    except ValueError as e:
+        print(f"❌ {e}")
+
 def main():
     """Main menu function"""
     while True:
@@ -248,9 +557,11 @@ def main():
         print("3. Remove restaurant")
         print("4. Update restaurant")
         print("5. Show statistics")
-        print("6. Exit")
+        print("6. Import restaurants from file")
+        print("7. Export restaurants to file")
+        print("8. Exit")
         
-        choice = input("\nEnter your choice (1-6): ").strip()
+        choice = input("\nEnter your choice (1-8): ").strip()
         
         if choice == '1':
             print_restaurants()
@@ -263,14 +574,41 @@ def main():
         elif choice == '5':
             show_statistics()
         elif choice == '6':
+            import_from_file()
+        elif choice == '7':
+            export_to_file()
+        elif choice == '8':
             print("👋 Goodbye!")
             break
         else:
-            print("❌ Invalid choice! Please enter 1-6.")
+            print("❌ Invalid choice! Please enter 1-8.")
+
+def run_command_line():
+    """Run an import or export given on the command line, or the menu if there is none"""
+    parser = argparse.ArgumentParser(description="Manage the restaurant database")
+    commands = parser.add_subparsers(dest='command')
+    import_parser = commands.add_parser('import', help="import restaurants from a .csv or .jsonl file")
+    import_parser.add_argument('file')
+    import_parser.add_argument('--update', action='store_true', help="update restaurants that already exist")
+    import_parser.add_argument('--dry-run', action='store_true', help="validate the file without changing anything")
+    import_parser.add_argument('--strict', action='store_true', help="refuse the import if any row looks like a duplicate")
+    export_parser = commands.add_parser('export', help="export restaurants to a .csv or .jsonl file")
+    export_parser.add_argument('file')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        if not import_restaurants(args.file, args.update, args.dry_run, args.strict):
+            sys.exit(1)
+    elif args.command == 'export':
+        export_restaurants(args.file)
+    else:
+        main()
 
 if __name__ == "__main__":
     try:
-        main()
+        # Start from the list the last import saved, so changes build on it
+        load_saved_restaurants()
+        run_command_line()
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
         sys.exit(0)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Raw Page Store for Columbus Wing Deals Scraper
+Keeps the page bodies downloaded by each scrape, so changes to DEAL_PATTERNS or
+the extraction logic can be tried against real pages without scraping again.
+
+Layout (under raw_pages/):
+
+    objects/<sha256>.gz     page bodies, gzipped and shared between runs
+    <run id>/manifest.json  every source fetched in the run, in fetch order, with
+                            the boilerplate blocks stripped from its page
+    <run id>/extracted.json deals found on each page by the last extraction
+
+Only the newest KEEP_RUNS runs are kept. Re-extraction runs the current
+patterns over a stored run's pages on every core, diffs the result against
+extracted.json and then records it there, so each pattern tweak shows exactly
+what it changed. Pages strip the boilerplate the live run stripped, not what
+boilerplate.py has learned since, so re-extracting a run is reproducible.
+
+Usage:
+    python page_store.py                  # re-extract the latest run
+    python page_store.py --run 20240101-120000 --show 20
+    python page_store.py --list
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from file_utils import atomic_write
+
+DEFAULT_STORE_DIR = 'raw_pages'
+# Runs kept on disk; older runs and the pages only they used are deleted
+KEEP_RUNS = 5
+MANIFEST_FILE = 'manifest.json'
+EXTRACTED_FILE = 'extracted.json'
+OBJECTS_DIR = 'objects'
+
+# One scraper per worker process, created on first use
+_worker_scraper = None
+
+
+class PageStore:
+    """
+    Records one scrape run's pages and extracted deals
+    save_page() and save_deals() may be called from several threads at once
+    """
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR, keep_runs: int = KEEP_RUNS):
+        self.store_dir = store_dir
+        self.keep_runs = keep_runs
+        self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        # Two runs in the same second get separate directories
+        suffix = 1
+        while os.path.exists(os.path.join(store_dir, self.run_id)):
+            suffix += 1
+            self.run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+        self.run_dir = os.path.join(store_dir, self.run_id)
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._deals: Dict[str, List[Dict[str, Any]]] = {}
+        self._stripped: Dict[str, List[List[Any]]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(store_dir, OBJECTS_DIR), exist_ok=True)
+
+    def save_page(self, source: str, url: str, content: bytes):
+        """Store a downloaded page body (once per distinct body across all runs)"""
+        digest = hashlib.sha256(content).hexdigest()
+        path = _object_path(self.store_dir, digest)
+        if not os.path.exists(path):
+            with atomic_write(path, 'wb') as f:
+                # Level 6 is plenty for HTML and keeps the fetch threads quick
+                f.write(gzip.compress(content, compresslevel=6))
+        with self._lock:
+            self._pages[source] = {
+                'url': url,
+                'sha256': digest,
+                'size': len(content),
+                'fetched': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+
+    def save_deals(self, source: str, deals: List[Dict[str, Any]]):
+        """Record the deals extracted from a source's page (before de-duplication)"""
+        with self._lock:
+            self._deals[source] = deals
+
+    def save_stripped(self, source: str, stripped: Set[Tuple[str, bool]]):
+        """Record the boilerplate blocks stripped from a source's page (see boilerplate.py)"""
+        with self._lock:
+            self._stripped[source] = sorted([key, chrome] for key, chrome in stripped)
+
+    def finish(self) -> str:
+        """Write the run's manifest and extracted deals, drop old runs and return the run directory"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        with self._lock:
+            pages = {source: dict(page, stripped=self._stripped[source]) if source in self._stripped else page
+                     for source, page in self._pages.items()}
+            manifest = {'run_id': self.run_id, 'pages': pages}
+            extracted = {source: self._deals.get(source, []) for source in self._pages}
+        with atomic_write(os.path.join(self.run_dir, EXTRACTED_FILE)) as f:
+            json.dump(extracted, f, indent=2, ensure_ascii=False)
+        # The manifest goes last: a run directory without one is incomplete and ignored
+        with atomic_write(os.path.join(self.run_dir, MANIFEST_FILE)) as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        prune_runs(self.store_dir, self.keep_runs)
+        print(f"🗄️  Stored {len(manifest['pages'])} raw pages in {self.run_dir}/")
+        return self.run_dir
+
+
+def _object_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, OBJECTS_DIR, digest + '.gz')
+
+
+def list_runs(store_dir: str = DEFAULT_STORE_DIR) -> List[str]:
+    """Ids of the complete runs in the store, oldest first"""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(name for name in os.listdir(store_dir)
+                  if os.path.isfile(os.path.join(store_dir, name, MANIFEST_FILE)))
+
+
+def load_run(store_dir: str, run_id: str) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+    """A stored run's manifest and its last extracted deals"""
+    run_dir = os.path.join(store_dir, run_id)
+    with open(os.path.join(run_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    extracted_path = os.path.join(run_dir, EXTRACTED_FILE)
+    extracted = {}
+    if os.path.exists(extracted_path):
+        with open(extracted_path, 'r', encoding='utf-8') as f:
+            extracted = json.load(f)
+    return manifest, extracted
+
+
+def prune_runs(store_dir: str = DEFAULT_STORE_DIR, keep_runs: int = KEEP_RUNS) -> int:
+    """
+    Delete all but the newest keep_runs runs, then any page bodies no kept run uses
+    Returns the number of runs deleted
+    """
+    runs = list_runs(store_dir)
+    old_runs = runs[:-keep_runs] if keep_runs > 0 else runs
+    for run_id in old_runs:
+        run_dir = os.path.join(store_dir, run_id)
+        for name in os.listdir(run_dir):
+            os.remove(os.path.join(run_dir, name))
+        os.rmdir(run_dir)
+
+    in_use = set()
+    for run_id in list_runs(store_dir):
+        manifest, _ = load_run(store_dir, run_id)
+        in_use.update(page['sha256'] for page in manifest['pages'].values())
+    objects_dir = os.path.join(store_dir, OBJECTS_DIR)
+    if os.path.isdir(objects_dir):
+        for name in os.listdir(objects_dir):
+            # Skip temporary files a running scrape is still writing
+            if name.endswith('.gz') and name[:-3] not in in_use:
+                os.remove(os.path.join(objects_dir, name))
+    return len(old_runs)
+
+
+def _extract_stored_page(job: Tuple[str, str, Optional[List[List[Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Re-run extraction on one stored page inside a worker process
+    job is (object path, source name, the boilerplate stripped from it or None for older runs)
+    """
+    global _worker_scraper
+    # Imported here so storing pages doesn't pull in the scraper
+    from pattern_stats import PatternStats
+    from restaurant_data import load_saved_restaurants
+    from wing_scraper import ColumbusWingScraper
+    path, source, stripped = job
+    if _worker_scraper is None:
+        # A spawned worker starts from the built-in list, so it needs the saved one too
+        load_saved_restaurants()
+        # Every pattern, in DEAL_PATTERNS order, and no counting: the plan and counts belong to live runs
+        _worker_scraper = ColumbusWingScraper(pattern_stats=PatternStats.off())
+    with open(path, 'rb') as f:
+        content = gzip.decompress(f.read())
+    if stripped is not None:
+        stripped = {(key, chrome) for key, chrome in stripped}
+    return _worker_scraper.find_deals_in_page(content, source, stripped=stripped)
+
+
+def _dedup(extracted: Dict[str, List[Dict[str, Any]]], sources: List[str]) -> List[Dict[str, Any]]:
+    """Keep the first deal with each text, visiting sources in fetch order (like the scraper does)"""
+    deals = []
+    seen = set()
+    for source in sources:
+        for deal in extracted.get(source, []):
+            if deal['deal_text'] not in seen:
+                seen.add(deal['deal_text'])
+                deals.append(deal)
+    return deals
+
+
+def reextract(store_dir: str = DEFAULT_STORE_DIR, run_id: Optional[str] = None,
+              workers: Optional[int] = None, record: bool = True) -> Dict[str, Any]:
+    """
+    Run the current deal patterns over a stored run's pages
+    Returns {'run_id', 'deals', 'added', 'removed', 'changed'}, diffed against
+    the run's last extraction; with record=True the new results replace it
+    """
+    # Imported here so the store itself doesn't depend on the server module
+    from deals_server import diff_deals
+    runs = list_runs(store_dir)
+    if not runs:
+        raise FileNotFoundError(f"No stored runs in {store_dir}/ - run the scraper first")
+    run_id = run_id or runs[-1]
+    if run_id not in runs:
+        raise FileNotFoundError(f"No stored run {run_id} in {store_dir}/")
+    manifest, previous = load_run(store_dir, run_id)
+
+    sources = list(manifest['pages'])
+    pages = manifest['pages']
+    jobs = [(_object_path(store_dir, pages[source]['sha256']), source, pages[source].get('stripped'))
+            for source in sources]
+    # None lets the pool use one worker per CPU
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_extract_stored_page, jobs))
+    extracted = dict(zip(sources, results))
+
+    deals = _dedup(extracted, sources)
+    diff = diff_deals(_dedup(previous, sources), deals)
+    if record:
+        with atomic_write(os.path.join(store_dir, run_id, EXTRACTED_FILE)) as f:
+            json.dump(extracted, f, indent=2, ensure_ascii=False)
+    return {
+        'run_id': run_id,
+        'deals': deals,
+        'added': [entry['deal'] for entry in diff['added']],
+        'removed': [key.split('\x1f') for key in diff['removed']],
+        'changed': [entry['deal'] for entry in diff['changed']],
+    }
+
+
+def print_diff(result: Dict[str, Any], show: int = 10):
+    """Summarize a re-extraction, listing up to `show` added and removed deals"""
+    print(f"🔁 Re-extracted run {result['run_id']}: {len(result['deals'])} deals "
+          f"(+{len(result['added'])} added, -{len(result['removed'])} removed, "
+          f"~{len(result['changed'])} changed)")
+    for deal in result['added'][:show]:
+        print(f"   + [{deal['restaurant']}] {deal['deal_text']}")
+    for restaurant, source, deal_text in result['removed'][:show]:
+        print(f"   - [{restaurant}] {deal_text}")
+    hidden = max(0, len(result['added']) - show) + max(0, len(result['removed']) - show)
+    if hidden:
+        print(f"   ... and {hidden} more (use --show to list more)")
+
+
+def main():
+    """Re-extract deals from stored pages and show what the current patterns change"""
+    parser = argparse.ArgumentParser(description="Re-run deal extraction over stored raw pages")
+    parser.add_argument('--store-dir', default=DEFAULT_STORE_DIR,
+                        help=f"where raw pages are stored (default: {DEFAULT_STORE_DIR})")
+    parser.add_argument('--run', help="run id to re-extract (default: the latest run)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--show', type=int, default=10, help="added/removed deals to list (default: 10)")
+    parser.add_argument('--no-record', action='store_true',
+                        help="don't save the results, so the next run diffs against the same baseline")
+    parser.add_argument('--list', action='store_true', help="list the stored runs and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for run_id in list_runs(args.store_dir):
+            manifest, _ = load_run(args.store_dir, run_id)
+            print(f"{run_id}  {len(manifest['pages'])} pages")
+        return
+
+    try:
+        result = reextract(args.store_dir, args.run, args.workers, record=not args.no_record)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return
+    print_diff(result, args.show)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Pattern Engine for Columbus Wing Deals Scraper
+Checks and runs the deal patterns so one odd page can't stall a scrape.
+
+Patterns like r'wing.*\\d+.*\\d+\\s*pm' have several unbounded repeats in a row.
+On a long line that mentions "wing" many times, Python's backtracking matcher
+tries every way of splitting the line between them, which grows with the
+line length squared or cubed. Three things keep that in check:
+
+1. analyze_pattern() reads each pattern's parse tree and reports unbounded
+   repeats, nested repeats, neighbouring repeats that can match the same
+   characters ('.*\\d+' tries every way of splitting a run of digits) and
+   patterns with more than MAX_WIDE_REPEATS '.' repeats.
+2. bound_pattern() rewrites every unbounded repeat (*, +, {m,}) into a
+   bounded one ({0,WINDOW}, {1,WINDOW}, {m,WINDOW}) and cuts a repeat next to
+   a '.' repeat down to its minimum ('.*\\d+' -> '.{0,100}\\d'), which matches
+   the same text. A deal is a short phrase, so nothing real is lost, and the
+   work per start position becomes small and fixed. Patterns that still
+   aren't safe, or don't compile, are left out, with the reason, instead of
+   stopping the run.
+3. PatternSet.finditer() only tries a pattern where its literal prefix
+   ("wing") occurs, on a slice no longer than its longest match, and checks a
+   per-document time budget after every attempt. A document that runs over is
+   abandoned where it is and the overrun is recorded for the caller to report.
+
+The checks run whenever a PatternSet is built, so an edit to DEAL_PATTERNS is
+checked the next time the scraper starts. `python pattern_engine.py` prints the
+full analysis of DEAL_PATTERNS.
+"""
+
+import argparse
+import re
+import threading
+import time
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+try:
+    # Python 3.11+ keeps the regex parser here
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from restaurant_data import get_deal_patterns
+
+# Longest stretch a single repeat may cover once bounded (the deal context is 100 characters each side)
+DEFAULT_WINDOW = 100
+# Time one document may spend in the matcher before the remaining work is dropped
+DOCUMENT_BUDGET_SECONDS = 0.5
+# Characters searched between budget checks, for patterns without a literal prefix
+SLICE_CHARS = 512
+# '.' repeats allowed in one pattern (each multiplies the work per start by the window)
+MAX_WIDE_REPEATS = 2
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+# Upper bound the parser uses for "no limit"
+_UNBOUNDED = sre_parse.MAXREPEAT
+
+def _children(op, av) -> List[Any]:
+    """The sub-patterns inside one parse tree node"""
+    if op in _REPEATS:
+        return [av[2]]
+    if op is sre_parse.SUBPATTERN:
+        return [av[-1]]
+    if op is sre_parse.BRANCH:
+        return list(av[1])
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    if op is sre_parse.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    if hasattr(sre_parse, 'ATOMIC_GROUP') and op is sre_parse.ATOMIC_GROUP:
+        return [av]
+    return []
+
+
+def _is_wide(op, av) -> bool:
+    """Whether a repeated item can match (almost) any character, like '.' or [^x]"""
+    if op is sre_parse.ANY:
+        return True
+    return op is sre_parse.IN and bool(av) and av[0][0] is sre_parse.NEGATE
+
+
+def _overlaps(first, second) -> bool:
+    """Whether two repeated items can match the same character (approximately)"""
+    if _is_wide(*first) or _is_wide(*second):
+        return True
+    return first == second
+
+
+def _repeats(parsed, inside_repeat: bool = False) -> Dict[str, int]:
+    """
+    Counts of the repeats in a parse tree that make backtracking expensive:
+    unbounded  repeats with no upper limit
+    nested     variable repeats inside another repeat ((a{1,100}){1,100} is still exponential)
+    adjacent   variable repeats right next to one that can match the same characters
+               (.{0,100}\\d{1,100} can split a run of digits every possible way)
+    wide       variable repeats of '.' (or a negated class); each one multiplies the
+               work per start position by the window
+    """
+    counts = {'unbounded': 0, 'nested': 0, 'adjacent': 0, 'wide': 0}
+    previous = None
+    for op, av in parsed:
+        is_repeat = op in _REPEATS
+        variable = is_repeat and av[1] > av[0]
+        if is_repeat and av[1] == _UNBOUNDED:
+            counts['unbounded'] += 1
+        if variable and inside_repeat:
+            counts['nested'] += 1
+        item = None
+        if variable and len(av[2]) == 1:
+            item = av[2][0]
+            if _is_wide(*item):
+                counts['wide'] += 1
+            if previous is not None and _overlaps(previous, item):
+                counts['adjacent'] += 1
+        previous = item
+        for child in _children(op, av):
+            for key, value in _repeats(child, inside_repeat or (is_repeat and av[1] > 1)).items():
+                counts[key] += value
+    return counts
+
+
+def literal_prefix(pattern: str, flags: int = re.IGNORECASE) -> str:
+    """The plain text every match starts with ('wing' for 'wing.*deal'), lowercased; '' if none"""
+    prefix = []
+    for op, av in sre_parse.parse(pattern, flags):
+        if op is not sre_parse.LITERAL or av > 127:
+            break
+        prefix.append(chr(av))
+    return ''.join(prefix).lower()
+
+
+def analyze_pattern(pattern: str, flags: int = re.IGNORECASE) -> Dict[str, Any]:
+    """
+    Describe how a pattern can backtrack
+    Returns the counts from _repeats() plus 'max_width' (None when a match can
+    be any length) and 'problems', a list of readable reasons (empty for a
+    pattern whose work per start position is small and bounded)
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    analysis: Dict[str, Any] = _repeats(parsed)
+    max_width = parsed.getwidth()[1]
+    problems = []
+    if analysis['nested']:
+        problems.append(f"{analysis['nested']} repeat(s) nested inside another repeat: exponential backtracking")
+    if analysis['unbounded']:
+        # Each unbounded repeat can be tried at every length, on top of trying every start position
+        problems.append(f"{analysis['unbounded']} unbounded repeat(s): up to "
+                        f"O(n^{analysis['unbounded'] + 1}) work on an n-character line")
+    if analysis['adjacent']:
+        problems.append(f"{analysis['adjacent']} pair(s) of neighbouring repeats that match the same "
+                        f"characters: every way of splitting a run between them is tried")
+    if analysis['wide'] > MAX_WIDE_REPEATS:
+        problems.append(f"{analysis['wide']} '.' repeats: work per start grows with the window "
+                        f"to the power {analysis['wide']}")
+    analysis['max_width'] = None if max_width >= _UNBOUNDED else max_width
+    analysis['problems'] = problems
+    return analysis
+
+
+# A quantifier in pattern source, with its lazy/possessive suffix
+_QUANTIFIER = re.compile(r'(\*|\+|\?|\{(\d+)(,(\d*))?\}|\{,(\d+)\})([?+]?)')
+
+
+def _tokens(pattern: str, window: int) -> List[List[Any]]:
+    """
+    Split a pattern into [atom, low, high, suffix] tokens; low/high are None for
+    an atom without a quantifier, and unbounded repeats get high = window
+    """
+    tokens: List[List[Any]] = []
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == '\\':
+            atom = pattern[i:i + 2]
+        elif char == '[':
+            # The whole class; a ']' first (or right after '^') is a literal
+            end = i + 1
+            if end < length and pattern[end] == '^':
+                end += 1
+            if end < length and pattern[end] == ']':
+                end += 1
+            while end < length and pattern[end] != ']':
+                end += 2 if pattern[end] == '\\' else 1
+            atom = pattern[i:end + 1]
+        elif pattern.startswith('(?', i):
+            # Group extensions: (?:  (?=  (?<!  (?P<name>  (?i)  ...
+            end = i + 2
+            while end < length and pattern[end] not in ':=!>)':
+                end += 1
+            atom = pattern[i:end + 1]
+        else:
+            atom = char
+        i += len(atom)
+        token = [atom, None, None, '']
+        match = _QUANTIFIER.match(pattern, i) if atom not in ('(', '|') and not atom.startswith('(?') else None
+        if match:
+            quantifier = match.group(1)
+            if quantifier == '*':
+                token[1:3] = [0, window]
+            elif quantifier == '+':
+                token[1:3] = [1, window]
+            elif quantifier == '?':
+                token[1:3] = [0, 1]
+            elif match.group(5) is not None:
+                token[1:3] = [0, int(match.group(5))]
+            else:
+                low = int(match.group(2))
+                high = match.group(4)
+                if match.group(3) is None:
+                    high = low
+                elif high == '':
+                    high = max(low, window)
+                token[1:3] = [low, int(high)]
+            token[3] = match.group(6)
+            i = match.end()
+        tokens.append(token)
+    return tokens
+
+
+def _single_char(atom: str) -> bool:
+    """Whether an atom matches exactly one character (so its repeats can be collapsed)"""
+    return atom not in ('(', ')', '|', '^', '$') and not atom.startswith('(?') and atom not in ('\\b', '\\B', '\\A', '\\Z')
+
+
+def bound_pattern(pattern: str, window: int = DEFAULT_WINDOW) -> str:
+    """
+    Rewrite a pattern so its work per start position is small and bounded:
+    every unbounded repeat stops after `window` characters ('wing.*deal' ->
+    'wing.{0,100}deal'), and a repeat next to a '.' repeat is cut down to its
+    minimum ('.*\\d+' -> '.{0,100}\\d'): the '.' can take the rest of the run, so
+    the same text matches without trying every way of splitting it
+    """
+    tokens = []
+    for token in _tokens(pattern, window):
+        # Compare each repeat with the one kept before it, collapsing until neither is variable
+        while tokens and _single_char(tokens[-1][0]) and _single_char(token[0]):
+            previous = tokens[-1]
+            if not all(item[1] is not None and item[2] > item[1] for item in (previous, token)):
+                break
+            if previous[0] == '.':
+                # Keep the earlier '.' repeat and cut this one down
+                token[2], token[3] = token[1], ''
+                break
+            if token[0] != '.':
+                break
+            previous[2], previous[3] = previous[1], ''
+            if previous[1] == 0:
+                tokens.pop()
+            else:
+                break
+        if token[1] == token[2] == 0:
+            # Collapsed to nothing: the neighbouring '.' repeat covers it
+            continue
+        tokens.append(token)
+    out = []
+    for atom, low, high, suffix in tokens:
+        if low is None:
+            out.append(atom)
+        elif low == high:
+            out.append(atom if low == 1 else '%s{%d}' % (atom, low))
+        elif (low, high, suffix) == (0, 1, ''):
+            out.append(atom + '?')
+        else:
+            out.append('%s{%d,%d}%s' % (atom, low, high, suffix))
+    return ''.join(out)
+
+
+class PatternSet:
+    """
+    A list of deal patterns, checked, bounded and compiled once
+    finditer() may be called from several threads at once
+    """
+
+    def __init__(self, patterns: List[str], window: int = DEFAULT_WINDOW,
+                 budget: float = DOCUMENT_BUDGET_SECONDS, flags: int = re.IGNORECASE):
+        self.window = window
+        self.budget = budget
+        self.flags = flags
+        # (original pattern, compiled bounded pattern, longest possible match, literal prefix)
+        self.compiled: List[Tuple[str, 're.Pattern', int, str]] = []
+        # Patterns that were left out, with the reason
+        self.rejected: Dict[str, str] = {}
+        for pattern in patterns:
+            try:
+                bounded = bound_pattern(pattern, window)
+                analysis = analyze_pattern(bounded, flags)
+                compiled = re.compile(bounded, flags)
+            except (re.error, OverflowError) as e:
+                self.rejected[pattern] = f"doesn't compile: {e}"
+                continue
+            if analysis['problems']:
+                self.rejected[pattern] = '; '.join(analysis['problems'])
+                continue
+            self.compiled.append((pattern, compiled, analysis['max_width'], literal_prefix(bounded, flags)))
+        # Documents that ran out of budget: source, pattern, chars, elapsed_ms
+        self.overruns: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def patterns(self) -> List[str]:
+        """The patterns that are run, in order (pattern indexes refer to this list)"""
+        return [pattern for pattern, _, _, _ in self.compiled]
+
+    def finditer(self, text: str, source: Optional[str] = None, skip: Set[int] = frozenset(),
+                 timings: Optional[List[float]] = None) -> Iterator[Tuple[int, 're.Match']]:
+        """
+        Every match of every pattern in a document, as (pattern index, match),
+        pattern by pattern, like running each pattern's finditer() in turn
+        Patterns whose index is in skip aren't run; if timings is given, the
+        seconds spent in each pattern (not counting the caller's work) are added to it
+        Stops early (and records an overrun) once the document's time budget is spent;
+        like timings, the budget only counts matching, not the caller's work between matches
+
+        A pattern with a literal prefix is only tried where the prefix occurs,
+        on a slice no longer than its longest match, so the budget is checked
+        after every attempt; other patterns are searched SLICE_CHARS at a time
+        """
+        deadline = time.perf_counter() + self.budget
+        length = len(text)
+        folded = text.lower() if self.flags & re.IGNORECASE else text
+        if len(folded) != length:
+            # Some characters change length when lowercased; positions wouldn't line up
+            folded = None
+        for index, (pattern, compiled, max_width, prefix) in enumerate(self.compiled):
+            if index in skip:
+                continue
+            started = time.perf_counter()
+            pos = 0
+            while pos < length:
+                if prefix and folded is not None:
+                    start = folded.find(prefix, pos)
+                    if start < 0:
+                        break
+                    # One past the longest match, so \b and lookaheads can see the next character
+                    match = compiled.match(text, start, min(length, start + max_width + 1))
+                    next_pos = start + 1
+                else:
+                    # A match starting in this slice may run past its end by up to max_width
+                    slice_end = min(length, pos + SLICE_CHARS)
+                    match = compiled.search(text, pos, min(length, slice_end + max_width + 1))
+                    if match is not None and match.start() >= slice_end:
+                        match = None
+                    next_pos = slice_end
+                if match is not None:
+                    paused = time.perf_counter()
+                    if timings is not None:
+                        timings[index] += paused - started
+                    yield index, match
+                    # The caller's work on the match doesn't count against the budget either
+                    started = time.perf_counter()
+                    deadline += started - paused
+                    next_pos = max(match.end(), match.start() + 1)
+                if time.perf_counter() > deadline:
+                    self._overrun(source, pattern, length)
+                    if timings is not None:
+                        timings[index] += time.perf_counter() - started
+                    return
+                pos = next_pos
+            if timings is not None:
+                timings[index] += time.perf_counter() - started
+
+    def _overrun(self, source: Optional[str], pattern: str, chars: int):
+        with self._lock:
+            self.overruns.append({
+                'source': source,
+                'pattern': pattern,
+                'chars': chars,
+                'budget_ms': round(self.budget * 1000),
+            })
+
+    def take_overruns(self) -> List[Dict[str, Any]]:
+        """The overruns recorded so far (cleared)"""
+        with self._lock:
+            overruns, self.overruns = self.overruns, []
+        return overruns
+
+
+def _pathological_line(length: int) -> str:
+    """A single long line that makes unbounded patterns backtrack: many "wing"s and digits, no match"""
+    unit = 'wings 1 2 3 '
+    return (unit * (length // len(unit) + 1))[:length]
+
+
+def main():
+    """Print the analysis of DEAL_PATTERNS and time them on a pathological line"""
+    parser = argparse.ArgumentParser(description="Check DEAL_PATTERNS for runaway backtracking")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help=f"longest stretch a repeat may cover (default: {DEFAULT_WINDOW})")
+    parser.add_argument('--length', type=int, default=20000,
+                        help="characters in the pathological test line (default: 20000)")
+    args = parser.parse_args()
+
+    patterns = get_deal_patterns()
+    print(f"\n🛡️  Checking {len(patterns)} deal patterns (window {args.window})")
+    print("=" * 60)
+    for pattern in patterns:
+        before = analyze_pattern(pattern)
+        if before['problems']:
+            print(f"⚠️  {pattern}")
+            for problem in before['problems']:
+                print(f"      {problem}")
+            print(f"      bounded: {bound_pattern(pattern, args.window)}")
+
+    pattern_set = PatternSet(patterns, window=args.window, budget=float('inf'))
+    for pattern, reason in pattern_set.rejected.items():
+        print(f"❌ {pattern}\n      left out: {reason}")
+
+    line = _pathological_line(args.length)
+    started = time.perf_counter()
+    matches = sum(1 for _ in pattern_set.finditer(line))
+    elapsed = time.perf_counter() - started
+    print(f"\n⏱️  Bounded patterns on a {args.length:,}-character pathological line: "
+          f"{elapsed * 1000:.0f}ms ({matches} matches)")
+    print(f"✅ {len(pattern_set.compiled)} patterns ready, {len(pattern_set.rejected)} left out")
+
+
+if __name__ == "__main__":
+    main()
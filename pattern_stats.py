@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Pattern Statistics for Columbus Wing Deals Scraper
+Counts what each deal pattern actually contributes, across runs, so patterns
+that only ever repeat other patterns' finds can be spotted and skipped.
+
+For every page and pattern we count:
+
+    matches     matches that produced a deal
+    unique      matches that found a new deal on the page (a spot no pattern run
+                before it matched, with text not already found) that the scraper
+                kept, rather than dropping it as a repeat of another page's deal
+    losses      matches thrown away as duplicates of a deal already found
+    cpu_ms      time spent running the pattern
+
+Every EXPLORE_EVERY-th page runs all patterns and also records, for each spot a
+pattern matched, which other patterns matched the same spot. From that:
+
+    exclusive   spots no other pattern matched
+    covered_by  how many of a pattern's spots each other pattern also matched
+
+A pattern is dominated by another when the other matched every one of its
+spots (with at least MIN_EVIDENCE spots seen). Dominated patterns are skipped
+as long as the pattern dominating them still runs, so every spot is still
+found; the rest run in order of how many unique deals they find per page.
+The counts are kept in pattern_stats.json, per pattern text, so editing a
+pattern starts its counts afresh.
+
+PatternStats.off() runs every pattern in DEAL_PATTERNS order and counts
+nothing; page_store.py re-extraction uses it so its results are reproducible
+and replaying old pages doesn't skew the counts.
+
+Usage:
+    python pattern_stats.py           # the report
+    python pattern_stats.py --reset
+"""
+
+import argparse
+import json
+import os
+import threading
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from file_utils import atomic_write
+from restaurant_data import get_deal_patterns
+
+PATTERN_STATS_FILE = 'pattern_stats.json'
+# One page in this many runs every pattern, so skipped patterns keep being measured
+EXPLORE_EVERY = 10
+# Spots a pattern must have matched on fully-measured pages before it can be judged
+MIN_EVIDENCE = 20
+
+_COUNTERS = ('pages', 'matches', 'unique', 'losses', 'cpu_ms', 'explored_pages', 'spots', 'exclusive')
+
+
+def _empty_entry() -> Dict[str, Any]:
+    entry: Dict[str, Any] = {counter: 0 for counter in _COUNTERS}
+    entry['covered_by'] = {}
+    return entry
+
+
+class PageTally:
+    """
+    One page's counts, filled in by the scraper as it goes through the matches
+    Pattern numbers are positions in the PatternSet the page is matched with
+    """
+
+    def __init__(self, patterns: List[str], skip: Set[int], explore: bool):
+        self.patterns = patterns
+        self.skip = skip
+        self.explore = explore
+        self.matches = [0] * len(patterns)
+        self.unique = [0] * len(patterns)
+        self.losses = [0] * len(patterns)
+        # Filled in by PatternSet.finditer()
+        self.cpu = [0.0] * len(patterns)
+        # Match start -> the patterns that matched there
+        self.spots: Dict[int, Set[int]] = {}
+        self._texts: Set[str] = set()
+
+    def add(self, index: int, start: int, deal_text: str) -> bool:
+        """
+        Count one deal-producing match
+        Returns True if it was counted as a unique deal (see PatternStats.count_duplicate())
+        """
+        self.matches[index] += 1
+        matched_here = self.spots.setdefault(start, set())
+        unique = not matched_here and deal_text not in self._texts
+        if unique:
+            self.unique[index] += 1
+        else:
+            self.losses[index] += 1
+        matched_here.add(index)
+        self._texts.add(deal_text)
+        return unique
+
+
+class PatternStats:
+    """
+    Per-pattern counts across runs, and the matching plan they lead to
+    start_page() and finish_page() may be called from several threads at once
+    With record=False every pattern runs, in order, and nothing is counted or saved
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, Dict[str, Any]]] = None, runs: int = 0,
+                 filename: str = PATTERN_STATS_FILE, record: bool = True):
+        self.filename = filename
+        self.patterns: Dict[str, Dict[str, Any]] = patterns or {}
+        self.runs = runs
+        self.record = record
+        self._pages_started = 0
+        self._changed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, filename: str = PATTERN_STATS_FILE) -> 'PatternStats':
+        """The counts saved by earlier runs, or empty ones"""
+        if not os.path.exists(filename):
+            return cls(filename=filename)
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            return cls(saved.get('patterns', {}), saved.get('runs', 0), filename)
+        except (OSError, ValueError, AttributeError):
+            # Broken counts only mean measuring again
+            return cls(filename=filename)
+
+    @classmethod
+    def off(cls) -> 'PatternStats':
+        """Stats that skip nothing and count nothing (for replaying stored pages)"""
+        return cls(record=False)
+
+    def entry(self, pattern: str) -> Dict[str, Any]:
+        """A pattern's counts (zero for a pattern we haven't seen)"""
+        return self.patterns.get(pattern) or _empty_entry()
+
+    def dominated_by(self, pattern: str) -> List[str]:
+        """The patterns that matched every spot this one did (once there's enough evidence)"""
+        entry = self.entry(pattern)
+        if entry['spots'] < MIN_EVIDENCE:
+            return []
+        return sorted(other for other, shared in entry['covered_by'].items() if shared >= entry['spots'])
+
+    def _usefulness(self, pattern: str) -> Tuple[int, float, float]:
+        """Sort key: unmeasured patterns first, then most unique deals per page, then fastest"""
+        entry = self.entry(pattern)
+        if not entry['pages']:
+            return (0, 0.0, 0.0)
+        return (1, -entry['unique'] / entry['pages'], entry['cpu_ms'] / entry['pages'])
+
+    def plan(self, patterns: List[str]) -> Tuple[List[str], Set[str]]:
+        """
+        The order to run the patterns in, and the patterns to skip
+        A pattern is only skipped while a pattern dominating it still runs
+        """
+        if not self.record:
+            return list(patterns), set()
+        ordered = sorted(patterns, key=self._usefulness)
+        current = set(patterns)
+        skipped: Set[str] = set()
+        # Let the most expensive dominated patterns go first
+        for pattern in sorted(ordered, key=lambda p: -self.entry(p)['cpu_ms'] / max(1, self.entry(p)['pages'])):
+            if any(other in current and other not in skipped for other in self.dominated_by(pattern)):
+                skipped.add(pattern)
+        return ordered, skipped
+
+    def start_page(self, patterns: List[str], skipped: Set[str]) -> PageTally:
+        """A tally for the next page; every EXPLORE_EVERY-th page runs all patterns"""
+        if not self.record:
+            return PageTally(patterns, set(), False)
+        with self._lock:
+            explore = self._pages_started % EXPLORE_EVERY == 0
+            self._pages_started += 1
+        skip = set() if explore else {index for index, pattern in enumerate(patterns) if pattern in skipped}
+        return PageTally(patterns, skip, explore)
+
+    def finish_page(self, tally: PageTally):
+        """Add a finished page's counts"""
+        if not self.record:
+            return
+        with self._lock:
+            for index, pattern in enumerate(tally.patterns):
+                if index in tally.skip:
+                    continue
+                entry = self.patterns.setdefault(pattern, _empty_entry())
+                entry['pages'] += 1
+                entry['matches'] += tally.matches[index]
+                entry['unique'] += tally.unique[index]
+                entry['losses'] += tally.losses[index]
+                entry['cpu_ms'] = round(entry['cpu_ms'] + tally.cpu[index] * 1000, 3)
+                if tally.explore:
+                    entry['explored_pages'] += 1
+            if tally.explore:
+                for matched_here in tally.spots.values():
+                    for index in matched_here:
+                        entry = self.patterns[tally.patterns[index]]
+                        entry['spots'] += 1
+                        if len(matched_here) == 1:
+                            entry['exclusive'] += 1
+                        for other in matched_here:
+                            if other != index:
+                                covered_by = entry['covered_by']
+                                name = tally.patterns[other]
+                                covered_by[name] = covered_by.get(name, 0) + 1
+            self._changed = True
+
+    def count_duplicate(self, pattern: str):
+        """
+        Move one of a pattern's unique deals to its losses, for a deal that turned
+        out to repeat one the scraper already had from another page
+        """
+        if not self.record:
+            return
+        with self._lock:
+            entry = self.patterns.get(pattern)
+            if entry is not None and entry['unique'] > 0:
+                entry['unique'] -= 1
+                entry['losses'] += 1
+                self._changed = True
+
+    def save(self):
+        """Save the counts for the patterns still in DEAL_PATTERNS (if anything was measured)"""
+        with self._lock:
+            if not self._changed:
+                return
+            current = set(get_deal_patterns())
+            patterns = {}
+            for pattern, entry in self.patterns.items():
+                if pattern in current:
+                    patterns[pattern] = dict(entry, covered_by={other: shared for other, shared
+                                                                in entry['covered_by'].items() if other in current})
+            self.runs += 1
+            with atomic_write(self.filename) as f:
+                json.dump({'runs': self.runs, 'patterns': patterns}, f, indent=2, ensure_ascii=False, sort_keys=True)
+            self._changed = False
+
+
+def print_report(stats: PatternStats, patterns: List[str]):
+    """One line per pattern in the order they'll run, with what the scraper will do with it"""
+    ordered, skipped = stats.plan(patterns)
+    print(f"\n📐 Deal pattern statistics ({stats.runs} runs)")
+    print("=" * 78)
+    print(f"{'pages':>6} {'matches':>8} {'unique':>7} {'losses':>7} {'excl.':>6} {'ms/page':>8}  pattern")
+    never, redundant = [], []
+    for pattern in ordered:
+        entry = stats.entry(pattern)
+        per_page = entry['cpu_ms'] / entry['pages'] if entry['pages'] else 0.0
+        print(f"{entry['pages']:>6} {entry['matches']:>8} {entry['unique']:>7} {entry['losses']:>7} "
+              f"{entry['exclusive']:>6} {per_page:>8.3f}  {pattern}")
+        if pattern in skipped:
+            print(f"{'':>47}⏭️  skipped: dominated by {', '.join(stats.dominated_by(pattern)[:3])}")
+        elif entry['pages'] and not entry['matches']:
+            never.append(pattern)
+        elif entry['spots'] >= MIN_EVIDENCE and not entry['exclusive']:
+            # Every spot is matched by some other pattern, just not always the same one
+            redundant.append(pattern)
+
+    print("\n📊 Summary:")
+    print(f"   • {len(skipped)} dominated patterns skipped")
+    print(f"   • {len(redundant)} more redundant (never the only pattern to match), still run")
+    for pattern in redundant:
+        print(f"       {pattern}")
+    print(f"   • {len(never)} never matched")
+    for pattern in never:
+        print(f"       {pattern}")
+
+
+def main():
+    """Show what each deal pattern contributes (or start the counts again)"""
+    parser = argparse.ArgumentParser(description="Report how useful each deal pattern is")
+    parser.add_argument('--stats', default=PATTERN_STATS_FILE,
+                        help=f"pattern statistics file (default: {PATTERN_STATS_FILE})")
+    parser.add_argument('--reset', action='store_true', help="delete the statistics and start measuring again")
+    args = parser.parse_args()
+
+    if args.reset:
+        if os.path.exists(args.stats):
+            os.remove(args.stats)
+        print(f"✅ Pattern statistics reset ({args.stats})")
+        return
+    stats = PatternStats.load(args.stats)
+    if not stats.patterns:
+        print(f"No pattern statistics yet - run the scraper first ({args.stats} is empty or missing)")
+        return
+    print_report(stats, get_deal_patterns())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Scrape Pipeline for Columbus Wing Deals Scraper
+Runs fetching, extraction, de-duplication and publishing at the same time,
+connected by bounded queues:
+
+    fetch (several threads) -> extract -> dedup -> publish
+
+Each queue holds only a few items, so a fast stage waits for a slow one
+instead of piling up work in memory. While sites are still being fetched,
+the publish stage writes wing_deals.json and the HTML page every few seconds,
+so early results are visible (and picked up by deals_server.py) long before
+the slowest site times out. A run takes about as long as its slowest stage
+rather than the sum of all of them.
+"""
+
+import queue
+import random
+import threading
+import time
+from typing import List, Dict, Any, Tuple
+
+from exporters import DEFAULT_EXPORTS, export_deals
+from html_generator import WingDealsHTMLGenerator
+from profiling import StageProfiler
+from restaurant_data import get_restaurants_by_category, get_deal_sites
+from wing_scraper import ColumbusWingScraper
+
+# Parallel downloads; each waits FETCH_DELAY seconds between its own requests
+FETCH_WORKERS = 4
+FETCH_DELAY = (1, 3)
+# Page parsing is CPU-bound, so more than a couple of threads doesn't help
+EXTRACT_WORKERS = 2
+# How many items each queue holds before the stage feeding it waits
+QUEUE_SIZE = 8
+# Seconds between partial publishes while the scrape is still running
+PUBLISH_INTERVAL = 5.0
+
+# Put on a queue to tell the stage reading it that no more work is coming
+_DONE = object()
+
+
+class ScrapePipeline:
+    """
+    One overlapped scrape-and-publish run
+    """
+
+    def __init__(self, scraper: ColumbusWingScraper = None, generator: WingDealsHTMLGenerator = None,
+                 fetch_workers: int = FETCH_WORKERS, extract_workers: int = EXTRACT_WORKERS,
+                 publish_interval: float = PUBLISH_INTERVAL, html_file: str = 'wing_deals.html',
+                 fetch_delay: Tuple[float, float] = FETCH_DELAY, profiler: StageProfiler = None):
+        self.scraper = scraper or ColumbusWingScraper()
+        self.generator = generator or WingDealsHTMLGenerator()
+        self.fetch_workers = fetch_workers
+        self.extract_workers = extract_workers
+        self.publish_interval = publish_interval
+        self.html_file = html_file
+        self.fetch_delay = fetch_delay
+        # Profiles each stage when enabled (main.py --profile); otherwise calls straight through
+        self.profiler = profiler or StageProfiler('pipeline', enabled=False)
+
+        self._targets: queue.Queue = queue.Queue()
+        self._pages: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._found: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._new_deals: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._errors: List[BaseException] = []
+        # Seconds each stage spent working (not waiting), for the timing summary
+        self.busy: Dict[str, float] = {'fetch': 0.0, 'extract': 0.0, 'dedup': 0.0, 'publish': 0.0}
+        self._busy_lock = threading.Lock()
+        self.partial_publishes = 0
+
+    def _add_busy(self, stage: str, started: float):
+        with self._busy_lock:
+            self.busy[stage] += time.perf_counter() - started
+
+    def _stage(self, target, inbox: queue.Queue = None, outbox: queue.Queue = None):
+        """
+        Run a stage, recording any crash so run() can re-raise it
+        A crashed stage keeps emptying its inbox and still signals its outbox,
+        so the stages around it don't block forever on a full queue
+        """
+        try:
+            self.profiler.call(target.__name__.lstrip('_'), target)
+        except BaseException as e:
+            self._errors.append(e)
+            if inbox is not None:
+                while inbox.get() is not _DONE:
+                    pass
+            if outbox is not None:
+                outbox.put(_DONE)
+
+    # ------------------------------------------------------------------
+    # Stages
+
+    def _fetch(self):
+        """Download pages until the target list runs out"""
+        while True:
+            try:
+                name, url = self._targets.get_nowait()
+            except queue.Empty:
+                return
+            print(f"Scraping {name}...")
+            started = time.perf_counter()
+            try:
+                content = self.scraper.fetch_page(url, name)
+            except Exception as e:
+                # If a site is down or blocks us, report it and move on
+                print(f"Error scraping {name}: {str(e)}")
+                content = None
+            self._add_busy('fetch', started)
+            if content is not None:
+                self._pages.put((name, content))
+            # Be respectful to servers
+            time.sleep(random.uniform(*self.fetch_delay))
+
+    def _extract(self):
+        """Parse pages and pass along every deal they mention"""
+        while True:
+            item = self._pages.get()
+            if item is _DONE:
+                return
+            name, content = item
+            started = time.perf_counter()
+            try:
+                deals = self.scraper.extract_page(content, name)
+            except Exception as e:
+                print(f"Error reading {name}: {str(e)}")
+                deals = []
+            self._add_busy('extract', started)
+            if deals:
+                self._found.put((deals, True))
+
+    def _dedup(self):
+        """
+        Keep only deals we haven't seen; this is the one stage that touches
+        scraper.deals and its search index, so they need no locking
+        """
+        while True:
+            item = self._found.get()
+            if item is _DONE:
+                self._new_deals.put(_DONE)
+                return
+            deals, check_duplicates = item
+            started = time.perf_counter()
+            new_deals = [deal for deal in deals if self.scraper.add_deal(deal, check_duplicates)]
+            self._add_busy('dedup', started)
+            if new_deals:
+                self._new_deals.put(new_deals)
+
+    def _publish(self):
+        """
+        Collect new deals and publish partial results every publish_interval seconds
+        Works from its own copy of the list, since dedup keeps appending to the scraper's
+        """
+        deals: List[Dict[str, Any]] = []
+        published_count = 0
+        next_publish = time.monotonic() + self.publish_interval
+        while True:
+            try:
+                batch = self._new_deals.get(timeout=max(0.0, next_publish - time.monotonic()))
+            except queue.Empty:
+                batch = None
+            if batch is _DONE:
+                return
+            if batch:
+                deals.extend(batch)
+            if time.monotonic() >= next_publish:
+                if len(deals) > published_count:
+                    started = time.perf_counter()
+                    self._publish_partial(deals)
+                    self._add_busy('publish', started)
+                    published_count = len(deals)
+                next_publish = time.monotonic() + self.publish_interval
+
+    def _publish_partial(self, deals: List[Dict[str, Any]]):
+        """Write the deals found so far (JSON and the page only; the rest waits for the end)"""
+        export_deals(deals, {'json': DEFAULT_EXPORTS['json']})
+        self.generator.generate_html(deals, self.html_file)
+        self.partial_publishes += 1
+        print(f"📤 Published {len(deals)} deals so far")
+
+    def _publish_final(self):
+        """Write every format, the saved search index and the page"""
+        self.scraper.export()
+        self.scraper.search_index.save()
+        self.generator.generate_html(self.scraper.deals, self.html_file, search_index=self.scraper.search_index)
+
+    # ------------------------------------------------------------------
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Scrape every restaurant and deal site, publishing as results come in
+        Returns the final list of deals (the same list as scraper.deals)
+        """
+        print("Starting Columbus Wing Deals Scraper...")
+        print("=" * 50)
+        run_started = time.perf_counter()
+
+        # Sources on the URL health checker's skip list are left out
+        for source in self.scraper.active_sources(get_restaurants_by_category() + get_deal_sites()):
+            self._targets.put((source['name'], source['url']))
+
+        fetchers = [threading.Thread(target=self._stage, args=(self._fetch,), daemon=True)
+                    for _ in range(self.fetch_workers)]
+        extractors = [threading.Thread(target=self._stage, args=(self._extract, self._pages), daemon=True)
+                      for _ in range(self.extract_workers)]
+        dedup = threading.Thread(target=self._stage, args=(self._dedup, self._found, self._new_deals), daemon=True)
+        publisher = threading.Thread(target=self._stage, args=(self._publish, self._new_deals), daemon=True)
+        for thread in fetchers + extractors + [dedup, publisher]:
+            thread.start()
+
+        # The backup deals are ready immediately, so the first publish already has something to show
+        # (they are added as-is, like run_scraper() does)
+        self._found.put((self.scraper.get_timestamped_mock_deals(), False))
+
+        # Shut the stages down in order: each one finishes its queue before the next is told to stop
+        for thread in fetchers:
+            thread.join()
+        for _ in extractors:
+            self._pages.put(_DONE)
+        for thread in extractors:
+            thread.join()
+        self._found.put(_DONE)
+        dedup.join()
+        publisher.join()
+        if self._errors:
+            raise self._errors[0]
+
+        started = time.perf_counter()
+        self.profiler.call('final_publish', self._publish_final)
+        self._add_busy('publish', started)
+        # Keep this run's raw pages for offline re-extraction
+        if self.scraper.page_store is not None:
+            self.scraper.page_store.finish()
+        self.scraper.boilerplate.save()
+        self.scraper.pattern_stats.save()
+
+        self.elapsed = time.perf_counter() - run_started
+        print(f"\nScraping complete! Found {len(self.scraper.deals)} wing deals.")
+        return self.scraper.deals
+
+    def print_timing(self):
+        """Show how much the stages overlapped"""
+        print("⏱️  Pipeline timing:")
+        for stage, seconds in self.busy.items():
+            print(f"   • {stage}: {seconds:.1f}s busy")
+        print(f"   • Wall clock: {self.elapsed:.1f}s ({sum(self.busy.values()):.1f}s of work, "
+              f"{self.partial_publishes} partial publishes)")
@@ -0,0 +1,166 @@
+"""
+Stage Profiler for Columbus Wing Deals Scraper
+Collects a CPU profile (cProfile) and the memory each stage is still holding
+when it finishes (tracemalloc), so slow or memory-hungry runs can be traced
+to scraping, extraction or rendering without hand-wrapping anything.
+
+Enable it with --profile on main.py, wing_scraper.py or html_generator.py.
+Each run writes to profiles/<label>-<timestamp>/:
+
+    <stage>.prof        CPU profile (open with pstats or snakeviz)
+    <stage>-memory.txt  top allocation sites for the stage
+    summary.txt         the summary printed at the end of the run
+
+Stages can run on several threads at once (the scrape pipeline does); each
+thread gets its own profile, merged per stage. Allocations are credited to a
+stage when the stage's function is on the allocation's call stack.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+DEFAULT_PROFILE_DIR = 'profiles'
+# Hot functions and allocation sites shown per stage
+DEFAULT_TOP = 10
+# Call stack depth kept for each allocation; deep enough to reach the stage
+# function from inside an HTML parser
+TRACE_FRAMES = 100
+
+
+def _code_lines(func: Callable) -> Tuple[str, int, int]:
+    """The file and first/last line of a function's body"""
+    code = getattr(func, '__func__', func).__code__
+    lines = [line for _, _, line in code.co_lines() if line is not None]
+    return code.co_filename, code.co_firstlineno, max(lines, default=code.co_firstlineno)
+
+
+class StageProfiler:
+    """
+    Profiles named stages of one run; a disabled profiler just calls through
+    """
+
+    def __init__(self, label: str, enabled: bool = True, output_dir: str = DEFAULT_PROFILE_DIR,
+                 top: int = DEFAULT_TOP):
+        self.label = label
+        self.enabled = enabled
+        self.top = top
+        self.run_dir = os.path.join(output_dir, f"{label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, List[cProfile.Profile]] = {}
+        self._wall: Dict[str, float] = {}
+        # Per stage: (file, first line, last line) of the function it runs
+        self._code: Dict[str, Tuple[str, int, int]] = {}
+        # Per stage: (bytes held, [(site, bytes, count)]) from the largest end-of-stage snapshot
+        self._memory: Dict[str, Tuple[int, List[Tuple[str, int, int]]]] = {}
+        self._skipped_cpu = 0
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def call(self, stage: str, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) as part of the named stage and return its result"""
+        if not self.enabled:
+            return func(*args, **kwargs)
+
+        with self._lock:
+            self._code.setdefault(stage, _code_lines(func))
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Newer Pythons allow only one active profiler at a time across threads
+            profile = None
+            with self._lock:
+                self._skipped_cpu += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+            with self._lock:
+                if profile is not None:
+                    self._profiles.setdefault(stage, []).append(profile)
+                self._wall[stage] = self._wall.get(stage, 0.0) + elapsed
+            self._record_memory(stage)
+
+    def _record_memory(self, stage: str):
+        """Snapshot what the stage's allocations still hold now that it has finished"""
+        filename, first, last = self._code[stage]
+        snapshot = tracemalloc.take_snapshot()
+        total = 0
+        sites: Dict[str, List[int]] = {}
+        for trace in snapshot.traces:
+            if not any(frame.filename == filename and first <= frame.lineno <= last
+                       for frame in trace.traceback):
+                continue
+            total += trace.size
+            # The most recent frame is where the memory was allocated
+            frame = trace.traceback[-1]
+            site = sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            site[0] += trace.size
+            site[1] += 1
+        with self._lock:
+            if total >= self._memory.get(stage, (-1, []))[0]:
+                top_sites = sorted(((site, size, count) for site, (size, count) in sites.items()),
+                                   key=lambda item: item[1], reverse=True)
+                self._memory[stage] = (total, top_sites)
+
+    def finish(self) -> Optional[str]:
+        """Write every stage's files, print the summary and return the run directory"""
+        if not self.enabled:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        summary = io.StringIO()
+        summary.write(f"🔬 Profile of {self.label} ({self.run_dir})\n")
+        summary.write(f"   Peak traced memory: {peak / 1024 / 1024:.1f} MB\n")
+        if self._skipped_cpu:
+            summary.write(f"   ({self._skipped_cpu} overlapping stage calls ran without a CPU profile)\n")
+
+        for stage in self._wall:
+            summary.write(f"\n=== {stage}: {self._wall[stage]:.2f}s wall (summed across calls and threads) ===\n")
+            profiles = self._profiles.get(stage)
+            if profiles:
+                stats = pstats.Stats(*profiles, stream=summary)
+                stats.dump_stats(os.path.join(self.run_dir, f"{stage}.prof"))
+                summary.write("Hot functions (by own time):\n")
+                stats.sort_stats('tottime').print_stats(self.top)
+
+            held, sites = self._memory.get(stage, (0, []))
+            lines = [f"Memory still held from {stage}: {held / 1024:.1f} KB"]
+            lines.extend(f"  {size / 1024:10.1f} KB  {count:7d} blocks  {site}" for site, size, count in sites)
+            with open(os.path.join(self.run_dir, f"{stage}-memory.txt"), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            summary.write('\n'.join(lines[:self.top + 1]) + '\n')
+
+        text = summary.getvalue()
+        with open(os.path.join(self.run_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(text)
+        print(f"🔬 Profiles written to {self.run_dir}/")
+        return self.run_dir
+
+
+def add_profile_arguments(parser):
+    """Add the --profile options to an argparse parser"""
+    parser.add_argument('--profile', action='store_true',
+                        help="profile CPU and memory per stage and write a report")
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR,
+                        help=f"where profile runs are written (default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument('--profile-top', type=int, default=DEFAULT_TOP,
+                        help=f"functions and allocation sites shown per stage (default: {DEFAULT_TOP})")
+
+
+def profiler_from_args(args, label: str) -> StageProfiler:
+    """Build a StageProfiler from parsed --profile options (disabled if --profile wasn't given)"""
+    return StageProfiler(label, enabled=args.profile, output_dir=args.profile_dir, top=args.profile_top)
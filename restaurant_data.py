@@ -7,8 +7,28 @@ This is the central database for the entire scraper system.
 All restaurant information, deal patterns, and mock data are stored here.
 """
 
+# Import JSON and os for the saved restaurant list
+import json
+import os
+# Import regular expressions for matching day names in deal text
+import re
 # Import type hints for better code documentation
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+# Import atomic writes so the saved restaurant list is never half-written
+from file_utils import atomic_write
+
+# Where the restaurant list is saved after a bulk import (manage_restaurants.py), next to this file
+# The command-line tools load it over the built-in RESTAURANTS list below (load_saved_restaurants)
+RESTAURANTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'restaurants.jsonl')
+
+# Nicknames people use for restaurants, expanded before names are compared for duplicates
+# (see fuzzy_index.py); keys are lowercase words without apostrophes or punctuation
+NAME_ALIASES = {
+    'bdubs': 'buffalo wild wings',
+    'b dubs': 'buffalo wild wings',
+    'bww': 'buffalo wild wings',
+    'qsl': 'quaker steak lube',
+}
 
 # Define the different categories of restaurants we track
 # This helps organize restaurants and makes filtering easier
@@ -22,6 +42,10 @@ RESTAURANT_CATEGORIES = {
 
 # This is the main database of all restaurants we want to scrape
 # Each restaurant has: name, website URL, category, locations, known deals, and confidence level
+# Any restaurant or deal site can also list 'selectors' (CSS or XPath) for the parts of its
+# page that hold promotions, plus optional 'exclude_selectors' to cut out of those parts;
+# then only that text is scanned for deals (see extraction_rules.py). Only add selectors
+# that have been checked against a saved copy of the site's page
 RESTAURANTS = [
     # Major Chains
     {
@@ -379,6 +403,54 @@ DEAL_SITES = [
     }
 ]
 
+# Offline lookup table of approximate coordinates (latitude, longitude) for the
+# places that show up in restaurant 'locations' entries
+# Keys are lowercase place names; chains listed as "Multiple Columbus locations"
+# fall back to the downtown Columbus coordinates
+LOCATION_COORDINATES = {
+    # Columbus and its neighborhoods
+    'columbus': (39.9612, -82.9988),
+    'downtown': (39.9612, -82.9988),
+    'short north': (39.9790, -83.0036),
+    'german village': (39.9487, -82.9930),
+    'brewery district': (39.9510, -83.0000),
+    'italian village': (39.9820, -82.9960),
+    'arena district': (39.9690, -83.0060),
+    'franklinton': (39.9580, -83.0200),
+    'olde towne east': (39.9620, -82.9700),
+    'clintonville': (40.0334, -83.0143),
+    'university district': (40.0017, -83.0096),
+    'campus': (40.0017, -83.0096),
+    'linden': (40.0120, -82.9700),
+    'easton': (40.0506, -82.9155),
+    'polaris': (40.1456, -82.9813),
+    
+    # Suburbs and nearby cities
+    'grandview': (39.9770, -83.0443),
+    'grandview heights': (39.9770, -83.0443),
+    'upper arlington': (39.9945, -83.0624),
+    'bexley': (39.9689, -82.9377),
+    'whitehall': (39.9667, -82.8855),
+    'worthington': (40.0931, -83.0180),
+    'lewis center': (40.1984, -83.0102),
+    'dublin': (40.0992, -83.1141),
+    'hilliard': (40.0334, -83.1582),
+    'westerville': (40.1262, -82.9291),
+    'gahanna': (40.0192, -82.8793),
+    'new albany': (40.0812, -82.8088),
+    'reynoldsburg': (39.9548, -82.8121),
+    'pickerington': (39.8842, -82.7535),
+    'canal winchester': (39.8429, -82.8049),
+    'grove city': (39.8815, -83.0930),
+    'powell': (40.1578, -83.0752),
+    'plain city': (40.1073, -83.2674),
+    'sunbury': (40.2423, -82.8591),
+    'delaware': (40.2987, -83.0680),
+    'marysville': (40.2364, -83.3671),
+    'newark': (40.0581, -82.4013),
+    'lancaster': (39.7137, -82.5993),
+}
+
 # These are regex patterns that help us find wing deals in website text
 # Each pattern looks for different ways restaurants might describe their deals
 # The patterns are case-insensitive and flexible to catch various writing styles
@@ -437,6 +509,22 @@ DEAL_PATTERNS = [
     r'wing.*value',
 ]
 
+# Abbreviations and plurals of day names, mapped to the full day name
+# Used to normalize day mentions in deal text ("Tues", "Wednesdays" -> tuesday, wednesday)
+DAY_ALIASES = {
+    'mon': 'monday', 'mondays': 'monday',
+    'tue': 'tuesday', 'tues': 'tuesday', 'tuesdays': 'tuesday',
+    'wed': 'wednesday', 'weds': 'wednesday', 'wednesdays': 'wednesday',
+    'thu': 'thursday', 'thur': 'thursday', 'thurs': 'thursday', 'thursdays': 'thursday',
+    'fri': 'friday', 'fridays': 'friday',
+    'sat': 'saturday', 'saturdays': 'saturday',
+    'sun': 'sunday', 'sundays': 'sunday',
+    'weekends': 'weekend',
+}
+
+# Full day names in week order
+DAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
 # These are realistic deals that restaurants commonly offer
 # We use these when web scraping fails (websites block us)
 # This ensures users always get useful information even if we can't access live websites
@@ -754,4 +842,71 @@ def update_restaurant(name: str, updated_data: Dict[str, Any]) -> bool:
         if restaurant['name'].lower() == name.lower():
             RESTAURANTS[i].update(updated_data)
             return True
-    return False 
\ No newline at end of file
+    return False 
+
+def get_location_coordinates(location: str) -> Optional[Tuple[float, float]]:
+    """
+    Look up approximate coordinates for a free-text location string
+    Tries an exact match first, then the longest known place name mentioned in the text
+    as whole words ('Columbus area - mobile' -> Columbus, but 'Lindenwood' isn't Linden);
+    returns None if nothing matches
+    """
+    key = location.strip().lower()
+    if key in LOCATION_COORDINATES:
+        return LOCATION_COORDINATES[key]
+    
+    # Prefer the most specific place ('grandview heights' over 'columbus')
+    matches = [place for place in LOCATION_COORDINATES if re.search(r'\b' + re.escape(place) + r'\b', key)]
+    if not matches:
+        return None
+    return LOCATION_COORDINATES[max(matches, key=len)]
+
+def get_deal_days(deal_text: str) -> List[str]:
+    """
+    Get the days of the week a deal's text mentions, in week order
+    Full day names count anywhere in the text ("tuesdays" -> tuesday);
+    abbreviations from DAY_ALIASES only count as whole words ("tues" but not "wedding")
+    """
+    text = deal_text.lower()
+    days = {day for day in DAY_NAMES if day in text}
+    for word in re.findall(r'[a-z]+', text):
+        day = DAY_ALIASES.get(word)
+        if day in DAY_NAMES:
+            days.add(day)
+    return [day for day in DAY_NAMES if day in days]
+
+def get_deal_prices(deal_text: str) -> List[float]:
+    """
+    Get the dollar amounts a deal's text mentions, in the order they appear
+    Understands "$8.99" and "50 cent(s)" (returned as 0.5)
+    """
+    prices = []
+    for match in re.finditer(r'\$(\d+(?:\.\d+)?)|(\d+(?:\.\d+)?)\s*cents?\b', deal_text.lower()):
+        if match.group(1) is not None:
+            prices.append(float(match.group(1)))
+        else:
+            prices.append(float(match.group(2)) / 100)
+    return prices
+
+def save_restaurants(restaurants: List[Dict[str, Any]] = None, filename: str = RESTAURANTS_FILE) -> None:
+    """
+    Save the restaurant list as JSON Lines (one restaurant per line)
+    Saves the current database unless a list is given
+    """
+    if restaurants is None:
+        restaurants = RESTAURANTS
+    with atomic_write(filename) as f:
+        for restaurant in restaurants:
+            f.write(json.dumps(restaurant, ensure_ascii=False) + '\n')
+
+def load_saved_restaurants(filename: str = RESTAURANTS_FILE) -> bool:
+    """
+    Replace the database with a saved restaurant list, if one exists
+    Returns True if a saved list was loaded
+    """
+    if not os.path.exists(filename):
+        return False
+    with open(filename, 'r', encoding='utf-8') as f:
+        # Replaced in place, since other modules hold a reference to RESTAURANTS
+        RESTAURANTS[:] = [json.loads(line) for line in f if line.strip()]
+    return True
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Scrape Daemon for Columbus Wing Deals Scraper
+Stays resident instead of running from cron, so every refresh reuses what the
+last one built: compiled deal patterns, pooled HTTP connections, each site's
+ETag/Last-Modified (unchanged pages come back as 304 and are not re-parsed),
+the deals already found per source, and the generator's page template.
+
+Each source is refreshed on its own interval (REFRESH_MINUTES by category,
+or a 'refresh_minutes' key on the restaurant). After every cycle that changed
+something, the data files and the page are published atomically.
+
+Deal counts by confidence, day, source and restaurant are kept current from
+each source's changes (see aggregates.py), so publishing and /health never
+recount every deal; each publish reports what changed since the last one.
+
+    GET /health   -> JSON with uptime, cycle counts, deal counts and per-source status
+
+SIGTERM/SIGINT finish the current cycle and exit; SIGHUP refreshes every
+source right away.
+
+Usage:
+    python scrape_daemon.py --health-port 8001
+    python main.py --daemon
+"""
+
+import argparse
+import json
+import signal
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional, Tuple
+
+from aggregates import Aggregates, describe_changes
+from exporters import export_deals
+from html_generator import WingDealsHTMLGenerator
+from restaurant_data import get_restaurants_by_category, get_deal_sites, load_saved_restaurants
+from search_index import DealSearchIndex
+from url_health import load_skip_list
+from wing_scraper import ColumbusWingScraper
+
+# How often each kind of source is refreshed, in minutes
+REFRESH_MINUTES = {
+    'deal_aggregator': 30,
+    'major_chains': 360,
+    'local_chains': 180,
+    'independent': 120,
+    'food_trucks': 60,
+    'bars_pubs': 120,
+}
+DEFAULT_REFRESH_MINUTES = 120
+# Sources fetched at the same time within one cycle
+FETCH_WORKERS = 4
+# Longest the daemon sleeps before checking the schedule again
+MAX_SLEEP_SECONDS = 60
+DEFAULT_HEALTH_PORT = 8001
+
+# Sources are tracked by (name, url): a restaurant and a deal site can share a name
+SourceKey = Tuple[str, str]
+
+
+def source_key(source: Dict[str, Any]) -> SourceKey:
+    return source['name'], source['url']
+
+
+class WingDealsDaemon:
+    """
+    Resident scraper that refreshes sources on a schedule and publishes after each change
+    """
+
+    def __init__(self, html_file: str = 'wing_deals.html', interval_minutes: Optional[float] = None,
+                 fetch_workers: int = FETCH_WORKERS):
+        self.html_file = html_file
+        # Overrides every source's own interval when set (handy for testing)
+        self.interval_minutes = interval_minutes
+        self.fetch_workers = fetch_workers
+
+        # Kept for the life of the daemon: session, compiled patterns, HTTP validators
+        self.scraper = ColumbusWingScraper()
+        self.generator = WingDealsHTMLGenerator()
+        # The backup deals are stamped once so unchanged cycles publish identical files
+        self.mock_deals = self.scraper.get_timestamped_mock_deals()
+
+        # Latest deals and status for each source, by source_key()
+        self.source_deals: Dict[SourceKey, List[Dict[str, Any]]] = {}
+        # Counts over every source's deals plus the backup deals, updated as sources change
+        # (a deal listed by two sources counts for each); guarded by _lock
+        self.stats = Aggregates.for_deals(self.mock_deals)
+        self._published_stats: Dict[str, Any] = {}
+        self.source_status: Dict[SourceKey, Dict[str, Any]] = {}
+        self.next_due: Dict[SourceKey, float] = {}
+
+        self.started = time.time()
+        self.cycles = 0
+        self.publishes = 0
+        self.last_publish: Optional[str] = None
+        self.deal_count = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+
+    def sources(self) -> List[Dict[str, Any]]:
+        """
+        Every restaurant and deal site, read fresh so edits to restaurant_data apply,
+        minus the sources on the URL health checker's skip list
+        A source listed twice (same name and URL) is only refreshed once
+        """
+        sources = {}
+        for source in self.scraper.active_sources(get_restaurants_by_category() + get_deal_sites(), report=False):
+            sources.setdefault(source_key(source), source)
+        return list(sources.values())
+
+    def refresh_seconds(self, source: Dict[str, Any]) -> float:
+        if self.interval_minutes is not None:
+            return self.interval_minutes * 60
+        minutes = source.get('refresh_minutes') or REFRESH_MINUTES.get(source.get('category'), DEFAULT_REFRESH_MINUTES)
+        return minutes * 60
+
+    def refresh_all(self):
+        """Make every source due now (SIGHUP)"""
+        with self._lock:
+            self.next_due.clear()
+        self._wake.set()
+
+    def stop(self):
+        """Finish the current cycle and exit (SIGTERM/SIGINT)"""
+        self._stop.set()
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # One cycle
+
+    def _refresh_source(self, source: Dict[str, Any]) -> bool:
+        """
+        Fetch and re-extract one source; returns True if its deals changed
+        Deals the source already had keep their original date_found
+        """
+        name = source['name']
+        key = source_key(source)
+        status = {'last_checked': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        try:
+            changed, content = self.scraper.fetch_if_modified(source['url'])
+        except Exception as e:
+            status.update(ok=False, error=str(e))
+            self.source_status[key] = status
+            return False
+
+        if not changed:
+            status.update(ok=True, result='not modified')
+            self.source_status[key] = status
+            return False
+        if content is None:
+            status.update(ok=False, error='no page returned')
+            self.source_status[key] = status
+            return False
+
+        previous = {deal['deal_text']: deal for deal in self.source_deals.get(key, [])}
+        deals = {}
+        try:
+            found = self.scraper.find_deals_in_page(content, name, learn=True)
+        except Exception as e:
+            # One page that breaks extraction mustn't stop the rest of the cycle from publishing.
+            # Its deals stay as they were, and the page is fetched in full next time
+            self.scraper.forget_validators(source['url'])
+            status.update(ok=False, error=f"extraction failed: {e}")
+            self.source_status[key] = status
+            return False
+        for deal in found:
+            if deal['deal_text'] in deals:
+                continue
+            known = previous.get(deal['deal_text'])
+            if known is not None:
+                deal['date_found'] = known['date_found']
+            deals[deal['deal_text']] = deal
+        status.update(ok=True, result=f"{len(deals)} deals")
+        self.source_status[key] = status
+
+        if list(deals) == list(previous):
+            return False
+        self.source_deals[key] = list(deals.values())
+        with self._lock:
+            for deal_text, deal in previous.items():
+                if deals.get(deal_text) != deal:
+                    self.stats.remove(deal)
+            for deal_text, deal in deals.items():
+                if previous.get(deal_text) != deal:
+                    self.stats.add(deal)
+        return True
+
+    def run_cycle(self) -> bool:
+        """
+        Refresh every due source; publish if any of them changed
+        Returns True if something was published
+        """
+        # Pick up a skip list written by url_health.py since the last cycle
+        self.scraper.skip_list = load_skip_list()
+        now = time.time()
+        sources = self.sources()
+        with self._lock:
+            due = [source for source in sources if self.next_due.get(source_key(source), 0) <= now]
+            for source in due:
+                self.next_due[source_key(source)] = now + self.refresh_seconds(source)
+            # Sources removed from the database drop out of the schedule and the output
+            keys = {source_key(source) for source in sources}
+            for key in [key for key in self.next_due if key not in keys]:
+                del self.next_due[key]
+
+        changed = any(key not in keys for key in list(self.source_deals))
+        for key in [key for key in self.source_deals if key not in keys]:
+            with self._lock:
+                for deal in self.source_deals[key]:
+                    self.stats.remove(deal)
+            del self.source_deals[key]
+            self.source_status.pop(key, None)
+
+        if due:
+            print(f"🔄 Refreshing {len(due)} sources...")
+            with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+                results = list(pool.map(self._refresh_source, due))
+            changed = changed or any(results)
+            self.scraper.boilerplate.save()
+            self.scraper.pattern_stats.save()
+            # Pick up what this cycle's counts say about which patterns to run
+            self.scraper.replan_patterns()
+
+        self.cycles += 1
+        # The first cycle always publishes so the outputs match this process's state
+        if changed or self.publishes == 0:
+            self.publish()
+            return True
+        return False
+
+    def publish(self):
+        """
+        Combine every source's deals (dropping repeats) plus the backup deals,
+        then write the data files, search index and page, each atomically
+        """
+        deals = []
+        seen = set()
+        for source in self.sources():
+            for deal in self.source_deals.get(source_key(source), []):
+                if deal['deal_text'] not in seen:
+                    seen.add(deal['deal_text'])
+                    deals.append(deal)
+        deals.extend(self.mock_deals)
+
+        export_deals(deals)
+        search_index = DealSearchIndex.from_deals(deals)
+        search_index.save()
+        self.generator.generate_html(deals, self.html_file, search_index=search_index)
+
+        self.publishes += 1
+        self.deal_count = len(deals)
+        self.last_publish = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        print(f"📤 Published {len(deals)} deals")
+        with self._lock:
+            if self._published_stats:
+                changes = self.stats.changes_since(self._published_stats)
+                lines = describe_changes(changes, 'day') + describe_changes(changes, 'confidence', 'confidence deals')
+                if lines:
+                    print("   Since the last publish: " + ', '.join(lines))
+            self._published_stats = self.stats.snapshot()
+
+    def seconds_until_due(self) -> float:
+        sources = self.sources()
+        with self._lock:
+            # A source that has never been scheduled (new, or after SIGHUP) is due now
+            if not sources or any(source_key(source) not in self.next_due for source in sources):
+                return 0 if sources else MAX_SLEEP_SECONDS
+            wait = min(self.next_due.values()) - time.time()
+        return max(0.0, min(wait, MAX_SLEEP_SECONDS))
+
+    def run_forever(self):
+        """Run cycles until stop() is called"""
+        while not self._stop.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:
+                # One bad cycle shouldn't take the daemon down; try again on schedule
+                print(f"❌ Cycle failed: {str(e)}")
+            self._wake.wait(self.seconds_until_due())
+            self._wake.clear()
+
+    # ------------------------------------------------------------------
+    # Health endpoint
+
+    def health(self) -> Dict[str, Any]:
+        """Snapshot of the daemon's state for the /health endpoint"""
+        with self._lock:
+            next_due = dict(self.next_due)
+            stats = self.stats.snapshot()
+        now = time.time()
+        return {
+            'status': 'stopping' if self._stop.is_set() else 'ok',
+            'uptime_seconds': round(now - self.started),
+            'cycles': self.cycles,
+            'publishes': self.publishes,
+            'last_publish': self.last_publish,
+            'deals': self.deal_count,
+            'deal_counts': {
+                'total': stats['total'],
+                'restaurants': len(stats['counts']['restaurant']),
+                'by_confidence': stats['counts']['confidence'],
+                'by_day': stats['counts']['day'],
+            },
+            'sources': self._health_sources(next_due, now),
+        }
+
+    def _health_sources(self, next_due: Dict[SourceKey, float], now: float) -> Dict[str, Dict[str, Any]]:
+        """Per-source status by name (by "name (url)" where two sources share a name)"""
+        statuses = list(self.source_status.items())
+        names = Counter(name for (name, _), _ in statuses)
+        return {
+            (name if names[name] == 1 else f"{name} ({url})"):
+                dict(status, next_refresh_seconds=round(max(0, next_due.get((name, url), now) - now)))
+            for (name, url), status in statuses
+        }
+
+    def start_health_server(self, host: str = '127.0.0.1', port: int = DEFAULT_HEALTH_PORT) -> ThreadingHTTPServer:
+        """Serve /health on a background thread"""
+        daemon = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/health':
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.health(), indent=2).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Keep health checks out of the daemon's output
+                pass
+
+        server = ThreadingHTTPServer((host, port), HealthHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"🩺 Health endpoint: http://{host}:{port}/health")
+        return server
+
+
+def run_daemon(health_host: str = '127.0.0.1', health_port: int = DEFAULT_HEALTH_PORT,
+               interval_minutes: Optional[float] = None):
+    """Start the daemon with signal handling and the health endpoint, and block until it stops"""
+    daemon = WingDealsDaemon(interval_minutes=interval_minutes)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: daemon.refresh_all())
+
+    server = daemon.start_health_server(health_host, health_port)
+    print("🍗 Wing deals daemon running (Ctrl+C to stop)")
+    try:
+        daemon.run_forever()
+    finally:
+        server.shutdown()
+        server.server_close()
+        print("👋 Daemon stopped.")
+
+
+def main():
+    """Run the scraper as a long-lived daemon"""
+    parser = argparse.ArgumentParser(description="Keep scraping wing deals on a schedule")
+    parser.add_argument('--health-host', default='127.0.0.1', help="address for /health (default: 127.0.0.1)")
+    parser.add_argument('--health-port', type=int, default=DEFAULT_HEALTH_PORT,
+                        help=f"port for /health (default: {DEFAULT_HEALTH_PORT})")
+    parser.add_argument('--interval', type=float, default=None,
+                        help="refresh every source every N minutes instead of per-category intervals")
+    args = parser.parse_args()
+    load_saved_restaurants()
+    run_daemon(args.health_host, args.health_port, args.interval)
+
+
+if __name__ == "__main__":
+    main()
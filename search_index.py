@@ -0,0 +1,278 @@
+"""
+Search Index for Columbus Wing Deals Scraper
+An inverted index over each deal's restaurant, deal text and source.
+
+Day names are normalized ("tues", "Tuesdays" -> tuesday) and prices become
+numeric tokens ("$8.99", "50 cents" -> $0.50), so searches like
+"tuesday bogo" or "$0.50 OR $0.75" only touch the matching postings lists.
+The same serialized index is embedded in the generated HTML page.
+"""
+
+import bisect
+import json
+import re
+import sys
+from array import array
+from typing import List, Dict, Any, Iterable, Set, TextIO, Sequence
+
+from file_utils import atomic_write
+from restaurant_data import DAY_ALIASES
+
+# Dollar amounts, plain numbers/percentages, and words (apostrophes allowed inside words)
+TOKEN_PATTERN = re.compile(r"\$\d+(?:\.\d+)?|\d+(?:\.\d+)?%?|[a-z]+(?:'[a-z]+)*")
+
+# Deal fields that get indexed
+INDEXED_FIELDS = ['restaurant', 'deal_text', 'source']
+
+DEFAULT_INDEX_FILE = 'wing_deals_index.json'
+
+# Ids written per chunk by write_ids()
+IDS_PER_CHUNK = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search tokens
+    Keep this in sync with tokenize() in the generated page's JavaScript
+    """
+    tokens = []
+    raw_tokens = TOKEN_PATTERN.findall(text.lower())
+    for i, raw in enumerate(raw_tokens):
+        if raw.startswith('$'):
+            # Normalize dollar amounts so "$12" and "$12.00" are the same token
+            tokens.append(f"${float(raw[1:]):.2f}")
+        elif raw[0].isdigit():
+            tokens.append(raw)
+            # "50 cent wings" is a price too
+            next_raw = raw_tokens[i + 1] if i + 1 < len(raw_tokens) else ''
+            if next_raw in ('cent', 'cents') and not raw.endswith('%'):
+                tokens.append(f"${float(raw) / 100:.2f}")
+        else:
+            word = raw.replace("'", '')
+            tokens.append(DAY_ALIASES.get(word, word))
+    return tokens
+
+
+def write_ids(f: TextIO, ids: Sequence[int]):
+    """Write a list of ids as a JSON array a chunk at a time (ids can be a list or an array)"""
+    f.write('[')
+    for start in range(0, len(ids), IDS_PER_CHUNK):
+        if start:
+            f.write(',')
+        f.write(','.join(map(str, ids[start:start + IDS_PER_CHUNK])))
+    f.write(']')
+
+
+class DealSearchIndex:
+    """
+    Inverted index mapping each token to the sorted ids of the deals that contain it
+    Deal ids are assigned in insertion order, so they line up with the deals list
+    the index was built from
+    With compact=True each postings list is an array of 32-bit ids (4 bytes per posting
+    rather than a list of int objects), for indexes built while streaming large pages
+    """
+
+    def __init__(self, compact: bool = False):
+        self.postings: Dict[str, Sequence[int]] = {}
+        self.doc_count = 0
+        self._compact = compact
+        # Sorted term list for prefix queries, rebuilt lazily after new terms appear
+        self._sorted_terms: List[str] = None
+
+    def add_deal(self, deal: Dict[str, Any]) -> int:
+        """
+        Index one deal and return the id it was assigned
+        """
+        doc_id = self.doc_count
+        self.doc_count += 1
+
+        terms = set()
+        for field in INDEXED_FIELDS:
+            terms.update(tokenize(str(deal.get(field, ''))))
+
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                self.postings[term] = array('I', [doc_id]) if self._compact else [doc_id]
+                self._sorted_terms = None
+            else:
+                # Ids only ever grow, so appending keeps the list sorted
+                postings.append(doc_id)
+        return doc_id
+
+    def add_deals(self, deals: Iterable[Dict[str, Any]]) -> None:
+        """Index several deals in order"""
+        for deal in deals:
+            self.add_deal(deal)
+
+    def _terms_with_prefix(self, prefix: str) -> List[str]:
+        """
+        Find all indexed terms starting with prefix using binary search
+        """
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        matches = []
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _lookup(self, word: str) -> Set[int]:
+        """
+        Get the ids of deals matching one query word
+        A trailing '*' makes the last token a prefix match; words that tokenize
+        into several tokens must match all of them
+        """
+        prefix = word.endswith('*')
+        tokens = tokenize(word.rstrip('*'))
+        if not tokens:
+            return set(range(self.doc_count))
+
+        result = None
+        for i, token in enumerate(tokens):
+            if prefix and i == len(tokens) - 1:
+                ids = set()
+                for term in self._terms_with_prefix(token):
+                    ids.update(self.postings[term])
+            else:
+                ids = set(self.postings.get(token, ()))
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def search(self, query: str) -> List[int]:
+        """
+        Run a boolean query and return the sorted ids of matching deals
+        Words are ANDed together; OR separates alternatives; NOT or a leading
+        '-' excludes a word; a trailing '*' does a prefix match (e.g. "wed* -groupon")
+        """
+        matches = set()
+        # Split into OR-groups of ANDed words
+        groups = [[]]
+        for word in query.split():
+            if word == 'OR':
+                groups.append([])
+            elif word != 'AND':
+                groups[-1].append(word)
+
+        for group in groups:
+            include, exclude = [], []
+            negate = False
+            for word in group:
+                if word == 'NOT':
+                    negate = True
+                    continue
+                if word.startswith('-') and len(word) > 1:
+                    negate, word = True, word[1:]
+                (exclude if negate else include).append(word)
+                negate = False
+            if not include and not exclude:
+                continue
+
+            if include:
+                # Intersect the smallest candidate sets first
+                candidate_sets = sorted((self._lookup(word) for word in include), key=len)
+                group_ids = candidate_sets[0]
+                for ids in candidate_sets[1:]:
+                    group_ids = group_ids & ids
+            else:
+                group_ids = set(range(self.doc_count))
+            for word in exclude:
+                group_ids = group_ids - self._lookup(word)
+            matches |= group_ids
+        return sorted(matches)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize to parallel sorted term/postings arrays
+        The sorted layout lets the page's JavaScript binary-search for prefixes
+        """
+        terms = sorted(self.postings)
+        return {
+            'doc_count': self.doc_count,
+            'aliases': DAY_ALIASES,
+            'terms': terms,
+            'postings': [list(self.postings[term]) if self._compact else self.postings[term] for term in terms],
+        }
+
+    def write_json(self, f: TextIO):
+        """Write the to_dict() JSON to a file one postings list at a time, without building it in memory"""
+        terms = sorted(self.postings)
+        f.write(f'{{"doc_count":{self.doc_count},"aliases":')
+        f.write(json.dumps(DAY_ALIASES, separators=(',', ':')))
+        f.write(',"terms":')
+        f.write(json.dumps(terms, separators=(',', ':')))
+        f.write(',"postings":[')
+        for i, term in enumerate(terms):
+            if i:
+                f.write(',')
+            write_ids(f, self.postings[term])
+        f.write(']}')
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DealSearchIndex':
+        """Rebuild an index from to_dict() output"""
+        index = cls()
+        index.doc_count = data['doc_count']
+        index.postings = dict(zip(data['terms'], data['postings']))
+        index._sorted_terms = list(data['terms'])
+        return index
+
+    @classmethod
+    def from_deals(cls, deals: Iterable[Dict[str, Any]]) -> 'DealSearchIndex':
+        """Build an index over a list of deals"""
+        index = cls()
+        index.add_deals(deals)
+        return index
+
+    def save(self, filename: str = DEFAULT_INDEX_FILE):
+        """Write the index to a compact JSON file"""
+        with atomic_write(filename) as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'), ensure_ascii=False)
+        print(f"Saved search index ({len(self.postings)} terms) to {filename}")
+
+    @classmethod
+    def load(cls, filename: str = DEFAULT_INDEX_FILE) -> 'DealSearchIndex':
+        """Read an index written by save()"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def main():
+    """Search saved deals from the command line: python search_index.py "tuesday bogo" """
+    if len(sys.argv) < 2:
+        print('Usage: python search_index.py "QUERY"')
+        print('Example: python search_index.py "wed* OR thursday -groupon"')
+        sys.exit(1)
+
+    query = ' '.join(sys.argv[1:])
+    try:
+        with open('wing_deals.json', 'r', encoding='utf-8') as f:
+            deals = json.load(f)
+    except FileNotFoundError:
+        print("Error: wing_deals.json not found. Please run the scraper first.")
+        sys.exit(1)
+
+    try:
+        index = DealSearchIndex.load()
+    except FileNotFoundError:
+        index = DealSearchIndex.from_deals(deals)
+
+    # An index from a different run would point at the wrong deals
+    if index.doc_count != len(deals):
+        index = DealSearchIndex.from_deals(deals)
+
+    results = index.search(query)
+    print(f"\n🔍 {len(results)} deals matching '{query}':")
+    print("=" * 50)
+    for doc_id in results:
+        deal = deals[doc_id]
+        print(f"• {deal['restaurant']} ({deal['confidence']})")
+        print(f"  {deal['deal_text']}")
+
+
+if __name__ == "__main__":
+    main()
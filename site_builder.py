@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Multi-Page Site Builder for Columbus Wing Deals Scraper
+Builds an index page plus one page per restaurant and one per day of the week.
+
+Each page records a hash of the deals that feed it (and of the page template),
+so a rebuild only re-renders pages whose inputs changed. Changed pages are
+rendered in parallel across a process pool, and every page is written to a
+temporary file and swapped into place, so the site never serves a half-built page.
+
+Usage:
+    python site_builder.py --output-dir site_pages --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+from file_utils import atomic_write
+from html_generator import WingDealsHTMLGenerator, DEFAULT_PAGE_SIZE
+from restaurant_data import DAY_NAMES, get_deal_days
+
+# Records the input hash of every page from the last build
+BUILD_STATE_FILE = '.build_state.json'
+
+# Deal fields that change on every scrape without the deal changing; left out of page
+# hashes so a rescrape of the same deals doesn't re-render the whole site
+VOLATILE_FIELDS = {'date_found'}
+
+# One generator per worker process, created on first use
+_worker_generator = None
+
+
+def _slugify(text: str) -> str:
+    """Make a URL-friendly page name"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'page'
+
+
+def _render_page(job: Tuple[str, str, List[Dict[str, Any]], int, bool]) -> str:
+    """
+    Render one page inside a worker process
+    job is (output_path, title, deals, page_size, production)
+    """
+    global _worker_generator
+    output_path, title, deals, page_size, production = job
+    if _worker_generator is None:
+        _worker_generator = WingDealsHTMLGenerator(page_size=page_size, production=production)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return _worker_generator.generate_html(deals, output_path, title=title)
+
+
+class SiteBuilder:
+    """
+    Plans, diffs and renders the multi-page site
+    """
+
+    def __init__(self, output_dir: str = 'site_pages', workers: int = None,
+                 page_size: int = DEFAULT_PAGE_SIZE, production: bool = False):
+        self.output_dir = output_dir
+        # None lets the pool use one worker per CPU
+        self.workers = workers
+        self.page_size = page_size
+        self.production = production
+        # Any change to the template or render settings must rebuild every page
+        generator = WingDealsHTMLGenerator(page_size=page_size, production=production)
+        self._template_hash = hashlib.sha256(
+            f"{generator.html_template}|{page_size}|{production}".encode('utf-8')
+        ).hexdigest()
+
+    def plan_pages(self, deals: List[Dict[str, Any]]) -> Dict[str, Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Work out every page and the deals that feed it
+        Returns {relative_path: (title, deals)}
+        Restaurants whose names slugify the same ("Joe's" and "Joes") get -2, -3, ...
+        in name order, so each keeps its page from one build to the next
+        """
+        pages = {'index.html': ('Columbus Wing Deals - Best Chicken Wing Specials', deals)}
+
+        by_restaurant = {}
+        by_day = {day: [] for day in DAY_NAMES}
+        for deal in deals:
+            by_restaurant.setdefault(deal['restaurant'], []).append(deal)
+            for day in get_deal_days(deal['deal_text']):
+                by_day[day].append(deal)
+
+        used_slugs = set()
+        for name in sorted(by_restaurant):
+            base = slug = _slugify(name)
+            suffix = 2
+            while slug in used_slugs:
+                slug = f"{base}-{suffix}"
+                suffix += 1
+            used_slugs.add(slug)
+            pages[f"restaurants/{slug}.html"] = (f"{name} Wing Deals - Columbus Wing Deals", by_restaurant[name])
+        for day, day_deals in by_day.items():
+            pages[f"days/{day}.html"] = (f"{day.title()} Wing Deals in Columbus", day_deals)
+        return pages
+
+    def _page_hash(self, title: str, deals: List[Dict[str, Any]]) -> str:
+        """
+        Hash of what ends up on a page, minus VOLATILE_FIELDS
+        An unchanged page keeps the dates from when it was last rendered
+        """
+        digest = hashlib.sha256(self._template_hash.encode('utf-8'))
+        digest.update(title.encode('utf-8'))
+        for deal in deals:
+            stable = {key: value for key, value in deal.items() if key not in VOLATILE_FIELDS}
+            digest.update(json.dumps(stable, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load_state(self) -> Dict[str, str]:
+        """Read the page hashes from the last build (empty if there wasn't one)"""
+        try:
+            with open(os.path.join(self.output_dir, BUILD_STATE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def build(self, deals: List[Dict[str, Any]], force: bool = False) -> Dict[str, int]:
+        """
+        Render every page whose inputs changed since the last build
+        Pages that no longer have deals (e.g. a removed restaurant) are deleted
+        Returns counts of rendered, unchanged and removed pages
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        previous = {} if force else self._load_state()
+        pages = self.plan_pages(deals)
+
+        state = {}
+        jobs = []
+        for path, (title, page_deals) in pages.items():
+            page_hash = self._page_hash(title, page_deals)
+            state[path] = page_hash
+            output_path = os.path.join(self.output_dir, path)
+            if previous.get(path) != page_hash or not os.path.exists(output_path):
+                jobs.append((output_path, title, page_deals, self.page_size, self.production))
+
+        # Largest pages first so one big page doesn't start last and hold up the pool
+        jobs.sort(key=lambda job: len(job[2]), reverse=True)
+        if len(jobs) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(_render_page, jobs))
+        else:
+            for job in jobs:
+                _render_page(job)
+
+        removed = 0
+        for path in set(previous) - set(state):
+            stale = os.path.join(self.output_dir, path)
+            for filename in (stale, stale + '.gz', stale + '.br'):
+                if os.path.exists(filename):
+                    os.remove(filename)
+            removed += 1
+
+        # Only record the new state once every page is in place
+        with atomic_write(os.path.join(self.output_dir, BUILD_STATE_FILE)) as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+
+        return {'rendered': len(jobs), 'unchanged': len(pages) - len(jobs), 'removed': removed}
+
+
+def main():
+    """Build the multi-page site from wing_deals.json"""
+    parser = argparse.ArgumentParser(description="Build per-restaurant and per-day wing deal pages")
+    parser.add_argument('--output-dir', default='site_pages', help="where to write the site (default: site_pages)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--production', action='store_true', help="minify pages and write .gz/.br copies")
+    parser.add_argument('--force', action='store_true', help="rebuild every page even if unchanged")
+    args = parser.parse_args()
+
+    try:
+        with open('wing_deals.json', 'r', encoding='utf-8') as f:
+            deals = json.load(f)
+    except FileNotFoundError:
+        print("Error: wing_deals.json not found. Please run the scraper first.")
+        return
+
+    builder = SiteBuilder(args.output_dir, args.workers, production=args.production)
+    result = builder.build(deals, force=args.force)
+
+    print(f"\n🏗️  Site built in {args.output_dir}/")
+    print(f"   • Pages rendered: {result['rendered']}")
+    print(f"   • Pages unchanged: {result['unchanged']}")
+    print(f"   • Pages removed: {result['removed']}")
+
+
+if __name__ == "__main__":
+    main()
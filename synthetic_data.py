@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator for Columbus Wing Deals Scraper
+Builds realistic-looking restaurants, deal sites, deals and restaurant web pages
+at any scale for load testing. Output is fully determined by the seed, so two
+runs with the same arguments produce identical data.
+
+Deal wording is drawn from MOCK_DEALS (with days, prices and times reshuffled)
+and from the phrases in DEAL_PATTERNS, so scraped-style text matches the same
+patterns the real scraper uses. Every phrase is checked against its pattern
+when this module is imported.
+
+Usage:
+    python synthetic_data.py --restaurants 10000 --deals 100000 --seed 42
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator
+
+from restaurant_data import (
+    RESTAURANTS,
+    RESTAURANT_CATEGORIES,
+    LOCATION_COORDINATES,
+    DEAL_PATTERNS,
+    get_deal_days,
+    get_mock_deals
+)
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Building blocks for restaurant names
+NAME_PREFIXES = [
+    'Buckeye', 'Scioto', 'Olentangy', 'Short North', 'German Village', 'Brewery District',
+    'Big Red', 'Hot Chicken', 'Smokin', 'Crispy', 'Flying', 'Backyard', 'Corner', 'Uptown',
+    'Downtown', 'Riverside', 'Lucky', 'Golden', 'Saucy', 'Blazin',
+]
+NAME_SUFFIXES = [
+    'Wings', 'Wing House', 'Tavern', 'Pub', 'Grille', 'Sports Bar', 'Taproom',
+    'Wings & Things', 'Chicken Shack', 'Bar & Grill', 'Kitchen', 'Coop', 'Smokehouse',
+]
+
+# Filler text that surrounds deals on scraped pages
+PAGE_FILLER = [
+    'Order online for pickup or delivery.',
+    'Join our rewards program and earn points on every order.',
+    'Follow us on social media for the latest updates.',
+    'Gift cards available in any amount.',
+    'Catering available for parties of all sizes.',
+    'Now hiring servers and line cooks at all locations.',
+    'Check out our full menu of burgers, sandwiches and salads.',
+    'Game day? Reserve a table to watch the Buckeyes.',
+]
+
+# Placeholder tokens used when turning patterns and mock deals into templates
+_DAY_PATTERN = re.compile(r'\b(' + '|'.join(DAYS) + r')s?\b', re.IGNORECASE)
+_PRICE_PATTERN = re.compile(r'\$\d+(?:\.\d+)?')
+_NUMBER_PATTERN = re.compile(r'(?<![\$\d\.])\d+(?![\d\.])')
+
+
+def _pattern_phrase(pattern: str) -> str:
+    """
+    Turn a DEAL_PATTERNS regex into a plain phrase that the regex matches
+    e.g. r'wing.*happy\\s*hour' -> 'wings happy hour', r'wing.*\\$\\d+' -> 'wings {price}'
+    """
+    phrase = pattern
+    phrase = phrase.replace(r'\$[\d\.]+', '{price}').replace(r'\$\d+\.\d+', '{price}')
+    phrase = phrase.replace(r'\$\d+', '{price}')
+    phrase = phrase.replace(r'\d+', '{number}')
+    phrase = phrase.replace(r'\s*', ' ').replace('.*', ' ')
+    phrase = phrase.replace('\\', '')
+    phrase = re.sub(r'\s+', ' ', phrase).strip()
+    # Patterns all start with "wing"; use the plural the way menus do
+    return re.sub(r'^wing\b', 'wings', phrase)
+
+
+def _random_price(rng: random.Random) -> str:
+    return f"${rng.randint(0, 25)}.{rng.choice(['50', '75', '99'])}"
+
+
+def _fill_phrase(phrase: str, rng: random.Random) -> str:
+    """
+    Fill in a pattern phrase's {price} and {number} placeholders
+    The rest of the phrase is what the pattern matches on, so it is left alone
+    """
+    phrase = phrase.replace('{price}', _random_price(rng))
+    return phrase.replace('{number}', str(rng.choice([6, 10, 12, 20, 50])))
+
+
+def _fill_template(text: str, rng: random.Random) -> str:
+    """
+    Replace days, prices and numbers in a mock deal with random values
+    Days are all moved by the same number of days, so "Wing Wednesday ... every
+    Wednesday" stays one day and "Monday-Friday" stays a five-day run
+    """
+    def random_number(match):
+        # Small numbers are usually clock times, larger ones wing counts or percentages
+        if int(match.group(0)) <= 12:
+            return str(rng.randint(1, 12))
+        return str(rng.choice([10, 12, 15, 20, 25, 30, 50]))
+    
+    shift = rng.randrange(len(DAYS))
+    
+    def shift_day(match):
+        day = DAYS[(DAYS.index(match.group(1).title()) + shift) % len(DAYS)]
+        return day + match.group(0)[len(match.group(1)):]
+    
+    text = _DAY_PATTERN.sub(shift_day, text)
+    text = _PRICE_PATTERN.sub(lambda m: _random_price(rng), text)
+    return _NUMBER_PATTERN.sub(random_number, text)
+
+
+def _build_pattern_phrases() -> List[str]:
+    """
+    One phrase per DEAL_PATTERNS entry, each checked to match its own pattern once filled in
+    Raises ValueError for a pattern _pattern_phrase() can't turn into matching text
+    """
+    rng = random.Random(0)
+    phrases = []
+    for pattern in DEAL_PATTERNS:
+        phrase = _pattern_phrase(pattern)
+        sample = _fill_phrase(phrase, rng).lower()
+        if not re.search(pattern, sample):
+            raise ValueError(f"Synthetic phrase {sample!r} doesn't match its deal pattern {pattern!r}")
+        phrases.append(phrase)
+    return phrases
+
+
+# Phrase templates derived once from the live patterns and mock deals
+PATTERN_PHRASES = _build_pattern_phrases()
+MOCK_DEAL_TEMPLATES = [deal['deal_text'] for deal in get_mock_deals()]
+
+
+def generate_restaurants(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate restaurant records with the same fields as RESTAURANTS
+    Names are unique; category, location and deal mix follow the real database
+    """
+    rng = random.Random(seed)
+    categories = list(RESTAURANT_CATEGORIES)
+    places = [place.title() for place in LOCATION_COORDINATES]
+    known_deal_pool = [deal for r in RESTAURANTS for deal in r['known_deals']]
+
+    restaurants = []
+    used_names = set()
+    for i in range(count):
+        name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_SUFFIXES)}"
+        # Keep names unique the way real multi-location venues are told apart
+        if name in used_names:
+            name = f"{name} #{i + 1}"
+        used_names.add(name)
+
+        slug = re.sub(r'[^a-z0-9]+', '', name.lower())
+        restaurants.append({
+            'name': name,
+            'url': f"https://www.{slug}.com/promotions",
+            'category': rng.choice(categories),
+            'locations': rng.sample(places, rng.randint(1, 3)),
+            'known_deals': rng.sample(known_deal_pool, 2),
+            'confidence': rng.choices(['high', 'medium', 'low'], weights=[2, 6, 2])[0],
+        })
+    return restaurants
+
+
+def iter_deals(count: int, restaurants: List[Dict[str, Any]], seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Yield deals one at a time so very large sets never need to sit in memory
+    About a third look like curated mock deals; the rest look like scraped text
+    """
+    rng = random.Random(seed + 2)
+    start = datetime(2024, 1, 1, 12, 0, 0)
+
+    for i in range(count):
+        restaurant = rng.choice(restaurants)
+        found = start + timedelta(seconds=i * 7)
+        if rng.random() < 0.35:
+            # Curated style: mock deal wording, restaurant website as the source
+            deal = {
+                'restaurant': restaurant['name'],
+                'deal_text': _fill_template(rng.choice(MOCK_DEAL_TEMPLATES), rng),
+                'source': f"{restaurant['name']} Website",
+                'confidence': restaurant['confidence'],
+            }
+        else:
+            # Scraped style: lowercase context window around a pattern hit
+            phrase = _fill_phrase(rng.choice(PATTERN_PHRASES), rng)
+            # A phrase that names its day keeps it; the rest get a random one
+            days = get_deal_days(phrase)
+            day = days[0].title() if days else rng.choice(DAYS)
+            before = rng.choice(PAGE_FILLER)
+            after = rng.choice(PAGE_FILLER)
+            deal = {
+                'restaurant': restaurant['name'],
+                'deal_text': f"{before} {phrase} every {day}. {after}".lower(),
+                'source': restaurant['name'],
+                'confidence': 'medium',
+            }
+        deal['date_found'] = found.strftime('%Y-%m-%d %H:%M:%S')
+        # Match the key order the scraper writes
+        yield {key: deal[key] for key in ['restaurant', 'deal_text', 'source', 'date_found', 'confidence']}
+
+
+def generate_deals(count: int, restaurants: List[Dict[str, Any]], seed: int = 42) -> List[Dict[str, Any]]:
+    """Generate a list of deals (see iter_deals for the streaming version)"""
+    return list(iter_deals(count, restaurants, seed))
+
+
+def generate_page_html(restaurant: Dict[str, Any], deal_count: int = 5, seed: int = 42) -> str:
+    """
+    Build a fake promotions page for a restaurant
+    Feed it through BeautifulSoup into ColumbusWingScraper._extract_deals_from_soup
+    to load-test extraction without touching the network
+    """
+    rng = random.Random(f"{seed}:{restaurant['name']}")
+    blocks = [f"<p>{rng.choice(PAGE_FILLER)}</p>" for _ in range(rng.randint(3, 8))]
+    for _ in range(deal_count):
+        phrase = _fill_phrase(rng.choice(PATTERN_PHRASES), rng)
+        blocks.insert(rng.randint(0, len(blocks)), f"<div class=\"promo\"><h3>{phrase.title()}</h3></div>")
+    return (
+        f"<html><head><title>{restaurant['name']} Promotions</title></head><body>"
+        f"<nav>Home | Menu | Locations | Promotions</nav>"
+        f"{''.join(blocks)}"
+        f"<footer>&copy; {restaurant['name']}</footer></body></html>"
+    )
+
+
+def install_restaurants(restaurants: List[Dict[str, Any]]) -> None:
+    """
+    Swap the contents of the shared RESTAURANTS list for synthetic ones
+    The management tool and scraper read RESTAURANTS directly, so this puts
+    them under load without editing restaurant_data.py
+    """
+    RESTAURANTS[:] = restaurants
+
+
+def load_into_scraper(scraper, deals: List[Dict[str, Any]]) -> None:
+    """
+    Add deals to a ColumbusWingScraper as if it had found them,
+    keeping its search index and statistics in step
+    """
+    scraper.deals.extend(deals)
+    scraper.search_index.add_deals(deals)
+    scraper.stats.add_all(deals)
+
+
+def _timed(label: str, func, *args, **kwargs):
+    """Run func and print how long it took"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"   ⏱️  {label}: {time.perf_counter() - started:.2f}s")
+    return result
+
+
+def main():
+    """Generate a synthetic dataset and time the pipeline stages against it"""
+    parser = argparse.ArgumentParser(description="Generate synthetic wing deal data for load testing")
+    parser.add_argument('--restaurants', type=int, default=1000, help="number of restaurants")
+    parser.add_argument('--deals', type=int, default=10000, help="number of deals")
+    parser.add_argument('--pages', type=int, default=200, help="number of fake pages to run through extraction")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--output-dir', default='loadtest', help="where to write the generated files")
+    args = parser.parse_args()
+
+    # Imported here so generating data alone doesn't need the scraper's dependencies
+    from bs4 import BeautifulSoup
+    from wing_scraper import ColumbusWingScraper
+    from html_generator import WingDealsHTMLGenerator
+    from exporters import DEFAULT_EXPORTS
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"🧪 Load test: {args.restaurants} restaurants, {args.deals} deals, seed {args.seed}")
+    print("=" * 50)
+
+    restaurants = _timed("Generate restaurants", generate_restaurants, args.restaurants, args.seed)
+    deals = _timed("Generate deals", generate_deals, args.deals, restaurants, args.seed)
+    install_restaurants(restaurants)
+
+    # Extraction and de-duplication over fake pages
+    scraper = ColumbusWingScraper()
+    pages = [generate_page_html(r, seed=args.seed) for r in restaurants[:args.pages]]
+
+    def extract_pages():
+        for restaurant, page in zip(restaurants, pages):
+            scraper._extract_deals_from_soup(BeautifulSoup(page, 'html.parser'), restaurant['name'])
+
+    _timed(f"Extract deals from {len(pages)} pages", extract_pages)
+
+    # Exporters and the HTML generator over the full deal set
+    scraper = ColumbusWingScraper()
+    _timed("Index deals", load_into_scraper, scraper, deals)
+    _timed("Save JSON", scraper.save_to_json, os.path.join(args.output_dir, 'wing_deals.json'))
+    _timed("Save CSV", scraper.save_to_csv, os.path.join(args.output_dir, 'wing_deals.csv'))
+    _timed("Export JSON + CSV + columnar (one pass)", scraper.export, {
+        format_name: os.path.join(args.output_dir, filename) for format_name, filename in DEFAULT_EXPORTS.items()
+    })
+    generator = WingDealsHTMLGenerator()
+    _timed("Generate HTML", generator.generate_html, deals,
+           os.path.join(args.output_dir, 'wing_deals.html'), scraper.search_index)
+    _timed("Generate HTML (streamed)", generator.generate_html, iter_deals(args.deals, restaurants, args.seed),
+           os.path.join(args.output_dir, 'wing_deals_streamed.html'), scraper.search_index, stream=True)
+
+    print(f"\n✅ Load test files written to {args.output_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+URL Health Checker for Columbus Wing Deals Scraper
+Probes every restaurant and deal site URL at the same time and reports
+which ones are dead, blocking us, slow or redirected elsewhere, so a full
+scrape doesn't find out by waiting on a timeout.
+
+Each URL gets a HEAD request (falling back to a small streamed GET for
+servers that don't answer HEAD properly). The report records the status,
+latency, redirect target and content size of every source and is saved to
+url_health.json. Sources that are dead, blocking or timing out are written
+to skip_sources.json, which the scraper reads to leave them out until the
+entry expires or a later check finds them healthy again.
+
+Usage:
+    python url_health.py --workers 32 --timeout 10
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from file_utils import atomic_write
+from restaurant_data import get_restaurants_by_category, get_deal_sites, load_saved_restaurants
+
+REPORT_FILE = 'url_health.json'
+SKIP_LIST_FILE = 'skip_sources.json'
+# Skipped sources are tried again once their entry is this old
+SKIP_LIST_MAX_AGE_DAYS = 7
+# Concurrent probes; each one is mostly waiting on the network
+CHECK_WORKERS = 32
+CHECK_TIMEOUT = 10
+# Slower than this is reported, but the source is still scraped
+SLOW_SECONDS = 3.0
+# Most of a page read when the server doesn't send Content-Length
+MAX_PROBE_BYTES = 256 * 1024
+
+# Status codes that mean the site is refusing automated requests
+BLOCKED_STATUSES = {401, 403, 429}
+# Status codes that mean the page is gone
+DEAD_STATUSES = {404, 410}
+# Permanent redirects: the source's URL should be updated
+PERMANENT_REDIRECTS = {301, 308}
+# Statuses some servers return for HEAD even when GET works
+HEAD_UNSUPPORTED = {400, 403, 404, 405, 501}
+
+# Verdicts that put a source on the skip list
+SKIP_VERDICTS = {'dead', 'blocked', 'timeout', 'unreachable', 'error'}
+
+
+def check_url(session: requests.Session, url: str, timeout: float = CHECK_TIMEOUT) -> Dict[str, Any]:
+    """
+    Probe one URL
+    Returns status, latency_ms, final_url, redirect_status, content_length,
+    method, verdict (ok/slow/redirected/blocked/dead/timeout/unreachable/error) and error
+    """
+    result: Dict[str, Any] = {
+        'url': url,
+        'status': None,
+        'latency_ms': None,
+        'final_url': None,
+        'redirect_status': None,
+        'content_length': None,
+        'method': 'HEAD',
+        'verdict': 'error',
+        'error': None,
+    }
+    started = time.perf_counter()
+    try:
+        response = session.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code in HEAD_UNSUPPORTED:
+            # Retry with a GET, reading at most MAX_PROBE_BYTES of the body
+            result['method'] = 'GET'
+            started = time.perf_counter()
+            response = session.get(url, timeout=timeout, allow_redirects=True, stream=True)
+            size = 0
+            for chunk in response.iter_content(chunk_size=16384):
+                size += len(chunk)
+                if size >= MAX_PROBE_BYTES:
+                    break
+            response.close()
+            result['content_length'] = size
+        elapsed = time.perf_counter() - started
+    except requests.exceptions.Timeout:
+        result.update(verdict='timeout', error=f"no response within {timeout}s")
+        return result
+    except requests.exceptions.RequestException as e:
+        # DNS failures, refused connections, TLS errors, too many redirects...
+        result.update(verdict='unreachable', error=str(e))
+        return result
+
+    result['status'] = response.status_code
+    result['latency_ms'] = round(elapsed * 1000)
+    header_length = response.headers.get('Content-Length')
+    if header_length and header_length.isdigit():
+        result['content_length'] = int(header_length)
+    if response.history:
+        result['final_url'] = response.url
+        # The first hop says whether the move is permanent
+        result['redirect_status'] = response.history[0].status_code
+
+    if response.status_code in BLOCKED_STATUSES:
+        result['verdict'] = 'blocked'
+    elif response.status_code in DEAD_STATUSES or response.status_code >= 500:
+        result['verdict'] = 'dead'
+    elif response.status_code >= 400:
+        result['verdict'] = 'error'
+    elif result['redirect_status'] in PERMANENT_REDIRECTS and response.url.rstrip('/') != url.rstrip('/'):
+        result['verdict'] = 'redirected'
+    elif elapsed > SLOW_SECONDS:
+        result['verdict'] = 'slow'
+    else:
+        result['verdict'] = 'ok'
+    return result
+
+
+def suggested_action(result: Dict[str, Any]) -> Optional[str]:
+    """What to do about a source, or None if it's fine"""
+    verdict = result['verdict']
+    if verdict in SKIP_VERDICTS:
+        return 'disable'
+    if verdict == 'redirected':
+        # A move to a different site (or to its home page) usually means the promotions page is gone
+        old, new = urlparse(result['url']), urlparse(result['final_url'])
+        if old.netloc.lower() != new.netloc.lower() or new.path in ('', '/'):
+            return f"re-point (check {result['final_url']})"
+        return f"re-point to {result['final_url']}"
+    return None
+
+
+def check_sources(sources: List[Dict[str, Any]] = None, workers: int = CHECK_WORKERS,
+                  timeout: float = CHECK_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Check every source's URL concurrently (all restaurants and deal sites by default)
+    Returns one result per source, in the order given, with name, category and action added
+    """
+    if sources is None:
+        sources = get_restaurants_by_category() + get_deal_sites()
+    session = requests.Session()
+    session.headers['User-Agent'] = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                                     '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+    adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda source: check_url(session, source['url'], timeout), sources))
+    session.close()
+
+    for source, result in zip(sources, results):
+        result['name'] = source['name']
+        result['category'] = source.get('category')
+        result['action'] = suggested_action(result)
+    return results
+
+
+def save_report(results: List[Dict[str, Any]], report_file: str = REPORT_FILE,
+                skip_list_file: Optional[str] = SKIP_LIST_FILE) -> Dict[str, Dict[str, Any]]:
+    """
+    Save the full report and, unless skip_list_file is None, the skip list
+    Returns the skip list written
+    """
+    checked = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with atomic_write(report_file) as f:
+        json.dump({'checked': checked, 'results': results}, f, indent=2, ensure_ascii=False)
+
+    skip_list = {
+        result['name']: {'url': result['url'], 'reason': result['error'] or f"{result['verdict']} ({result['status']})",
+                         'checked': checked}
+        for result in results if result['verdict'] in SKIP_VERDICTS
+    }
+    if skip_list_file is not None:
+        with atomic_write(skip_list_file) as f:
+            json.dump(skip_list, f, indent=2, ensure_ascii=False)
+    return skip_list
+
+
+def load_skip_list(filename: str = SKIP_LIST_FILE, max_age_days: float = SKIP_LIST_MAX_AGE_DAYS) -> Dict[str, str]:
+    """
+    Sources to leave out of a scrape, by name, with the reason
+    Entries older than max_age_days are ignored so the source gets another try;
+    an entry whose URL has since been changed is ignored too
+    """
+    if not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        # A broken skip list shouldn't stop a scrape
+        return {}
+
+    current_urls = {source['name']: source['url'] for source in get_restaurants_by_category() + get_deal_sites()}
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    skip = {}
+    for name, entry in entries.items():
+        try:
+            checked = datetime.strptime(entry['checked'], '%Y-%m-%d %H:%M:%S')
+        except (KeyError, ValueError):
+            continue
+        if checked >= cutoff and current_urls.get(name) == entry.get('url'):
+            skip[name] = entry.get('reason', '')
+    return skip
+
+
+def print_report(results: List[Dict[str, Any]], show_ok: bool = False):
+    """Print a line per source that needs attention (or every source with show_ok)"""
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result['verdict']] = counts.get(result['verdict'], 0) + 1
+
+    print(f"\n🩺 URL Health: {len(results)} sources checked")
+    print("=" * 60)
+    for result in results:
+        if result['verdict'] == 'ok' and not show_ok:
+            continue
+        latency = f"{result['latency_ms']}ms" if result['latency_ms'] is not None else '-'
+        size = f"{result['content_length'] / 1024:.0f}KB" if result['content_length'] is not None else '-'
+        print(f"{result['verdict']:>10}  {str(result['status'] or '-'):>3}  {latency:>7}  {size:>6}  {result['name']}")
+        if result['error']:
+            print(f"{'':>12}{result['error'][:100]}")
+        if result['action']:
+            print(f"{'':>12}→ {result['action']}")
+
+    print("\n📊 Summary:")
+    for verdict, count in sorted(counts.items()):
+        print(f"   • {verdict}: {count}")
+
+
+def main():
+    """Check every source URL and update the scraper's skip list"""
+    parser = argparse.ArgumentParser(description="Check every restaurant and deal site URL")
+    parser.add_argument('--workers', type=int, default=CHECK_WORKERS,
+                        help=f"concurrent checks (default: {CHECK_WORKERS})")
+    parser.add_argument('--timeout', type=float, default=CHECK_TIMEOUT,
+                        help=f"seconds to wait for each site (default: {CHECK_TIMEOUT})")
+    parser.add_argument('--all', action='store_true', help="also list sources that are fine")
+    parser.add_argument('--no-skip-list', action='store_true',
+                        help=f"only write the report, leaving {SKIP_LIST_FILE} as it is")
+    args = parser.parse_args()
+    load_saved_restaurants()
+
+    started = time.perf_counter()
+    results = check_sources(workers=args.workers, timeout=args.timeout)
+    print_report(results, args.all)
+    skip_list = save_report(results, skip_list_file=None if args.no_skip_list else SKIP_LIST_FILE)
+    print(f"\n⏱️  Checked in {time.perf_counter() - started:.1f}s; report saved to {REPORT_FILE}")
+    if not args.no_skip_list:
+        print(f"⏭️  {len(skip_list)} sources will be skipped by the scraper (see {SKIP_LIST_FILE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,26 +2,48 @@
 import requests  # For making HTTP requests to websites
 from bs4 import BeautifulSoup  # For parsing HTML content from websites
 from datetime import datetime  # For adding timestamps to deals
-import json  # For saving data in JSON format
 import time  # For adding delays between requests
 import random  # For randomizing delays to avoid detection
 from typing import List, Dict, Any  # For type hints
 import re  # For pattern matching (finding deals in text)
-import csv  # For saving data in CSV format
+import threading  # For setting up shared state safely when pages are processed in parallel
 # Import our custom data management functions
 from restaurant_data import (
     get_restaurants_by_category,  # Get list of all restaurants
     get_deal_sites,  # Get list of deal aggregation websites
     get_deal_patterns,  # Get regex patterns for finding deals
-    get_mock_deals  # Get backup deals when scraping fails
+    get_mock_deals,  # Get backup deals when scraping fails
+    load_saved_restaurants  # Use the restaurant list saved by a bulk import
 )
+# Import the search index that is built up as deals come in
+from search_index import DealSearchIndex
+# Import the exporter that writes every output format in one pass
+from exporters import export_deals
+# Import the optional per-stage profiler
+from profiling import StageProfiler, add_profile_arguments, profiler_from_args
+# Import the store that keeps raw pages for offline re-extraction
+from page_store import PageStore
+# Import the skip list written by the URL health checker
+from url_health import load_skip_list
+# Import the fuzzy name index used to credit deal-site deals to a restaurant
+from fuzzy_index import FuzzyNameIndex
+# Import the running counts behind the end-of-run summary
+from aggregates import Aggregates
+# Import the per-site selectors that narrow extraction to a page's promo regions
+from extraction_rules import get_extraction_rules
+# Import the per-host boilerplate detector that strips navigation, footers and banners
+from boilerplate import BoilerplateModel, join_blocks, page_blocks
+# Import the engine that runs the deal patterns with bounded windows and a time budget
+from pattern_engine import PatternSet
+# Import the per-pattern counts that decide which patterns run, and in what order
+from pattern_stats import PatternStats
 
 class ColumbusWingScraper:
     """
     Main scraper class that handles all web scraping operations
     for finding wing deals in Columbus, Ohio
     """
-    def __init__(self):
+    def __init__(self, page_store: PageStore = None, pattern_stats: PatternStats = None):
         # Set up headers to make our requests look like a real browser
         # This helps avoid being blocked by websites
         self.headers = {
@@ -29,6 +51,126 @@ class ColumbusWingScraper:
         }
         # Initialize empty list to store all the deals we find
         self.deals = []
+        # Search index kept in step with self.deals (deal ids are list positions)
+        self.search_index = DealSearchIndex()
+        # Counts by confidence, day, source and restaurant, also kept in step with self.deals
+        self.stats = Aggregates.for_deals()
+        # Deal texts we already have, so duplicate checks don't scan the whole list
+        self._seen_deal_texts = set()
+        # One session for every request, so connections to a site are reused
+        # (pool sized for the pipeline's parallel fetchers)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # ETag / Last-Modified from each URL's last response, for conditional requests
+        self._validators = {}
+        # Deal patterns checked and compiled on first use, in the order pattern_stats plans
+        self._patterns = None
+        self._skipped_patterns = set()
+        # The pattern credited with each deal the last page of a source counted as unique,
+        # by source and deal text, so add_deal() can report the ones that turn out to be repeats
+        self._unique_credits = {}
+        # Restaurant name index, deal site names and per-site selectors, built on first use
+        self._name_index = None
+        self._deal_site_names = None
+        self._source_rules = None
+        self._source_urls = None
+        # Sources whose selectors matched nothing on some page (reported once each)
+        self._unmatched_rules = set()
+        # Held while the patterns or source info above are built, so parallel pages build them once
+        self._setup_lock = threading.Lock()
+        # When set, every page and the deals found on it are kept for page_store.py
+        self.page_store = page_store
+        # Sources the URL health checker found dead or blocking, by name (see url_health.py)
+        self.skip_list = load_skip_list()
+        # Each site's repeated blocks, learned from the pages fetched so far (see boilerplate.py)
+        self.boilerplate = BoilerplateModel.load()
+        # What each deal pattern has contributed in earlier runs (see pattern_stats.py)
+        self.pattern_stats = pattern_stats if pattern_stats is not None else PatternStats.load()
+    
+    def active_sources(self, sources: List[Dict[str, Any]], report: bool = True) -> List[Dict[str, Any]]:
+        """
+        Leave out the sources on the skip list
+        With report=True, prints each source that is left out and why
+        """
+        active = []
+        for source in sources:
+            if source['name'] in self.skip_list:
+                if report:
+                    print(f"Skipping {source['name']} ({self.skip_list[source['name']]})")
+                continue
+            active.append(source)
+        return active
+    
+    def fetch_page(self, url: str, source: str = None):
+        """
+        Download one page and return its raw content, or None if the site didn't return 200
+        Network errors are raised so callers can report them
+        Pages are kept in the page store (if there is one) under the source name
+        """
+        changed, content = self.fetch_if_modified(url, conditional=False)
+        if content is not None and self.page_store is not None and source is not None:
+            self.page_store.save_page(source, url, content)
+        return content
+    
+    def extract_page(self, content: bytes, source: str) -> List[Dict[str, Any]]:
+        """
+        Parse a downloaded page and return the deals on it (nothing is added to self.deals)
+        The deals are also recorded in the page store, as the baseline for re-extraction
+        """
+        deals = self.find_deals_in_page(content, source, learn=True)
+        if self.page_store is not None:
+            self.page_store.save_deals(source, deals)
+        return deals
+    
+    def fetch_if_modified(self, url: str, conditional: bool = True):
+        """
+        Download a page, asking the site to skip the body if it hasn't changed
+        Returns (changed, content): (False, None) when the site answered 304 Not Modified,
+        otherwise content is the page body, or None if the site didn't return 200
+        """
+        headers = {}
+        validators = self._validators.get(url)
+        if conditional and validators:
+            etag, last_modified = validators
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        # Set a 10-second timeout so one slow site can't hold everything up
+        response = self.session.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return False, None
+        if response.status_code != 200:
+            return True, None
+        self._validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return True, response.content
+    
+    def forget_validators(self, url: str):
+        """Make the next fetch_if_modified() of a URL download the page in full"""
+        self._validators.pop(url, None)
+    
+    def add_deal(self, deal: Dict[str, Any], check_duplicate: bool = True) -> bool:
+        """
+        Add a deal unless we already have one with the same text
+        (the backup deals share texts between restaurants, so they skip the check)
+        Returns True if it was added
+        """
+        pattern = self._unique_credits.get(deal['source'], {}).pop(deal['deal_text'], None)
+        if check_duplicate and deal['deal_text'] in self._seen_deal_texts:
+            # Another page had it first, so its pattern found nothing new after all
+            if pattern is not None:
+                self.pattern_stats.count_duplicate(pattern)
+            return False
+        self._seen_deal_texts.add(deal['deal_text'])
+        # Add the new deal to our list and index it for search
+        self.deals.append(deal)
+        self.search_index.add_deal(deal)
+        self.stats.add(deal)
+        return True
         
     def scrape_restaurant_websites(self):
         """
@@ -38,7 +180,8 @@ class ColumbusWingScraper:
         
         # Get the list of all restaurants from our data file
         # This includes major chains, local chains, and independent restaurants
-        restaurants = get_restaurants_by_category()
+        # Sources the URL health checker flagged are left out
+        restaurants = self.active_sources(get_restaurants_by_category())
         
         # Loop through each restaurant in our database
         for restaurant in restaurants:
@@ -47,15 +190,13 @@ class ColumbusWingScraper:
                 print(f"Scraping {restaurant['name']}...")
                 
                 # Make an HTTP request to the restaurant's website
-                # We include our browser headers and set a 10-second timeout
-                response = requests.get(restaurant['url'], headers=self.headers, timeout=10)
+                content = self.fetch_page(restaurant['url'], restaurant['name'])
                 
                 # If the request was successful (status code 200 means OK)
-                if response.status_code == 200:
-                    # Parse the HTML content from the website
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Extract any deals we find on this website
-                    self._extract_deals_from_soup(soup, restaurant['name'])
+                if content is not None:
+                    # Parse the HTML content and add any deals we find on this website
+                    for deal in self.extract_page(content, restaurant['name']):
+                        self.add_deal(deal)
                 
                 # Wait a random amount of time (1-3 seconds) before the next request
                 # This prevents us from overwhelming the website's servers
@@ -74,7 +215,7 @@ class ColumbusWingScraper:
         
         # Get the list of deal aggregation websites from our data file
         # These include Groupon, LivingSocial, Restaurant.com, etc.
-        deal_sites = get_deal_sites()
+        deal_sites = self.active_sources(get_deal_sites())
         
         # Loop through each deal aggregation website
         for site in deal_sites:
@@ -83,14 +224,13 @@ class ColumbusWingScraper:
                 print(f"Scraping {site['name']}...")
                 
                 # Make an HTTP request to the deal website
-                response = requests.get(site['url'], headers=self.headers, timeout=10)
+                content = self.fetch_page(site['url'], site['name'])
                 
                 # If the request was successful
-                if response.status_code == 200:
-                    # Parse the HTML content from the website
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    # Extract any wing deals we find on this website
-                    self._extract_deals_from_soup(soup, site['name'])
+                if content is not None:
+                    # Parse the HTML content and add any wing deals we find on this website
+                    for deal in self.extract_page(content, site['name']):
+                        self.add_deal(deal)
                 
                 # Wait before the next request to be respectful
                 time.sleep(random.uniform(1, 3))
@@ -100,50 +240,157 @@ class ColumbusWingScraper:
                 print(f"Error scraping {site['name']}: {str(e)}")
     
     def _extract_deals_from_soup(self, soup: BeautifulSoup, source: str):
+        """
+        Find the wing deals on a page and add the ones we don't have yet
+        """
+        for deal in self.find_deals_in_soup(soup, source):
+            self.add_deal(deal)
+    
+    def find_deals_in_soup(self, soup: BeautifulSoup, source: str) -> List[Dict[str, Any]]:
+        """
+        Find the wing deals on an already-parsed page
+        """
+        return self.find_deals_in_page(soup, source)
+    
+    def _load_source_info(self):
+        """Build the restaurant name index and compile each source's selectors (once)"""
+        with self._setup_lock:
+            if self._deal_site_names is None:
+                self._build_source_info()
+    
+    def _build_source_info(self):
+        """The work of _load_source_info(), done with _setup_lock held"""
+        sources = get_restaurants_by_category() + get_deal_sites()
+        self._name_index = FuzzyNameIndex.from_restaurants(get_restaurants_by_category())
+        # Compiled selectors by source name, for the sources that declare them
+        self._source_rules = {source['name']: get_extraction_rules(source)
+                              for source in sources if source.get('selectors')}
+        self._source_urls = {source['name']: source['url'] for source in sources}
+        # Set last: other threads take a set _deal_site_names to mean the rest is ready
+        self._deal_site_names = {site['name'] for site in get_deal_sites()}
+    
+    def page_text(self, page, source: str, learn: bool = False, stripped=None) -> str:
+        """
+        Get the text to scan for deals: just the promo regions if the source
+        declares selectors (see extraction_rules.py), otherwise the whole page
+        minus the site's boilerplate (see boilerplate.py)
+        page can be the raw page content or a BeautifulSoup tree
+        With learn=True the page also counts towards learning its site's boilerplate
+        stripped replays the boilerplate a stored page had stripped, instead of asking the model
+        """
+        if self._deal_site_names is None:
+            self._load_source_info()
+        rules = self._source_rules.get(source)
+        if rules is not None:
+            text = rules.extract_text(page)
+            if text is not None:
+                return text
+            # The site probably changed its layout; scan everything rather than miss deals
+            if source not in self._unmatched_rules:
+                self._unmatched_rules.add(source)
+                print(f"⚠️  Selectors for {source} matched nothing; scanning the whole page")
+        soup = page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, 'html.parser')
+        url = self._source_urls.get(source)
+        if url is None:
+            return soup.get_text()
+        blocks = page_blocks(soup)
+        if stripped is None:
+            if learn:
+                self.boilerplate.learn(url, blocks)
+            stripped = self.boilerplate.strip(url, blocks)
+            # Kept with the stored page, so re-extraction strips the same blocks
+            if learn and self.page_store is not None:
+                self.page_store.save_stripped(source, stripped)
+        return join_blocks(blocks, stripped)
+    
+    def replan_patterns(self):
+        """Make the next page plan the deal patterns again, from the counts gathered so far"""
+        with self._setup_lock:
+            self._patterns = None
+    
+    def _deal_patterns(self):
+        """
+        The compiled deal patterns and the ones to skip, planned on first use
+        Pages on other threads wait for the plan rather than making their own
+        """
+        with self._setup_lock:
+            if self._patterns is None:
+                ordered, self._skipped_patterns = self.pattern_stats.plan(get_deal_patterns())
+                self._patterns = PatternSet(ordered)
+                for pattern, reason in self._patterns.rejected.items():
+                    print(f"⚠️  Skipping deal pattern {pattern!r}: {reason}")
+                if self._skipped_patterns:
+                    print(f"📐 Skipping {len(self._skipped_patterns)} deal patterns that other patterns always "
+                          f"cover (see python pattern_stats.py)")
+            return self._patterns, self._skipped_patterns
+    
+    def find_deals_in_page(self, page, source: str, learn: bool = False, stripped=None) -> List[Dict[str, Any]]:
         """
         This is the core function that finds wing deals in website text
         It uses regex patterns to search for deal-related text
+        page can be the raw page content or a BeautifulSoup tree
+        learn=True is for freshly fetched pages, stripped for stored ones (see page_text())
+        Pages can be processed on several threads
         """
+        found = []
+        credits = {}
         
-        # Get all the regex patterns we use to find deals
+        # Get all the regex patterns we use to find deals, compiled once per scraper
         # These patterns look for things like "wing deal", "50% off wings", etc.
-        deal_patterns = get_deal_patterns()
+        patterns, skipped = self._deal_patterns()
         
-        # Convert the HTML content to plain text and make it lowercase
+        # Convert the page (or just its promo regions) to plain text and make it lowercase
         # This makes it easier to search through
-        text_content = soup.get_text().lower()
+        text_content = self.page_text(page, source, learn, stripped).lower()
         
-        # Loop through each pattern we're looking for
-        for pattern in deal_patterns:
-            # Find all matches of this pattern in the text
-            matches = re.finditer(pattern, text_content, re.IGNORECASE)
+        # Deals on a deal site are credited to the restaurant they mention, if any
+        from_deal_site = source in self._deal_site_names
+        
+        # Loop through every match of every pattern we're looking for
+        # Repeats are bounded and each page has a time budget (see pattern_engine.py)
+        tally = self.pattern_stats.start_page(patterns.patterns, skipped)
+        for index, match in patterns.finditer(text_content, source, tally.skip, tally.cpu):
+            # Get some context around the match (100 characters before and after)
+            # This helps us understand what the deal is about
+            start = max(0, match.start() - 100)
+            end = min(len(text_content), match.end() + 100)
+            context = text_content[start:end].strip()
             
-            # For each match we find
-            for match in matches:
-                # Get some context around the match (100 characters before and after)
-                # This helps us understand what the deal is about
-                start = max(0, match.start() - 100)
-                end = min(len(text_content), match.end() + 100)
-                context = text_content[start:end].strip()
-                
-                # Clean up the text by removing extra whitespace
-                context = re.sub(r'\s+', ' ', context)
+            # Clean up the text by removing extra whitespace
+            context = re.sub(r'\s+', ' ', context)
+            
+            # Only add deals that have meaningful content (more than 20 characters)
+            if len(context) > 20:
+                if tally.add(index, match.start(), context):
+                    credits[context] = tally.patterns[index]
                 
-                # Only add deals that have meaningful content (more than 20 characters)
-                if len(context) > 20:
-                    # Create a deal object with all the information
-                    deal = {
-                        'restaurant': source,  # Which restaurant this came from
-                        'deal_text': context,  # The actual deal text we found
-                        'source': source,  # Where we found it (same as restaurant for now)
-                        'date_found': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # When we found it
-                        'confidence': 'medium'  # How confident we are this is a real deal
-                    }
+                # Work out which restaurant the deal is for
+                restaurant = source
+                if from_deal_site:
+                    mentions = self._name_index.find_mentions(context, limit=1)
+                    if mentions:
+                        restaurant = mentions[0][0]
                     
-                    # Check if we already have this exact deal to avoid duplicates
-                    if not any(d['deal_text'] == deal['deal_text'] for d in self.deals):
-                        # Add the new deal to our list
-                        self.deals.append(deal)
+                # Create a deal object with all the information
+                deal = {
+                    'restaurant': restaurant,  # Which restaurant this came from
+                    'deal_text': context,  # The actual deal text we found
+                    'source': source,  # Where we found it (a deal site, or the restaurant itself)
+                    'date_found': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # When we found it
+                    'confidence': 'medium'  # How confident we are this is a real deal
+                }
+                    
+                found.append(deal)
+        
+        self.pattern_stats.finish_page(tally)
+        self._unique_credits[source] = credits
+        
+        # A page that used up its budget only gets the deals found so far
+        for overrun in patterns.take_overruns():
+            print(f"⏱️  Gave up matching {overrun['source']} after {overrun['budget_ms']}ms "
+                  f"({overrun['chars']:,} characters, stopped in {overrun['pattern']!r})")
+        
+        return found
     
     def generate_mock_deals(self):
         """
@@ -152,6 +399,18 @@ class ColumbusWingScraper:
         This ensures users always get useful information
         """
         
+        mock_deals = self.get_timestamped_mock_deals()
+        
+        # Add all the mock deals to our main deals list and index them for search
+        self.deals.extend(mock_deals)
+        self.search_index.add_deals(mock_deals)
+        self.stats.add_all(mock_deals)
+        self._seen_deal_texts.update(deal['deal_text'] for deal in mock_deals)
+    
+    def get_timestamped_mock_deals(self) -> List[Dict[str, Any]]:
+        """
+        Get the backup deals, stamped with the current time
+        """
         # Get the list of mock deals from our data file
         # These are realistic deals that restaurants commonly offer
         mock_deals = get_mock_deals()
@@ -160,24 +419,29 @@ class ColumbusWingScraper:
         # This makes them look like they were just found
         for deal in mock_deals:
             deal['date_found'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return mock_deals
+    
+    def export(self, outputs: Dict[str, str] = None) -> Dict[str, int]:
+        """
+        Save all the deals to every output format in a single pass over the list
+        outputs maps a format name to a file name (defaults to JSON, CSV and the
+        columnar file used for analytics); see exporters.py for the formats
+        """
+        # Each file is written to a temporary file and swapped in, so anything
+        # watching it (like deals_server.py) never reads a half-written run
+        counts = export_deals(self.deals, outputs)
         
-        # Add all the mock deals to our main deals list
-        self.deals.extend(mock_deals)
+        # Print a confirmation message for each file
+        for filename, count in counts.items():
+            print(f"Saved {count} deals to {filename}")
+        return counts
     
     def save_to_json(self, filename: str = 'wing_deals.json'):
         """
         Save all the deals we found to a JSON file
         JSON format is good for web applications and data processing
         """
-        # Open a file for writing with UTF-8 encoding (handles special characters)
-        with open(filename, 'w', encoding='utf-8') as f:
-            # Convert our deals list to JSON format and write it to the file
-            # indent=2 makes the JSON file readable with proper formatting
-            # ensure_ascii=False allows special characters to be saved properly
-            json.dump(self.deals, f, indent=2, ensure_ascii=False)
-        
-        # Print a confirmation message showing how many deals were saved
-        print(f"Saved {len(self.deals)} deals to {filename}")
+        self.export({'json': filename})
     
     def save_to_csv(self, filename: str = 'wing_deals.csv'):
         """
@@ -188,28 +452,31 @@ class ColumbusWingScraper:
         if not self.deals:
             print("No deals to save to CSV")
             return
-        
-        # Open a CSV file for writing
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            # Define the column headers for our CSV file
-            fieldnames = ['restaurant', 'deal_text', 'source', 'date_found', 'confidence']
-            # Create a CSV writer that knows about our data structure
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            # Write the header row (column names)
-            writer.writeheader()
-            # Write each deal as a row in the CSV file
-            for deal in self.deals:
-                writer.writerow(deal)
-        
-        # Print a confirmation message
-        print(f"Saved {len(self.deals)} deals to {filename}")
+        self.export({'csv': filename})
     
-    def run_scraper(self):
+    def _scrape_all_sites(self):
+        """Visit every restaurant website and deal site, looking for deals"""
+        # Visit each restaurant's website and look for deals
+        self.scrape_restaurant_websites()
+        # Visit deal aggregation websites and look for deals
+        self.scrape_deal_sites()
+
+    def _save_all(self):
+        """Save the deals in every format plus the search index"""
+        # JSON for the website, CSV for spreadsheets and the columnar file for analytics
+        self.export()
+        # Save the search index for the command-line search tool
+        self.search_index.save()
+
+    def run_scraper(self, profiler: StageProfiler = None):
         """
         This is the main function that orchestrates the entire scraping process
         It calls all the other functions in the right order
+        Pass an enabled StageProfiler to profile the scrape, mock and save steps
         """
+        # A disabled profiler just calls each step directly
+        profiler = profiler or StageProfiler('scraper', enabled=False)
+
         # Print a nice header to show the scraper is starting
         print("Starting Columbus Wing Deals Scraper...")
         print("=" * 50)
@@ -217,10 +484,7 @@ class ColumbusWingScraper:
         # Step 1: Try to scrape real restaurant websites
         # This might fail because some websites block automated access
         try:
-            # Visit each restaurant's website and look for deals
-            self.scrape_restaurant_websites()
-            # Visit deal aggregation websites and look for deals
-            self.scrape_deal_sites()
+            profiler.call('scrape', self._scrape_all_sites)
         except Exception as e:
             # If anything goes wrong during scraping, print the error
             print(f"Error during web scraping: {str(e)}")
@@ -228,13 +492,15 @@ class ColumbusWingScraper:
         # Step 2: Generate backup deals
         # Even if web scraping fails, we still provide useful information
         print("\nGenerating sample deals for demonstration...")
-        self.generate_mock_deals()
+        profiler.call('mock_deals', self.generate_mock_deals)
         
         # Step 3: Save all the deals we found to files
-        # Save as JSON for the website to use
-        self.save_to_json()
-        # Save as CSV for spreadsheet analysis
-        self.save_to_csv()
+        profiler.call('save', self._save_all)
+        # Keep this run's raw pages for offline re-extraction
+        if self.page_store is not None:
+            self.page_store.finish()
+        self.boilerplate.save()
+        self.pattern_stats.save()
         
         # Print a summary of what we accomplished
         print(f"\nScraping complete! Found {len(self.deals)} wing deals.")
@@ -243,7 +509,24 @@ class ColumbusWingScraper:
 # This code only runs if we execute this file directly
 # It creates a scraper instance and runs the full scraping process
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Scrape Columbus wing deals")
+    parser.add_argument('--no-store-pages', action='store_true',
+                        help="don't keep raw pages for re-extraction (see page_store.py)")
+    parser.add_argument('--reextract', action='store_true',
+                        help="re-run the current patterns over the last stored pages instead of scraping")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    load_saved_restaurants()
+    if args.reextract:
+        from page_store import reextract, print_diff
+        print_diff(reextract())
+        raise SystemExit
+    profiler = profiler_from_args(args, 'scraper')
     # Create a new scraper object
-    scraper = ColumbusWingScraper()
+    scraper = ColumbusWingScraper(None if args.no_store_pages else PageStore())
     # Run the complete scraping process and get back all the deals
-    deals = scraper.run_scraper() 
\ No newline at end of file
+    try:
+        deals = scraper.run_scraper(profiler)
+    finally:
+        profiler.finish()